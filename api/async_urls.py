@@ -0,0 +1,42 @@
+from django.urls import path
+
+from . import async_views
+
+# Routes de lecture asynchrones, montées sous /api/async/ (voir softdesk/urls.py)
+urlpatterns = [
+    path("events/", async_views.event_stream, name="async-events"),
+    path("projects/", async_views.project_list, name="async-project-list"),
+    path(
+        "projects/<uuid:pk>/", async_views.project_detail, name="async-project-detail"
+    ),
+    path(
+        "projects/<uuid:project_pk>/issues/",
+        async_views.issue_list,
+        name="async-project-issues-list",
+    ),
+    path(
+        "projects/<uuid:project_pk>/issues/<uuid:pk>/",
+        async_views.issue_detail,
+        name="async-project-issues-detail",
+    ),
+    path(
+        "projects/<uuid:project_pk>/issues/<uuid:issue_pk>/comments/",
+        async_views.comment_list,
+        name="async-issue-comments-list",
+    ),
+    path(
+        "projects/<uuid:project_pk>/issues/<uuid:issue_pk>/comments/<uuid:pk>/",
+        async_views.comment_detail,
+        name="async-issue-comments-detail",
+    ),
+    path(
+        "projects/<uuid:project_pk>/contributors/",
+        async_views.contributor_list,
+        name="async-project-contributors-list",
+    ),
+    path(
+        "projects/<uuid:project_pk>/contributors/<int:pk>/",
+        async_views.contributor_detail,
+        name="async-project-contributors-detail",
+    ),
+]
@@ -0,0 +1,332 @@
+"""
+Chemin de lecture asynchrone pour le déploiement ASGI.
+
+Ces vues Django natives (async def) exposent en lecture seule les listes et
+détails des projets, issues, commentaires et contributeurs. Elles utilisent l'ORM
+asynchrone (aget, aexists, acount, itération asynchrone) et une authentification
+JWT asynchrone, sans passer par l'adaptateur synchrone des vues DRF. Les
+serializers DRF sont réutilisés pour garantir des représentations identiques.
+"""
+
+import asyncio
+import uuid
+from functools import partial, wraps
+
+from django.conf import settings
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.http.response import HttpResponseBase
+from rest_framework.exceptions import (
+    APIException,
+    AuthenticationFailed,
+    NotFound,
+    ValidationError,
+)
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from softdesk.events import broker
+from softdesk.metrics import timer
+from softdesk.renderers import FastJSONRenderer
+
+from .cache import ais_contributor
+from .events import EventStreamToken, project_topic
+from .models import Comment, Contributor, Issue, Project, User
+from .serializers import (
+    CommentSerializer,
+    ContributorSerializer,
+    IssueSerializer,
+    ProjectListSerializer,
+    ProjectSerializer,
+    with_contributor_preview,
+)
+
+jwt_authentication = JWTAuthentication()
+
+
+async def authenticate(request, query_token=False):
+    """
+    Authentifie la requête à partir du jeton JWT de l'en-tête Authorization.
+
+    La validation du jeton ne fait aucun accès à la base ; l'utilisateur est
+    ensuite chargé avec l'ORM asynchrone.
+
+    :param query_token: Accepte aussi un jeton de flux (EventStreamToken) passé en
+        paramètre `access_token` (EventSource ne permet pas d'envoyer d'en-tête).
+    :raises AuthenticationFailed: Si le jeton est absent, invalide ou si le compte
+        est inactif.
+    """
+    header = jwt_authentication.get_header(request)
+    raw_token = jwt_authentication.get_raw_token(header) if header else None
+    if raw_token is not None:
+        token = jwt_authentication.get_validated_token(raw_token)
+    elif query_token and "access_token" in request.GET:
+        try:
+            token = EventStreamToken(request.GET["access_token"])
+        except TokenError:
+            raise AuthenticationFailed("Jeton de flux invalide ou expiré.")
+    else:
+        raise AuthenticationFailed("Informations d'authentification non fournies.")
+    try:
+        user_id = token[jwt_settings.USER_ID_CLAIM]
+        user = await User.objects.aget(**{jwt_settings.USER_ID_FIELD: user_id})
+    except (KeyError, User.DoesNotExist):
+        raise AuthenticationFailed("Utilisateur introuvable.")
+    if not user.is_active:
+        raise AuthenticationFailed("Ce compte est désactivé.")
+    return user
+
+
+def json_response(data, status=200):
+    with timer("render"):
+        content = FastJSONRenderer().render(data)
+    return HttpResponse(content, status=status, content_type="application/json")
+
+
+def async_api_view(view=None, *, query_token=False):
+    """
+    Décorateur des vues asynchrones : lecture seule, authentification JWT et
+    conversion des exceptions DRF en réponses JSON. Les données renvoyées par la
+    vue sont rendues en JSON, sauf si elle renvoie déjà une réponse.
+    """
+    if view is None:
+        return partial(async_api_view, query_token=query_token)
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return json_response({"detail": "Méthode non autorisée."}, status=405)
+        try:
+            with timer("auth"):
+                request.user = await authenticate(request, query_token)
+            data = await view(request, *args, **kwargs)
+        except Http404:
+            return json_response({"detail": NotFound.default_detail}, status=404)
+        except APIException as exc:
+            detail = exc.detail
+            response = json_response(
+                detail if isinstance(detail, (dict, list)) else {"detail": detail},
+                status=exc.status_code,
+            )
+            if exc.status_code == 401:
+                response["WWW-Authenticate"] = jwt_authentication.authenticate_header(
+                    request
+                )
+            return response
+        if isinstance(data, HttpResponseBase):
+            return data
+        return json_response(data)
+
+    return wrapper
+
+
+async def paginate(request, queryset, serializer_class):
+    """
+    Pagination par numéro de page, au même format que la pagination DRF.
+    """
+    page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+    try:
+        page = int(request.GET.get("page", 1))
+    except ValueError:
+        page = 0
+    count = await queryset.acount()
+    if page < 1 or (page > 1 and (page - 1) * page_size >= count):
+        raise NotFound("Page invalide.")
+    offset = (page - 1) * page_size
+    objects = [obj async for obj in queryset[offset : offset + page_size]]
+
+    url = request.build_absolute_uri()
+    previous = None
+    if page == 2:
+        previous = remove_query_param(url, "page")
+    elif page > 2:
+        previous = replace_query_param(url, "page", page - 1)
+    return {
+        "count": count,
+        "next": (
+            replace_query_param(url, "page", page + 1)
+            if offset + page_size < count
+            else None
+        ),
+        "previous": previous,
+        "results": serializer_class(objects, many=True).data,
+    }
+
+
+async def aget_or_404(queryset, **kwargs):
+    try:
+        return await queryset.aget(**kwargs)
+    except queryset.model.DoesNotExist:
+        raise Http404
+
+
+async def check_membership(request, project_pk, detail=False):
+    """
+    Vérifie l'appartenance de l'utilisateur au projet, comme les ViewSets synchrones :
+    404 si le projet n'existe pas (ou pour un détail hors projet), liste vide sinon.
+
+    :return: True si l'utilisateur est contributeur du projet.
+    """
+    with timer("perm"):
+        if await ais_contributor(request.user, project_pk):
+            return True
+    if (
+        detail
+        or not await Project.objects.filter(
+            pk=project_pk, pending_delete=False
+        ).aexists()
+    ):
+        raise Http404
+    return False
+
+
+def empty_page():
+    return {"count": 0, "next": None, "previous": None, "results": []}
+
+
+@async_api_view
+async def project_list(request):
+    queryset = (
+        Project.objects.filter(contributors=request.user, pending_delete=False)
+        .select_related("author")
+        .order_by("created_time", "id")
+    )
+    return await paginate(request, queryset, ProjectListSerializer)
+
+
+@async_api_view
+async def project_detail(request, pk):
+    project = await aget_or_404(
+        with_contributor_preview(
+            Project.objects.filter(
+                contributors=request.user, pending_delete=False
+            ).select_related("author")
+        ),
+        pk=pk,
+    )
+    data = ProjectSerializer(project).data
+    data["contributors_url"] = request.build_absolute_uri(data["contributors_url"])
+    return data
+
+
+@async_api_view
+async def issue_list(request, project_pk):
+    if not await check_membership(request, project_pk):
+        return empty_page()
+    queryset = (
+        Issue.objects.filter(project_id=project_pk)
+        .select_related("author", "assignee")
+        .order_by("created_time", "id")
+    )
+    return await paginate(request, queryset, IssueSerializer)
+
+
+@async_api_view
+async def issue_detail(request, project_pk, pk):
+    await check_membership(request, project_pk, detail=True)
+    issue = await aget_or_404(
+        Issue.objects.select_related("author", "assignee"), project_id=project_pk, pk=pk
+    )
+    return IssueSerializer(issue).data
+
+
+@async_api_view
+async def comment_list(request, project_pk, issue_pk):
+    if not await check_membership(request, project_pk):
+        return empty_page()
+    if not await Issue.objects.filter(pk=issue_pk, project_id=project_pk).aexists():
+        raise Http404
+    queryset = (
+        Comment.objects.filter(issue_id=issue_pk)
+        .select_related("author")
+        .order_by("created_time", "id")
+    )
+    return await paginate(request, queryset, CommentSerializer)
+
+
+@async_api_view
+async def comment_detail(request, project_pk, issue_pk, pk):
+    await check_membership(request, project_pk, detail=True)
+    comment = await aget_or_404(
+        Comment.objects.select_related("author"),
+        issue__project_id=project_pk,
+        issue_id=issue_pk,
+        pk=pk,
+    )
+    return CommentSerializer(comment).data
+
+
+@async_api_view
+async def contributor_list(request, project_pk):
+    if not await check_membership(request, project_pk):
+        return empty_page()
+    queryset = (
+        Contributor.objects.filter(project_id=project_pk)
+        .select_related("user")
+        .order_by("created_time", "id")
+    )
+    return await paginate(request, queryset, ContributorSerializer)
+
+
+@async_api_view
+async def contributor_detail(request, project_pk, pk):
+    await check_membership(request, project_pk, detail=True)
+    contributor = await aget_or_404(
+        Contributor.objects.select_related("user"), project_id=project_pk, pk=pk
+    )
+    return ContributorSerializer(contributor).data
+
+
+@async_api_view(query_token=True)
+async def event_stream(request):
+    """
+    Flux Server-Sent Events des projets de l'utilisateur (ou du seul projet
+    `project`) : création, modification et changement de statut des issues,
+    nouveaux commentaires et retraits de contributeurs.
+
+    Une connexion inactive n'occupe qu'une coroutine en attente sur sa file ; un
+    commentaire `ping` est envoyé toutes les EVENTS_HEARTBEAT secondes pour que
+    les proxys ne la ferment pas.
+    """
+    projects = Contributor.objects.filter(
+        user=request.user, project__pending_delete=False
+    ).values_list("project_id", flat=True)
+    project_id = request.GET.get("project")
+    if project_id is not None:
+        try:
+            projects = projects.filter(project_id=uuid.UUID(project_id))
+        except ValueError:
+            raise ValidationError({"project": "Identifiant de projet invalide."})
+    with timer("perm"):
+        project_ids = [pk async for pk in projects]
+    if project_id is not None and not project_ids:
+        raise Http404
+
+    subscription = broker.subscribe(project_topic(pk) for pk in project_ids)
+    response = StreamingHttpResponse(
+        stream_events(request.user, subscription), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+async def stream_events(user, subscription):
+    try:
+        yield f"retry: {settings.EVENTS_RECONNECT_DELAY * 1000}\n\n"
+        while True:
+            try:
+                async with asyncio.timeout(settings.EVENTS_HEARTBEAT):
+                    event = await subscription.get()
+            except TimeoutError:
+                yield ": ping\n\n"
+                continue
+            if event is None:
+                # Client trop lent : il doit se resynchroniser (flux /changes/).
+                yield "event: reset\ndata: {}\n\n"
+                return
+            if event.type == "contributor.removed" and event.data["user"] == user.pk:
+                subscription.unsubscribe(event.topic)
+            yield event.frame
+    finally:
+        subscription.close()
@@ -0,0 +1,125 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from .models import Contributor
+
+
+def membership_cache_key(user_id, project_id):
+    """
+    Clé du cache partagé pour l'appartenance d'un utilisateur à un projet.
+    """
+    return f"softdesk:membership:{user_id}:{project_id}"
+
+
+def is_contributor(request, project_id):
+    """
+    Indique si l'utilisateur de la requête est contributeur du projet.
+
+    Le résultat est mis en cache à deux niveaux :
+      - pour la durée de la requête, sur l'objet HttpRequest ;
+      - dans le cache partagé entre les workers (framework de cache Django),
+        invalidé par les signaux de sauvegarde / suppression de Contributor.
+
+    :param request: Requête (DRF ou Django) portant l'utilisateur authentifié.
+    :param project_id: Identifiant du projet.
+    :return: True si l'utilisateur est contributeur du projet.
+    """
+    user = request.user
+    if not user.is_authenticated:
+        return False
+
+    http_request = getattr(request, "_request", request)
+    local_cache = http_request.__dict__.setdefault("_membership_cache", {})
+    key = membership_cache_key(user.pk, project_id)
+    if key in local_cache:
+        return local_cache[key]
+
+    member = cache.get(key)
+    if member is None:
+        # Mis en cache : lu sur la base principale (voir softdesk.routers)
+        member = (
+            Contributor.objects.using(DEFAULT_DB_ALIAS)
+            .filter(user=user, project_id=project_id, project__pending_delete=False)
+            .exists()
+        )
+        cache.set(key, member, settings.MEMBERSHIP_CACHE_TIMEOUT)
+    local_cache[key] = member
+    return member
+
+
+async def ais_contributor(user, project_id):
+    """
+    Version asynchrone de is_contributor (cache partagé uniquement).
+    """
+    key = membership_cache_key(user.pk, project_id)
+    member = await cache.aget(key)
+    if member is None:
+        member = await (
+            Contributor.objects.using(DEFAULT_DB_ALIAS)
+            .filter(user=user, project_id=project_id, project__pending_delete=False)
+            .aexists()
+        )
+        await cache.aset(key, member, settings.MEMBERSHIP_CACHE_TIMEOUT)
+    return member
+
+
+def invalidate_membership(*memberships):
+    """
+    Supprime les appartenances mises en cache après validation de la transaction
+    en cours. Supprimées avant, elles pourraient être relues et remises en cache
+    par un autre worker qui ne voit pas encore la modification.
+
+    :param memberships: Couples (identifiant utilisateur, identifiant projet).
+    """
+    keys = [
+        membership_cache_key(user_id, project_id) for user_id, project_id in memberships
+    ]
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def project_version_key(project_id):
+    """
+    Clé du compteur de version d'un projet, incrémenté à chaque modification du
+    projet, de ses contributeurs, de ses issues ou de leurs commentaires.
+    """
+    return f"softdesk:project-version:{project_id}"
+
+
+def get_project_versions(project_ids):
+    """
+    Retourne les versions courantes des projets (une seule lecture groupée).
+
+    Une version absente (jamais créée ou évincée du cache) est initialisée à
+    l'horodatage courant, afin de ne jamais retomber sur une ancienne version.
+
+    :param project_ids: Identifiants des projets.
+    :return: Liste des versions, dans l'ordre des identifiants.
+    """
+    keys = [project_version_key(project_id) for project_id in project_ids]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_project_versions(*project_ids):
+    """
+    Incrémente la version des projets après validation de la transaction en
+    cours : les réponses mises en cache pour les versions précédentes ne sont
+    plus jamais lues et expirent d'elles-mêmes.
+    """
+
+    def bump():
+        for project_id in set(project_ids):
+            key = project_version_key(project_id)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, time.time_ns(), None)
+
+    transaction.on_commit(bump)
@@ -0,0 +1,134 @@
+"""
+Journal des modifications par projet, lu par le flux de synchronisation incrémentale.
+
+Chaque création, modification ou suppression d'une issue, d'un commentaire ou
+d'un contributeur ajoute une entrée au journal ; les receivers de api.signals
+l'écrivent dans la transaction de la modification. Le flux renvoie, à partir d'un
+curseur (identifiant de la dernière entrée lue), les objets créés ou modifiés
+depuis et une tombstone (identifiant seul) pour chaque objet supprimé : son coût
+dépend du nombre de modifications, pas de la taille du projet.
+
+Les écritures étant sérialisées par SQLite, les identifiants sont attribués dans
+l'ordre de validation : une entrée ne peut pas apparaître derrière un curseur
+déjà renvoyé.
+"""
+
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+
+from .models import ChangeLogEntry, Comment, Issue
+
+
+def project_ids(instances):
+    """
+    Génère le projet de chaque instance. Les issues des commentaires qui ne sont
+    pas déjà chargées sont lues en une seule requête.
+    """
+    missing = {
+        instance.issue_id
+        for instance in instances
+        if isinstance(instance, Comment) and not Comment.issue.is_cached(instance)
+    }
+    issues = {}
+    if missing:
+        issues = dict(
+            Issue.objects.filter(pk__in=missing).values_list("id", "project_id")
+        )
+    for instance in instances:
+        if not isinstance(instance, Comment):
+            yield instance.project_id
+        elif instance.issue_id in issues:
+            yield issues[instance.issue_id]
+        else:
+            yield instance.issue.project_id
+
+
+def record(model, action, instances):
+    """
+    Ajoute une entrée au journal pour chacune des instances.
+
+    :param model: Issue, Comment ou Contributor.
+    :param action: ChangeLogEntry.CREATED, UPDATED ou DELETED.
+    :param instances: Instances créées, modifiées ou supprimées.
+    :raises ValueError: Si une instance n'a pas de clé primaire (bulk_create dont
+        les identifiants ne sont pas renvoyés par la base : les relire avant).
+    """
+    instances = list(instances)
+    if any(instance.pk is None for instance in instances):
+        raise ValueError(
+            f"Instance de {model._meta.model_name} sans clé primaire : impossible "
+            "de l'inscrire au journal."
+        )
+    ChangeLogEntry.objects.bulk_create(
+        [
+            ChangeLogEntry(
+                project_id=project_id,
+                model=model._meta.model_name,
+                object_id=str(instance.pk),
+                action=action,
+            )
+            for instance, project_id in zip(instances, project_ids(instances))
+        ],
+        batch_size=settings.BULK_BATCH_SIZE,
+    )
+
+
+def parse_ids(model, object_ids):
+    """
+    Convertit les identifiants texte du journal en clés primaires du modèle.
+
+    Les identifiants invalides (entrées écrites pour des instances sans clé
+    primaire, par exemple) sont ignorés plutôt que de faire échouer le flux.
+    """
+    to_python = model._meta.pk.to_python
+    ids = []
+    for object_id in object_ids:
+        try:
+            ids.append(to_python(object_id))
+        except ValidationError:
+            continue
+    return ids
+
+
+def forget_project(project_id):
+    """
+    Purge le journal d'un projet supprimé.
+    """
+    ChangeLogEntry.objects.filter(project_id=project_id).delete()
+
+
+def current_cursor(project):
+    """
+    Retourne le curseur de la dernière entrée du journal du projet (0 s'il est vide).
+    """
+    entries = ChangeLogEntry.objects.filter(project=project).order_by("-id")
+    return entries.values_list("id", flat=True).first() or 0
+
+
+def read_changes(project, cursor, limit):
+    """
+    Lit au plus `limit` entrées du journal postérieures au curseur. Seule la
+    dernière action de chaque objet est retenue.
+
+    :return: Un tuple (changed, deleted, cursor, has_more) : changed et deleted
+        associent au nom de chaque modèle les identifiants de ses objets créés ou
+        modifiés, et supprimés ; cursor est le curseur de la dernière entrée lue.
+    """
+    entries = list(
+        ChangeLogEntry.objects.filter(project=project, id__gt=cursor)
+        .order_by("id")
+        .values_list("id", "model", "object_id", "action")[: limit + 1]
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    actions = {}
+    for _, model, object_id, action in entries:
+        actions[model, object_id] = action
+    changed, deleted = defaultdict(list), defaultdict(list)
+    for (model, object_id), action in actions.items():
+        target = deleted if action == ChangeLogEntry.DELETED else changed
+        target[model].append(object_id)
+    return changed, deleted, entries[-1][0] if entries else cursor, has_more
@@ -0,0 +1,106 @@
+from collections import Counter, defaultdict
+
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Comment, Issue, Project
+
+# Compteur de Project associé à chaque statut d'issue
+STATUS_COUNTERS = {
+    "To Do": "todo_issue_count",
+    "In Progress": "in_progress_issue_count",
+    "Done": "done_issue_count",
+}
+
+
+def apply_deltas(model, deltas):
+    """
+    Applique des variations de compteurs avec des expressions F(), une requête
+    UPDATE par objet, en marquant l'objet comme modifié.
+
+    :param model: Project ou Issue.
+    :param deltas: Dictionnaire {pk: Counter({champ: variation})}.
+    """
+    now = timezone.now()
+    for pk, fields in deltas.items():
+        changes = {field: F(field) + delta for field, delta in fields.items() if delta}
+        if changes:
+            model.objects.filter(pk=pk).update(updated_time=now, **changes)
+
+
+def issues_created(issues):
+    deltas = defaultdict(Counter)
+    for issue in issues:
+        deltas[issue.project_id]["issue_count"] += 1
+        deltas[issue.project_id][STATUS_COUNTERS[issue.status]] += 1
+        issue._loaded_status = issue.status
+    apply_deltas(Project, deltas)
+
+
+def issues_updated(issues):
+    """
+    Reporte les changements de statut des issues sur les compteurs de leur projet.
+    Le statut précédent est celui mémorisé par Issue.from_db.
+    """
+    deltas = defaultdict(Counter)
+    for issue in issues:
+        previous = getattr(issue, "_loaded_status", None)
+        if previous is not None and previous != issue.status:
+            deltas[issue.project_id][STATUS_COUNTERS[previous]] -= 1
+            deltas[issue.project_id][STATUS_COUNTERS[issue.status]] += 1
+        issue._loaded_status = issue.status
+    apply_deltas(Project, deltas)
+
+
+def issues_deleted(issues):
+    deltas = defaultdict(Counter)
+    for issue in issues:
+        status = getattr(issue, "_loaded_status", None) or issue.status
+        deltas[issue.project_id]["issue_count"] -= 1
+        deltas[issue.project_id][STATUS_COUNTERS[status]] -= 1
+    apply_deltas(Project, deltas)
+
+
+def comments_changed(comments, delta):
+    """
+    Ajoute `delta` au compteur de commentaires des issues concernées.
+    """
+    deltas = defaultdict(Counter)
+    for comment in comments:
+        deltas[comment.issue_id]["comment_count"] += delta
+    apply_deltas(Issue, deltas)
+
+
+def _count(queryset, field):
+    """
+    Sous-requête COUNT(*) groupée sur `field`, corrélée à l'objet courant.
+    """
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{field: OuterRef("pk")})
+            .order_by()
+            .values(field)
+            .annotate(total=Count("pk"))
+            .values("total"),
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def recount():
+    """
+    Recalcule tous les compteurs dénormalisés à partir des données.
+
+    :return: Nombre de projets et d'issues mis à jour.
+    """
+    counters = {"issue_count": _count(Issue.objects.all(), "project")}
+    for status, field in STATUS_COUNTERS.items():
+        counters[field] = _count(Issue.objects.filter(status=status), "project")
+    now = timezone.now()
+    projects = Project.objects.update(updated_time=now, **counters)
+    issues = Issue.objects.update(
+        updated_time=now, comment_count=_count(Comment.objects.all(), "issue")
+    )
+    return projects, issues
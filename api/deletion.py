@@ -0,0 +1,234 @@
+"""
+Suppression en arrière-plan des projets, par lots bornés.
+
+La suppression d'un projet par le collecteur de Django charge toutes ses issues,
+commentaires et contributeurs en mémoire et les supprime dans la requête, en
+gardant le verrou d'écriture SQLite pendant toute l'opération. Ici, la requête
+se contente de marquer le projet (pending_delete), qui disparaît aussitôt de
+toutes les vues, et de créer une DeletionJob. Un thread du processus purge
+ensuite les enfants par lots de DELETION_BATCH_SIZE lignes, chaque lot dans sa
+propre transaction, puis supprime le projet. La progression est enregistrée sur
+la tâche, consultable par son auteur.
+
+Une tâche interrompue (arrêt du processus) reste à l'état `running` ; la
+commande purge_deleted_projects la reprend.
+"""
+
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from . import search
+from .cache import bump_project_versions, membership_cache_key
+from .models import ChangeLogEntry, Comment, Contributor, DeletionJob, Issue, Project
+from .signals import post_bulk_delete
+
+logger = logging.getLogger(__name__)
+
+
+def schedule(project, user):
+    """
+    Masque le projet et crée sa tâche de suppression, lancée après validation de
+    la transaction.
+
+    :return: La DeletionJob créée.
+    """
+    Project.objects.filter(pk=project.pk).update(
+        pending_delete=True, updated_time=timezone.now()
+    )
+    comments_total = Issue.objects.filter(project=project).aggregate(
+        total=Sum("comment_count")
+    )["total"]
+    user_ids = list(
+        Contributor.objects.filter(project=project).values_list("user_id", flat=True)
+    )
+    job = DeletionJob.objects.create(
+        project_id=project.pk,
+        project_title=project.title,
+        requested_by=user,
+        issues_total=project.issue_count,
+        comments_total=comments_total or 0,
+        contributors_total=len(user_ids),
+    )
+    bump_project_versions(project.pk)
+    transaction.on_commit(
+        lambda: cache.delete_many(
+            [membership_cache_key(user_id, project.pk) for user_id in user_ids]
+        )
+    )
+    transaction.on_commit(worker.wake)
+    return job
+
+
+def delete_in_batches(queryset, on_batch=None, pause=0):
+    """
+    Supprime les lignes du queryset par lots, sans charger les objets ni envoyer
+    de signaux, chaque lot dans sa propre transaction.
+
+    :param on_batch: Appelé dans la transaction de chaque lot avec la liste des
+        identifiants supprimés.
+    :param pause: Attente (s) entre deux lots, qui laisse passer les autres écritures.
+    :return: Le nombre de lignes supprimées.
+    """
+    deleted = 0
+    while True:
+        ids = list(
+            queryset.order_by().values_list("pk", flat=True)[
+                : settings.DELETION_BATCH_SIZE
+            ]
+        )
+        if not ids:
+            return deleted
+        with transaction.atomic():
+            batch = queryset.model.objects.filter(pk__in=ids)
+            batch._raw_delete(batch.db)
+            if on_batch is not None:
+                on_batch(ids)
+        deleted += len(ids)
+        if pause:
+            time.sleep(pause)
+
+
+def delete_comments(issue):
+    """
+    Supprime les commentaires d'une issue par lots, dans la transaction en cours,
+    avec un signal post_bulk_delete par lot au lieu d'un post_delete par commentaire.
+    Les instances envoyées portent leur date de création, dont dépend api.stats.
+    """
+    comments = Comment.objects.filter(issue=issue).order_by()
+    while True:
+        instances = [
+            Comment(pk=pk, issue=issue, created_time=created_time)
+            for pk, created_time in comments.values_list("pk", "created_time")[
+                : settings.DELETION_BATCH_SIZE
+            ]
+        ]
+        if not instances:
+            return
+        with transaction.atomic():
+            batch = Comment.objects.filter(pk__in=[comment.pk for comment in instances])
+            batch._raw_delete(batch.db)
+            post_bulk_delete.send(sender=Comment, instances=instances)
+
+
+def progress(job, field):
+    """
+    Retourne un callback de delete_in_batches qui incrémente le compteur `field`.
+    """
+
+    def on_batch(ids):
+        DeletionJob.objects.filter(pk=job.pk).update(
+            **{field: F(field) + len(ids)}, updated_time=timezone.now()
+        )
+
+    return on_batch
+
+
+def purge(job):
+    """
+    Supprime les commentaires, issues, contributeurs et le journal du projet de
+    la tâche, puis le projet lui-même.
+    """
+
+    def comments_deleted(ids):
+        search.unindex_documents("comment", ids)
+        progress(job, "comments_deleted")(ids)
+
+    def issues_deleted(ids):
+        search.unindex_documents("issue", ids)
+        progress(job, "issues_deleted")(ids)
+
+    project_id, pause = job.project_id, settings.DELETION_BATCH_PAUSE
+    delete_in_batches(
+        Comment.objects.filter(issue__project_id=project_id), comments_deleted, pause
+    )
+    delete_in_batches(
+        Issue.objects.filter(project_id=project_id), issues_deleted, pause
+    )
+    delete_in_batches(
+        Contributor.objects.filter(project_id=project_id),
+        progress(job, "contributors_deleted"),
+        pause,
+    )
+    delete_in_batches(ChangeLogEntry.objects.filter(project_id=project_id), None, pause)
+    with transaction.atomic():
+        # Le projet n'a plus d'enfants : le collecteur n'a plus rien à charger.
+        Project.objects.filter(pk=project_id).delete()
+        DeletionJob.objects.filter(pk=job.pk).update(
+            status=DeletionJob.DONE,
+            finished_time=timezone.now(),
+            updated_time=timezone.now(),
+        )
+
+
+def run(job):
+    """
+    Exécute une tâche ; en cas d'erreur, la tâche passe à l'état `failed`.
+    """
+    try:
+        purge(job)
+    except Exception as exc:
+        logger.exception("Échec de la suppression du projet %s", job.project_id)
+        DeletionJob.objects.filter(pk=job.pk).update(
+            status=DeletionJob.FAILED, error=str(exc), updated_time=timezone.now()
+        )
+
+
+def run_pending_jobs():
+    """
+    Exécute les tâches en attente, une à la fois. Une tâche n'est exécutée que
+    par le processus qui la fait passer de `pending` à `running`.
+    """
+    while True:
+        job = (
+            DeletionJob.objects.filter(status=DeletionJob.PENDING)
+            .order_by("id")
+            .first()
+        )
+        if job is None:
+            return
+        claimed = DeletionJob.objects.filter(
+            pk=job.pk, status=DeletionJob.PENDING
+        ).update(status=DeletionJob.RUNNING, updated_time=timezone.now())
+        if claimed:
+            run(job)
+
+
+class DeletionWorker:
+    """
+    Thread d'arrière-plan du processus exécutant les tâches de suppression.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.thread = None
+
+    def wake(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(
+                    target=self.loop, name="softdesk-deletion", daemon=True
+                )
+                self.thread.start()
+        self.wakeup.set()
+
+    def loop(self):
+        while True:
+            self.wakeup.wait()
+            self.wakeup.clear()
+            try:
+                run_pending_jobs()
+            except Exception:
+                logger.exception("Erreur du worker de suppression")
+            finally:
+                close_old_connections()
+
+
+worker = DeletionWorker()
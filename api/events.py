@@ -0,0 +1,104 @@
+"""
+Événements temps réel des projets (voir softdesk.events et la vue de flux
+api.async_views.event_stream).
+
+Les événements sont publiés sur le sujet de leur projet une fois la transaction
+validée : une écriture annulée n'est jamais annoncée. Ils ne portent que les
+champs déjà chargés sur l'instance, sans requête supplémentaire ; le client lit
+le détail de l'objet ou le flux /changes/ s'il en a besoin.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework_simplejwt.tokens import Token
+from softdesk.events import Event, broker
+
+
+class EventStreamToken(Token):
+    """
+    Jeton d'ouverture du flux d'événements, seul jeton accepté dans le paramètre
+    `access_token` de l'URL (EventSource ne permet pas d'envoyer d'en-tête).
+
+    Une URL peut être écrite dans les journaux d'accès des serveurs et des proxys :
+    ce jeton n'ouvre que le flux, et expire après EVENTS_TOKEN_LIFETIME secondes.
+    Il n'est pas accepté comme jeton d'accès par les autres routes.
+    """
+
+    token_type = "event_stream"
+    lifetime = timedelta(seconds=settings.EVENTS_TOKEN_LIFETIME)
+
+
+def project_topic(project_id):
+    return f"project:{project_id}"
+
+
+def publish_on_commit(events):
+    if events:
+        transaction.on_commit(lambda: broker.publish(events))
+
+
+def issues_saved(issues, created):
+    """
+    Publie `issue.created`, `issue.status_changed` ou `issue.updated` pour chaque
+    issue. Doit être appelé avant api.counters, qui met à jour le statut mémorisé.
+    """
+    events = []
+    for issue in issues:
+        data = {
+            "project": issue.project_id,
+            "id": issue.pk,
+            "title": issue.title,
+            "status": issue.status,
+            "priority": issue.priority,
+            "tag": issue.tag,
+            "updated_time": issue.updated_time,
+        }
+        previous = getattr(issue, "_loaded_status", None)
+        if created:
+            type = "issue.created"
+        elif previous is not None and previous != issue.status:
+            type = "issue.status_changed"
+            data["previous_status"] = previous
+        else:
+            type = "issue.updated"
+        events.append(Event(project_topic(issue.project_id), type, data))
+    publish_on_commit(events)
+
+
+def comments_created(comments, project_ids):
+    """
+    :param project_ids: Dictionnaire {issue_id: project_id}.
+    """
+    publish_on_commit(
+        [
+            Event(
+                project_topic(project_ids[comment.issue_id]),
+                "comment.created",
+                {
+                    "project": project_ids[comment.issue_id],
+                    "issue": comment.issue_id,
+                    "id": comment.pk,
+                    "created_time": comment.created_time,
+                },
+            )
+            for comment in comments
+        ]
+    )
+
+
+def contributors_removed(contributors):
+    """
+    Annonce le retrait de contributeurs ; leurs connexions se désabonnent du projet.
+    """
+    publish_on_commit(
+        [
+            Event(
+                project_topic(contributor.project_id),
+                "contributor.removed",
+                {"project": contributor.project_id, "user": contributor.user_id},
+            )
+            for contributor in contributors
+        ]
+    )
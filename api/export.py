@@ -0,0 +1,213 @@
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+from .models import Comment, Contributor, Issue, Project
+
+
+def iter_project_records(project):
+    """
+    Génère les enregistrements d'export d'un projet : le projet, puis ses
+    contributeurs, ses issues et leurs commentaires.
+
+    Les enfants sont lus par lots avec QuerySet.iterator(chunk_size=...) et
+    values() : la mémoire utilisée reste constante quelle que soit la taille du
+    projet. Les utilisateurs sont référencés par leur username.
+
+    :param project: Instance de Project à exporter.
+    """
+    chunk_size = settings.EXPORT_CHUNK_SIZE
+    yield {
+        "type": "project",
+        "id": project.pk,
+        "created_time": project.created_time,
+        "updated_time": project.updated_time,
+        "title": project.title,
+        "description": project.description,
+        "project_type": project.type,
+        "author": project.author.username,
+    }
+
+    contributors = (
+        Contributor.objects.filter(project=project)
+        .order_by("created_time", "id")
+        .values("created_time", "user__username")
+    )
+    for row in contributors.iterator(chunk_size=chunk_size):
+        yield {
+            "type": "contributor",
+            "user": row["user__username"],
+            "created_time": row["created_time"],
+        }
+
+    issues = (
+        Issue.objects.filter(project=project)
+        .order_by("created_time", "id")
+        .values(
+            "id",
+            "created_time",
+            "updated_time",
+            "title",
+            "description",
+            "status",
+            "priority",
+            "tag",
+            "author__username",
+            "assignee__username",
+        )
+    )
+    for row in issues.iterator(chunk_size=chunk_size):
+        yield {
+            "type": "issue",
+            "id": row["id"],
+            "created_time": row["created_time"],
+            "updated_time": row["updated_time"],
+            "title": row["title"],
+            "description": row["description"],
+            "status": row["status"],
+            "priority": row["priority"],
+            "tag": row["tag"],
+            "author": row["author__username"],
+            "assignee": row["assignee__username"],
+        }
+
+    comments = (
+        Comment.objects.filter(issue__project=project)
+        .order_by("created_time", "id")
+        .values(
+            "id",
+            "created_time",
+            "updated_time",
+            "content",
+            "issue_id",
+            "author__username",
+        )
+    )
+    for row in comments.iterator(chunk_size=chunk_size):
+        yield {
+            "type": "comment",
+            "id": row["id"],
+            "created_time": row["created_time"],
+            "updated_time": row["updated_time"],
+            "content": row["content"],
+            "issue": row["issue_id"],
+            "author": row["author__username"],
+        }
+
+
+def iter_user_records(user):
+    """
+    Génère les enregistrements de l'export des données d'un utilisateur
+    (portabilité RGPD) : son compte, puis les projets dont il est l'auteur ou
+    contributeur, les issues dont il est l'auteur ou l'assigné et ses commentaires.
+
+    Comme pour iter_project_records, tout est lu par lots avec
+    iterator(chunk_size=...) et values() : la mémoire utilisée ne dépend pas du
+    volume de ses données. Les projets en cours de suppression sont ignorés.
+
+    :param user: Instance de User à exporter.
+    """
+    chunk_size = settings.EXPORT_CHUNK_SIZE
+    yield {
+        "type": "user",
+        "id": user.pk,
+        "username": user.username,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "email": user.email,
+        "birth_date": user.birth_date,
+        "consent": user.consent,
+        "can_be_contacted": user.can_be_contacted,
+        "can_data_be_shared": user.can_data_be_shared,
+        "date_joined": user.date_joined,
+        "last_login": user.last_login,
+    }
+
+    projects = (
+        Project.objects.filter(author=user, pending_delete=False)
+        .order_by("created_time", "id")
+        .values("id", "created_time", "updated_time", "title", "description", "type")
+    )
+    for row in projects.iterator(chunk_size=chunk_size):
+        yield {
+            "type": "project",
+            "id": row["id"],
+            "created_time": row["created_time"],
+            "updated_time": row["updated_time"],
+            "title": row["title"],
+            "description": row["description"],
+            "project_type": row["type"],
+        }
+
+    contributors = (
+        Contributor.objects.filter(user=user, project__pending_delete=False)
+        .order_by("created_time", "id")
+        .values("created_time", "project_id", "project__title")
+    )
+    for row in contributors.iterator(chunk_size=chunk_size):
+        yield {
+            "type": "contributor",
+            "project": row["project_id"],
+            "project_title": row["project__title"],
+            "created_time": row["created_time"],
+        }
+
+    issues = (
+        Issue.objects.filter(
+            Q(author=user) | Q(assignee=user), project__pending_delete=False
+        )
+        .order_by("created_time", "id")
+        .values(
+            "id",
+            "created_time",
+            "updated_time",
+            "title",
+            "description",
+            "status",
+            "priority",
+            "tag",
+            "project_id",
+            "author__username",
+            "assignee__username",
+        )
+    )
+    for row in issues.iterator(chunk_size=chunk_size):
+        yield {
+            "type": "issue",
+            "id": row["id"],
+            "created_time": row["created_time"],
+            "updated_time": row["updated_time"],
+            "title": row["title"],
+            "description": row["description"],
+            "status": row["status"],
+            "priority": row["priority"],
+            "tag": row["tag"],
+            "project": row["project_id"],
+            "author": row["author__username"],
+            "assignee": row["assignee__username"],
+        }
+
+    comments = (
+        Comment.objects.filter(author=user, issue__project__pending_delete=False)
+        .order_by("created_time", "id")
+        .values("id", "created_time", "updated_time", "content", "issue_id")
+    )
+    for row in comments.iterator(chunk_size=chunk_size):
+        yield {
+            "type": "comment",
+            "id": row["id"],
+            "created_time": row["created_time"],
+            "updated_time": row["updated_time"],
+            "content": row["content"],
+            "issue": row["issue_id"],
+        }
+
+
+def iter_ndjson(records):
+    """
+    Encode des enregistrements en NDJSON (un objet JSON par ligne).
+    """
+    for record in records:
+        yield json.dumps(record, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
@@ -0,0 +1,109 @@
+from datetime import datetime, time
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from .models import Issue, User
+
+
+class IssueFilterBackend(BaseFilterBackend):
+    """
+    Filtrage et tri côté serveur des tickets d'un projet.
+
+    Paramètres acceptés (les valeurs multiples sont séparées par des virgules ou
+    répétées) :
+      - status, priority, tag : une ou plusieurs valeurs parmi les choix du modèle ;
+      - assignee : un ou plusieurs usernames ;
+      - created_after, created_before : date ou date-heure ISO 8601 ;
+      - ordering : champ de tri, préfixé par '-' pour un tri décroissant.
+
+    Les filtres s'appuient sur les index composites définis sur le modèle Issue.
+    """
+
+    choice_fields = ("status", "priority", "tag")
+    ordering_fields = ("created_time", "title", "status", "priority", "tag")
+    ordering_query_param = "ordering"
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+
+        for field in self.choice_fields:
+            values = self.get_values(params, field)
+            if values:
+                allowed = {choice for choice, _ in Issue._meta.get_field(field).choices}
+                invalid = set(values) - allowed
+                if invalid:
+                    names = ", ".join(sorted(invalid))
+                    raise ValidationError(
+                        {field: f"Valeur(s) invalide(s) : {names}."}
+                    )
+                queryset = self.filter_values(queryset, field, values)
+
+        usernames = self.get_values(params, "assignee")
+        if usernames:
+            # Résolution préalable des usernames pour filtrer directement sur
+            # assignee_id et profiter de l'index (project, assignee, created_time).
+            assignee_ids = list(
+                User.objects.filter(username__in=usernames).values_list("id", flat=True)
+            )
+            queryset = self.filter_values(queryset, "assignee", assignee_ids)
+
+        created_after = self.get_datetime(params, "created_after")
+        if created_after is not None:
+            queryset = queryset.filter(created_time__gte=created_after)
+        created_before = self.get_datetime(params, "created_before")
+        if created_before is not None:
+            queryset = queryset.filter(created_time__lt=created_before)
+
+        ordering = params.get(self.ordering_query_param)
+        if ordering:
+            if ordering.lstrip("-") not in self.ordering_fields:
+                raise ValidationError(
+                    {
+                        self.ordering_query_param: "Tri possible sur : "
+                        f"{', '.join(self.ordering_fields)}."
+                    }
+                )
+            direction = "-" if ordering.startswith("-") else ""
+            queryset = queryset.order_by(ordering, f"{direction}id")
+        return queryset
+
+    def filter_values(self, queryset, field, values):
+        """
+        Filtre sur une ou plusieurs valeurs ; une valeur unique est comparée par
+        égalité afin que l'index composite couvre aussi le tri par created_time.
+        """
+        if len(values) == 1:
+            return queryset.filter(**{field: values[0]})
+        return queryset.filter(**{f"{field}__in": values})
+
+    def get_values(self, params, name):
+        """
+        Retourne les valeurs d'un paramètre multi-valué (répété ou séparé par des
+        virgules).
+        """
+        return [
+            value.strip()
+            for raw in params.getlist(name)
+            for value in raw.split(",")
+            if value.strip()
+        ]
+
+    def get_datetime(self, params, name):
+        """
+        Convertit un paramètre date ou date-heure ISO 8601 en valeur filtrable.
+        """
+        raw = params.get(name)
+        if not raw:
+            return None
+        value = parse_datetime(raw)
+        if value is None:
+            day = parse_date(raw)
+            if day is None:
+                raise ValidationError({name: "Date invalide, format ISO 8601 attendu."})
+            value = datetime.combine(day, time.min)
+        if timezone.is_naive(value):
+            value = timezone.make_aware(value)
+        return value
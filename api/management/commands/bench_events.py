@@ -0,0 +1,168 @@
+import asyncio
+import json
+import time
+import tracemalloc
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from rest_framework_simplejwt.tokens import AccessToken
+from softdesk.events import Event, broker
+
+from api.events import project_topic
+from api.models import Project
+
+
+class Connection:
+    """
+    Client SSE simulé : échange des messages ASGI avec l'application, sans socket.
+    """
+
+    def __init__(self, app, scope, received):
+        self.app = app
+        self.scope = scope
+        self.received = received
+        self.status = None
+        self.opened = asyncio.Event()
+        self.disconnected = asyncio.Event()
+        self.request_sent = False
+
+    async def run(self):
+        await self.app(self.scope, self.receive, self.send)
+
+    async def receive(self):
+        if not self.request_sent:
+            self.request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await self.disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message):
+        if message["type"] == "http.response.start":
+            self.status = message["status"]
+        elif message["type"] == "http.response.body":
+            self.opened.set()
+            for frame in message.get("body", b"").decode().split("\n\n"):
+                if frame.startswith("event: bench\n"):
+                    data = json.loads(frame.split("data: ", 1)[1])
+                    self.received(data["n"], time.perf_counter())
+
+
+class Command(BaseCommand):
+    """
+    Test de charge local du flux d'événements (/api/async/events/).
+
+    Ouvre de nombreuses connexions SSE inactives sur l'application ASGI, dans ce
+    processus et sans serveur HTTP, puis publie des événements sur le projet
+    suivi et mesure la mémoire occupée par connexion et le délai de remise de
+    chaque événement à toutes les connexions. La commande échoue si un événement
+    n'est pas remis à toutes les connexions, ou si des abonnements subsistent
+    après leur fermeture.
+    """
+
+    help = "Test de charge des connexions d'événements temps réel."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--username", help="Utilisateur des connexions")
+        parser.add_argument("--connections", type=int, default=2000)
+        parser.add_argument("--events", type=int, default=20)
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=10,
+            help="Délai maximal (s) de remise d'un événement à toutes les connexions",
+        )
+
+    def handle(self, *args, **options):
+        projects = Project.objects.annotate(size=Count("issues")).order_by("-size")
+        if options["username"]:
+            projects = projects.filter(contributors__username=options["username"])
+        project = projects.select_related("author").first()
+        if project is None:
+            raise CommandError("Aucun projet : lancez d'abord seed_softdesk.")
+        user = (
+            project.contributors.get(username=options["username"])
+            if options["username"]
+            else project.author
+        )
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/api/async/events/",
+            "raw_path": b"/api/async/events/",
+            "root_path": "",
+            "query_string": f"project={project.pk}".encode(),
+            "headers": [
+                (b"host", b"localhost"),
+                (b"authorization", f"Bearer {AccessToken.for_user(user)}".encode()),
+            ],
+            "client": ("127.0.0.1", 0),
+            "server": ("localhost", 80),
+        }
+        asyncio.run(self.run(scope, project_topic(project.pk), options))
+
+    async def run(self, scope, topic, options):
+        count, events = options["connections"], options["events"]
+        published, arrivals = {}, [[] for _ in range(events)]
+        done = [asyncio.Event() for _ in range(events)]
+
+        def received(n, at):
+            arrivals[n].append(at - published[n])
+            if len(arrivals[n]) == count:
+                done[n].set()
+
+        app = ASGIHandler()
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        connections = [Connection(app, scope, received) for _ in range(count)]
+        tasks = [asyncio.create_task(connection.run()) for connection in connections]
+        await asyncio.gather(*(connection.opened.wait() for connection in connections))
+        opened = time.perf_counter() - start
+        memory = tracemalloc.get_traced_memory()[0] - baseline
+        tracemalloc.stop()
+
+        failed = [c.status for c in connections if c.status != 200]
+        if failed:
+            raise CommandError(f"{len(failed)} connexion(s) refusée(s) : {failed[0]}.")
+        self.stdout.write(
+            f"{count} connexions ouvertes en {opened:.2f} s, "
+            f"{memory / 1024 / count:.1f} Ko par connexion "
+            f"({memory / 1024 / 1024:.1f} Mo au total)"
+        )
+
+        fanout = []
+        for n in range(events):
+            published[n] = time.perf_counter()
+            await sync_to_async(broker.publish)([Event(topic, "bench", {"n": n})])
+            try:
+                await asyncio.wait_for(done[n].wait(), options["timeout"])
+            except TimeoutError:
+                raise CommandError(
+                    f"Événement {n} remis à {len(arrivals[n])}/{count} connexions."
+                )
+            fanout.append(max(arrivals[n]))
+
+        latencies = sorted(latency for batch in arrivals for latency in batch)
+        fanout.sort()
+        self.stdout.write(
+            f"{events} événements : remise p50 {self.ms(latencies, 0.5)}, "
+            f"p95 {self.ms(latencies, 0.95)}, p99 {self.ms(latencies, 0.99)} ; "
+            f"toutes connexions p50 {self.ms(fanout, 0.5)}, max {self.ms(fanout, 1)}"
+        )
+
+        for connection in connections:
+            connection.disconnected.set()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        remaining = broker.subscriber_count()
+        if remaining:
+            raise CommandError(f"{remaining} abonnement(s) non fermé(s).")
+        self.stdout.write(self.style.SUCCESS("Toutes les connexions sont fermées."))
+
+    def ms(self, values, percentile):
+        index = min(len(values) - 1, int(percentile * len(values)))
+        return f"{values[index] * 1000:.2f} ms"
@@ -0,0 +1,108 @@
+import io
+import statistics
+import time
+import uuid
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api.models import Issue, Project, User
+from api.serializers import IssueSerializer
+from softdesk.parsers import FastJSONParser
+from softdesk.renderers import FastJSONRenderer, orjson
+
+
+class Command(BaseCommand):
+    """
+    Micro-benchmark du renderer et du parser JSON sur des pages d'issues.
+
+    Les issues sont construites en mémoire (aucun accès à la base) et rendues
+    sous deux formes : la représentation de IssueSerializer (chaînes déjà
+    formatées) et des lignes brutes contenant des UUID et des datetimes, comme
+    celles de values(). La commande vérifie que FastJSONRenderer produit les
+    mêmes octets que JSONRenderer.
+    """
+
+    help = "Compare JSONRenderer / FastJSONRenderer sur des pages d'issues."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--items", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=50)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(self.style.WARNING("orjson absent : repli sur json."))
+        issues = self.build_issues(options["items"])
+        pages = {
+            "serializer": {
+                "count": len(issues),
+                "next": None,
+                "previous": None,
+                "results": IssueSerializer(issues, many=True).data,
+            },
+            "values": [
+                {
+                    "id": issue.id,
+                    "project_id": issue.project_id,
+                    "created_time": issue.created_time,
+                    "title": issue.title,
+                    "status": issue.status,
+                }
+                for issue in issues
+            ],
+        }
+
+        for name, data in pages.items():
+            expected = JSONRenderer().render(data)
+            if FastJSONRenderer().render(data) != expected:
+                raise CommandError(f"Sortie différente de JSONRenderer ({name}).")
+            self.report(
+                f"render {name}",
+                self.measure(lambda: JSONRenderer().render(data), options),
+                self.measure(lambda: FastJSONRenderer().render(data), options),
+                len(expected),
+            )
+            self.report(
+                f"parse {name}",
+                self.measure(lambda: JSONParser().parse(io.BytesIO(expected)), options),
+                self.measure(
+                    lambda: FastJSONParser().parse(io.BytesIO(expected)), options
+                ),
+                len(expected),
+            )
+
+    def build_issues(self, count):
+        author = User(id=1, username="author")
+        assignee = User(id=2, username="assignee")
+        project = Project(id=uuid.uuid4(), title="Bench", author=author)
+        now = timezone.now()
+        return [
+            Issue(
+                id=uuid.uuid4(),
+                project=project,
+                author=author,
+                assignee=assignee if index % 2 else None,
+                title=f"Issue n°{index} — « benchmark »",
+                description="Description de l'issue. " * 10,
+                created_time=now - timedelta(minutes=index),
+                updated_time=now,
+            )
+            for index in range(count)
+        ]
+
+    def measure(self, function, options):
+        timings = []
+        for _ in range(options["repeat"]):
+            start = time.perf_counter()
+            function()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
+
+    def report(self, label, reference, fast, size):
+        self.stdout.write(
+            f"{label:<20} {size / 1024:>8.1f} Ko  json {reference:>7.2f} ms  "
+            f"orjson {fast:>7.2f} ms  x{reference / fast:.1f}"
+        )
@@ -0,0 +1,932 @@
+import asyncio
+import json
+import math
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from asgiref.sync import async_to_sync
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+from django.db.models import Count
+from django.test import AsyncClient, Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from rest_framework.settings import api_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from users.models import User
+
+from api.models import Comment, Contributor, DeletionJob, Issue, Project
+from api.pagination import KeysetPagination
+
+MODES = ("routes", "pagination", "bulk", "load")
+PAGE_SIZE = KeysetPagination.page_size
+# Requêtes d'une page de la liste des issues (mode pagination) : appartenance,
+# validateurs ETag et page demandée, plus le COUNT(*) de la pagination par numéro.
+PAGINATION_BUDGETS = {"cursor": 3, "page": 4}
+
+PROJECT = lambda c: {"project_pk": c["project"].pk}  # noqa: E731
+ISSUE = lambda c: {**PROJECT(c), "issue_pk": c["issue"].pk}  # noqa: E731
+
+
+def bench_users(count):
+    return User.objects.bulk_create(
+        User(username=f"bench_{uuid.uuid4().hex[:12]}", birth_date=date(1990, 1, 1))
+        for _ in range(count)
+    )
+
+
+# Préparation des routes d'écriture ("prepare") : objets créés à chaque itération,
+# hors mesure, dont l'utilisateur mesuré est l'auteur (routes réservées à l'auteur,
+# cible d'un DELETE).
+def own_project(ctx, i):
+    project = Project.objects.create(
+        title=f"Bench {i}",
+        description="Projet de benchmark",
+        type="Backend",
+        author=ctx["user"],
+    )
+    Contributor.objects.create(project=project, user=ctx["user"])
+    return {"project": project}
+
+
+def own_issue(ctx, i):
+    issue = Issue.objects.create(
+        title=f"Bench issue {i}",
+        description="Issue de benchmark",
+        project=ctx["project"],
+        author=ctx["user"],
+    )
+    return {"issue": issue}
+
+
+def own_comment(ctx, i):
+    comment = Comment.objects.create(
+        issue=ctx["issue"], author=ctx["user"], content=f"Commentaire {i}"
+    )
+    return {"comment": comment}
+
+
+def new_contributor(ctx, i):
+    project = own_project(ctx, i)
+    (user,) = bench_users(1)
+    contributor = Contributor.objects.create(project=project["project"], user=user)
+    return {**project, "contributor": contributor}
+
+
+def new_users(ctx, i):
+    return {**own_project(ctx, i), "usernames": bench_users(10)}
+
+
+def new_contributors(ctx, i):
+    prepared = new_users(ctx, i)
+    Contributor.objects.bulk_create(
+        Contributor(project=prepared["project"], user=user)
+        for user in prepared["usernames"]
+    )
+    return prepared
+
+
+def deletion_job(ctx, i):
+    job = DeletionJob.objects.create(
+        project_id=uuid.uuid4(), project_title=f"Bench {i}", requested_by=ctx["user"]
+    )
+    return {"job": job}
+
+
+def project_data(ctx, i):
+    return {
+        "title": f"Bench {i}",
+        "description": "Projet de benchmark",
+        "type": "Backend",
+    }
+
+
+def issue_data(ctx, i):
+    return {
+        "title": f"Bench issue {i}",
+        "description": "Issue de benchmark",
+        "project": str(ctx["project"].pk),
+    }
+
+
+def usernames(ctx, i):
+    return {"usernames": [user.username for user in ctx["usernames"]]}
+
+
+PROJECT_DETAIL = lambda c: {"pk": c["project"].pk}  # noqa: E731
+ISSUE_DETAIL = lambda c: {**PROJECT(c), "pk": c["issue"].pk}  # noqa: E731
+COMMENT_DETAIL = lambda c: {**ISSUE(c), "pk": c["comment"].pk}  # noqa: E731
+CONTRIBUTOR_DETAIL = lambda c: {**PROJECT(c), "pk": c["contributor"].pk}  # noqa: E731
+
+# Lectures enchaînées par chaque client du mode load, servies par les vues DRF
+# (WSGI) puis par les vues asynchrones de api/async_views.py (ASGI, préfixe async-).
+LOAD_ROUTES = [
+    ("project-detail", lambda c: {"pk": c["project"].pk}),
+    ("project-issues-list", PROJECT),
+    ("project-issues-detail", lambda c: {**PROJECT(c), "pk": c["issue"].pk}),
+    ("issue-comments-list", ISSUE),
+]
+
+# Routes de api/urls.py et users/urls.py mesurées, avec leur budget de requêtes SQL.
+# Les routes marquées "hashing" calculent un hash de mot de passe (PBKDF2) et sont
+# mesurées sur moins d'itérations.
+ROUTES = [
+    {"name": "project-list", "budget": 3},
+    {
+        "name": "project-detail",
+        "kwargs": lambda c: {"pk": c["project"].pk},
+        "budget": 2,
+    },
+    {
+        "name": "project-export",
+        "kwargs": lambda c: {"pk": c["project"].pk},
+        "budget": 4,
+    },
+    {
+        "name": "project-list",
+        "method": "post",
+        "data": lambda ctx, i: {
+            "title": f"Bench {i}",
+            "description": "Projet de benchmark",
+            "type": "Backend",
+        },
+        "budget": 4,
+    },
+    {
+        "name": "project-changes",
+        "kwargs": lambda c: {"pk": c["project"].pk},
+        "query": "since=0",
+        "budget": 5,
+    },
+    {
+        "name": "project-stats",
+        "kwargs": lambda c: {"pk": c["project"].pk},
+        "budget": 3,
+    },
+    {"name": "project-issues-list", "kwargs": PROJECT, "budget": 4},
+    {
+        "name": "project-issues-list",
+        "kwargs": PROJECT,
+        "query": "status=Done&ordering=-created_time",
+        "label": "filtered",
+        "budget": 4,
+    },
+    {
+        "name": "project-issues-list",
+        "kwargs": PROJECT,
+        "query": "pagination=cursor",
+        "label": "cursor",
+        "budget": 3,
+    },
+    {
+        "name": "project-issues-detail",
+        "kwargs": lambda c: {**PROJECT(c), "pk": c["issue"].pk},
+        "budget": 2,
+    },
+    {
+        "name": "project-issues-list",
+        "method": "post",
+        "kwargs": PROJECT,
+        "data": lambda ctx, i: {
+            "title": f"Bench issue {i}",
+            "description": "Issue de benchmark",
+            "project": str(ctx["project"].pk),
+        },
+        "budget": 8,
+    },
+    {
+        "name": "project-issues-bulk",
+        "method": "post",
+        "kwargs": PROJECT,
+        "data": lambda ctx, i: [
+            {"title": f"Bulk {i}-{n}", "description": "Issue groupée"}
+            for n in range(20)
+        ],
+        "budget": 9,
+    },
+    {"name": "issue-comments-list", "kwargs": ISSUE, "budget": 4},
+    {
+        "name": "issue-comments-detail",
+        "kwargs": lambda c: {**ISSUE(c), "pk": c["comment"].pk},
+        "budget": 2,
+    },
+    {
+        "name": "issue-comments-list",
+        "method": "post",
+        "kwargs": ISSUE,
+        "data": lambda ctx, i: {
+            "content": f"Commentaire de benchmark {i}",
+            "issue": str(ctx["issue"].pk),
+        },
+        "budget": 8,
+    },
+    {"name": "project-contributors-list", "kwargs": PROJECT, "budget": 3},
+    {
+        "name": "project-contributors-detail",
+        "kwargs": lambda c: {**PROJECT(c), "pk": c["contributor"].pk},
+        "budget": 3,
+    },
+    {
+        "name": "project-detail",
+        "method": "put",
+        "kwargs": PROJECT_DETAIL,
+        "prepare": own_project,
+        "data": project_data,
+        "budget": 3,
+    },
+    {
+        "name": "project-detail",
+        "method": "patch",
+        "kwargs": PROJECT_DETAIL,
+        "prepare": own_project,
+        "data": lambda ctx, i: {"title": f"Bench modifié {i}"},
+        "budget": 3,
+    },
+    {
+        "name": "project-detail",
+        "method": "delete",
+        "kwargs": PROJECT_DETAIL,
+        "prepare": own_project,
+        "budget": 8,
+    },
+    {
+        "name": "project-issues-detail",
+        "method": "put",
+        "kwargs": ISSUE_DETAIL,
+        "prepare": own_issue,
+        "data": issue_data,
+        "budget": 7,
+    },
+    {
+        "name": "project-issues-detail",
+        "method": "patch",
+        "kwargs": ISSUE_DETAIL,
+        "prepare": own_issue,
+        "data": lambda ctx, i: {"status": "In Progress"},
+        "budget": 9,
+    },
+    {
+        "name": "project-issues-detail",
+        "method": "delete",
+        "kwargs": ISSUE_DETAIL,
+        "prepare": own_issue,
+        "budget": 9,
+    },
+    {
+        "name": "issue-comments-detail",
+        "method": "put",
+        "kwargs": COMMENT_DETAIL,
+        "prepare": own_comment,
+        "data": lambda ctx, i: {
+            "content": f"Commentaire modifié {i}",
+            "issue": str(ctx["issue"].pk),
+        },
+        "budget": 7,
+    },
+    {
+        "name": "issue-comments-detail",
+        "method": "patch",
+        "kwargs": COMMENT_DETAIL,
+        "prepare": own_comment,
+        "data": lambda ctx, i: {"content": f"Commentaire modifié {i}"},
+        "budget": 6,
+    },
+    {
+        "name": "issue-comments-detail",
+        "method": "delete",
+        "kwargs": COMMENT_DETAIL,
+        "prepare": own_comment,
+        "budget": 7,
+    },
+    {
+        "name": "project-contributors-detail",
+        "method": "put",
+        "kwargs": CONTRIBUTOR_DETAIL,
+        "prepare": new_contributor,
+        "data": lambda ctx, i: {
+            "user": ctx["contributor"].user.username,
+            "project": str(ctx["project"].pk),
+        },
+        "budget": 9,
+    },
+    {
+        "name": "project-contributors-detail",
+        "method": "patch",
+        "kwargs": CONTRIBUTOR_DETAIL,
+        "prepare": new_contributor,
+        "data": lambda ctx, i: {"user": ctx["contributor"].user.username},
+        "budget": 8,
+    },
+    {
+        "name": "project-contributors-detail",
+        "method": "delete",
+        "kwargs": CONTRIBUTOR_DETAIL,
+        "prepare": new_contributor,
+        "budget": 8,
+    },
+    {
+        "name": "project-contributors-bulk",
+        "method": "post",
+        "kwargs": PROJECT,
+        "prepare": new_users,
+        "data": usernames,
+        "budget": 9,
+    },
+    {
+        "name": "project-contributors-bulk",
+        "method": "delete",
+        "kwargs": PROJECT,
+        "prepare": new_contributors,
+        "data": usernames,
+        "budget": 9,
+    },
+    {"name": "deletion-list", "budget": 2},
+    {
+        "name": "deletion-detail",
+        "kwargs": lambda c: {"pk": c["job"].pk},
+        "prepare": deletion_job,
+        "budget": 1,
+    },
+    # Routes asynchrones (api/async_urls.py), servies par l'adaptateur
+    # asynchrone du gestionnaire WSGI ; le flux d'événements est lu par le
+    # gestionnaire ASGI (première trame seulement).
+    {"name": "async-project-list", "budget": 3},
+    {"name": "async-project-detail", "kwargs": PROJECT_DETAIL, "budget": 3},
+    {"name": "async-project-issues-list", "kwargs": PROJECT, "budget": 3},
+    {"name": "async-project-issues-detail", "kwargs": ISSUE_DETAIL, "budget": 2},
+    {"name": "async-issue-comments-list", "kwargs": ISSUE, "budget": 4},
+    {"name": "async-issue-comments-detail", "kwargs": COMMENT_DETAIL, "budget": 2},
+    {"name": "async-project-contributors-list", "kwargs": PROJECT, "budget": 3},
+    {
+        "name": "async-project-contributors-detail",
+        "kwargs": CONTRIBUTOR_DETAIL,
+        "budget": 2,
+    },
+    {"name": "async-events", "events": True, "budget": 2},
+    {"name": "event-token", "method": "post", "budget": 0},
+    {"name": "search", "query": "q=issue", "budget": 1},
+    {"name": "user-list", "budget": 2},
+    {"name": "user-detail", "kwargs": lambda c: {"pk": c["user"].pk}, "budget": 1},
+    {"name": "user-me", "budget": 0},
+    {"name": "user-export", "budget": 4},
+    {
+        "name": "user-register",
+        "method": "post",
+        "data": lambda ctx, i: {
+            "username": f"bench_register_{i}",
+            "password": "bench-password",
+            "birth_date": "1990-01-01",
+            "consent": True,
+        },
+        "hashing": True,
+        "budget": 2,
+    },
+    {
+        "name": "user-login",
+        "method": "post",
+        "data": lambda ctx, i: {
+            "username": ctx["user"].username,
+            "password": ctx["password"],
+        },
+        "hashing": True,
+        "budget": 1,
+    },
+    {
+        "name": "token_refresh",
+        "method": "post",
+        "data": lambda ctx, i: {"refresh": str(RefreshToken.for_user(ctx["user"]))},
+        # Lecture de l'utilisateur, puis révocation du jeton présenté (transaction)
+        "budget": 4,
+    },
+    {
+        "name": "token_verify",
+        "method": "post",
+        "data": lambda ctx, i: {"token": ctx["access"]},
+        "budget": 0,
+    },
+]
+
+
+class Command(BaseCommand):
+    """
+    Mesure chaque route de l'API sur les données présentes en base (voir seed_softdesk).
+
+    Pour chaque route, la commande enregistre les percentiles de latence et le
+    nombre de requêtes SQL, et échoue si une route dépasse son budget de requêtes
+    ou si sa latence p95 régresse au-delà du seuil par rapport à une référence.
+    Toutes les écritures sont annulées à la fin (transaction en rollback). Les
+    limites de débit (softdesk.throttling) sont désactivées pendant la mesure,
+    qui enchaîne plus de requêtes qu'elles n'en autorisent.
+    """
+
+    help = "Benchmark des endpoints avec budgets de requêtes SQL."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--username", help="Utilisateur du benchmark")
+        parser.add_argument(
+            "--password",
+            default="softdesk-seed",
+            help="Mot de passe de l'utilisateur (routes de connexion)",
+        )
+        parser.add_argument("--iterations", type=int, default=30)
+        parser.add_argument("--warmup", type=int, default=3)
+        parser.add_argument(
+            "--hashing-iterations",
+            type=int,
+            default=3,
+            help="Itérations des routes qui calculent un hash de mot de passe",
+        )
+        parser.add_argument("--routes", help="Noms de routes à mesurer (virgules)")
+        parser.add_argument("--baseline", help="Fichier JSON de référence à comparer")
+        parser.add_argument(
+            "--save-baseline", help="Enregistre les résultats comme référence"
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.25,
+            help="Régression p95 tolérée par rapport à la référence (0.25 = 25%%)",
+        )
+        parser.add_argument(
+            "--mode",
+            choices=MODES,
+            default="routes",
+            help="routes : chaque route et son budget ; pagination : latence de la "
+            "première et de la N-ième page de la liste des issues ; bulk : débit de "
+            "création d'issues, route groupée contre POST unitaires ; load : débit et "
+            "p99 des lectures sous charge concurrente, WSGI contre ASGI",
+        )
+        parser.add_argument(
+            "--pages",
+            type=int,
+            default=1000,
+            help="Profondeur de la page comparée à la première (mode pagination)",
+        )
+        parser.add_argument(
+            "--bulk-size",
+            type=int,
+            default=200,
+            help="Nombre d'issues créées par chaque méthode (mode bulk)",
+        )
+        parser.add_argument(
+            "--min-bulk-speedup",
+            type=float,
+            default=5,
+            help="Gain de débit minimal de la route groupée (mode bulk)",
+        )
+        parser.add_argument(
+            "--max-depth-ratio",
+            type=float,
+            default=1.5,
+            help="Rapport p50 toléré entre la page profonde et la première page en "
+            "pagination par curseur (mode pagination)",
+        )
+
+        parser.add_argument(
+            "--clients",
+            type=int,
+            default=100,
+            help="Clients simultanés (mode load)",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=10,
+            help="Requêtes envoyées par chaque client (mode load)",
+        )
+        parser.add_argument(
+            "--min-async-ratio",
+            type=float,
+            default=0.5,
+            help="Rapport de débit minimal ASGI / WSGI (mode load)",
+        )
+        parser.add_argument(
+            "--max-p99",
+            type=float,
+            default=5000,
+            help="Latence p99 maximale en ms de chaque chemin sous charge (mode load)",
+        )
+
+    def handle(self, *args, **options):
+        unthrottled = {
+            **settings.REST_FRAMEWORK,
+            "DEFAULT_THROTTLE_RATES": dict.fromkeys(
+                api_settings.DEFAULT_THROTTLE_RATES
+            ),
+        }
+        # AsyncClient (SSE, mode load) envoie toujours l'en-tête Host: testserver.
+        with (
+            override_settings(
+                REST_FRAMEWORK=unthrottled,
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+            ),
+            transaction.atomic(),
+        ):
+            context = self.build_context(options)
+            client = APIClient(SERVER_NAME="localhost")
+            client.credentials(HTTP_AUTHORIZATION=f"Bearer {context['access']}")
+            failures = getattr(self, f"bench_{options['mode']}")(
+                client, context, options
+            )
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError("\n".join(failures))
+        self.stdout.write(
+            self.style.SUCCESS("Toutes les routes respectent leur budget.")
+        )
+
+    def bench_routes(self, client, context, options):
+        """
+        Mesure chaque route de ROUTES et la compare à son budget de requêtes et à
+        la référence éventuelle.
+        """
+        routes = ROUTES
+        if options["routes"]:
+            names = set(options["routes"].split(","))
+            routes = [route for route in ROUTES if route["name"] in names]
+
+        results = {}
+        for route in routes:
+            key = self.route_key(route)
+            results[key] = self.measure(client, route, context, options)
+            self.report(key, route, results[key])
+
+        if options["save_baseline"]:
+            with open(options["save_baseline"], "w", encoding="utf-8") as stream:
+                json.dump(results, stream, indent=2)
+        return self.check_budgets(routes, results, options)
+
+    def bench_pagination(self, client, context, options):
+        """
+        Compare la première page et la page --pages de la liste des issues du
+        projet mesuré, en pagination par curseur et par numéro de page (réponses
+        non mises en cache). La pagination par curseur doit garder une latence et
+        un nombre de requêtes constants quelle que soit la profondeur.
+        """
+        project = context["project"]
+        depth = min(options["pages"], math.ceil(project.issue_count / PAGE_SIZE))
+        if depth < 2:
+            raise CommandError(
+                "Le projet mesuré a moins de deux pages d'issues : lancez "
+                "seed_softdesk avec davantage d'issues."
+            )
+        if depth < options["pages"]:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Le projet mesuré n'a que {depth} page(s) d'issues : page "
+                    f"{depth} mesurée au lieu de {options['pages']}."
+                )
+            )
+
+        url = reverse("project-issues-list", kwargs=PROJECT(context))
+        with override_settings(RESPONSE_CACHE_TIMEOUT=0):
+            deep_cursor = f"{url}?pagination=cursor"
+            for _ in range(depth - 1):
+                deep_cursor = client.get(deep_cursor).json()["next"]
+
+            results = {}
+            for label, first, deep in (
+                ("cursor", f"{url}?pagination=cursor", deep_cursor),
+                ("page", f"{url}?page=1", f"{url}?page={depth}"),
+            ):
+                for page, page_url in ((1, first), (depth, deep)):
+                    route = {
+                        "name": "project-issues-list",
+                        "label": f"{label}, page {page}",
+                        "budget": PAGINATION_BUDGETS[label],
+                    }
+                    results[label, page] = self.measure(
+                        client, route, context, options, url=page_url
+                    )
+                    self.report(self.route_key(route), route, results[label, page])
+
+        failures = []
+        first, deep = results["cursor", 1], results["cursor", depth]
+        ratio = deep["p50"] / first["p50"] if first["p50"] else 1
+        page_ratio = results["page", depth]["p50"] / results["page", 1]["p50"]
+        self.stdout.write(
+            f"Curseur : page {depth} / page 1 = {ratio:.2f} (p50), "
+            f"numéro de page : {page_ratio:.2f}"
+        )
+        if ratio > options["max_depth_ratio"]:
+            failures.append(
+                f"Pagination par curseur : page {depth} {ratio:.2f} fois plus lente "
+                f"que la page 1 (max {options['max_depth_ratio']})."
+            )
+        for (label, page), result in results.items():
+            if result["queries"] > PAGINATION_BUDGETS[label]:
+                failures.append(
+                    f"Pagination ({label}), page {page} : {result['queries']} "
+                    f"requêtes SQL (budget {PAGINATION_BUDGETS[label]})."
+                )
+        return failures
+
+    def bench_bulk(self, client, context, options):
+        """
+        Compare le débit de création de --bulk-size issues (issues/s) par une
+        requête sur /issues/bulk/ et par autant de POST unitaires. Échoue si le
+        gain est inférieur à --min-bulk-speedup ou si la requête groupée dépasse le
+        budget de requêtes de la route project-issues-bulk.
+        """
+        size = options["bulk_size"]
+        if not 0 < size <= settings.BULK_MAX_ITEMS:
+            raise CommandError(
+                f"--bulk-size doit être compris entre 1 et {settings.BULK_MAX_ITEMS}."
+            )
+        project = str(context["project"].pk)
+        list_url = reverse("project-issues-list", kwargs=PROJECT(context))
+        bulk_url = reverse("project-issues-bulk", kwargs=PROJECT(context))
+        items = [
+            {"title": f"Débit {n}", "description": "Issue de benchmark"}
+            for n in range(size)
+        ]
+
+        def post_each():
+            for item in items:
+                response = client.post(
+                    list_url, {**item, "project": project}, format="json"
+                )
+                self.check_status("POST project-issues-list", response)
+
+        def post_bulk():
+            response = client.post(bulk_url, items, format="json")
+            self.check_status("POST project-issues-bulk", response)
+
+        results = {}
+        for label, send in (("unitaire", post_each), ("groupé", post_bulk)):
+            # Échauffement (caches d'appartenance, lignes de statistiques)
+            client.post(bulk_url, items[:1], format="json")
+            start = time.perf_counter()
+            with CaptureQueriesContext(connection) as captured:
+                send()
+            elapsed = time.perf_counter() - start
+            results[label] = {"rate": size / elapsed, "queries": len(captured)}
+            self.stdout.write(
+                f"{label:<10} {size} issue(s) en {elapsed * 1000:9.1f} ms  "
+                f"{results[label]['rate']:9.0f} issues/s  "
+                f"{len(captured):>5} requête(s)"
+            )
+
+        speedup = results["groupé"]["rate"] / results["unitaire"]["rate"]
+        # Budget de la route (20 issues), plus une requête par tranche de 25 issues :
+        # les INSERT sont découpés en lots (BULK_BATCH_SIZE, limite de variables
+        # de SQLite).
+        budget = next(
+            route["budget"]
+            for route in ROUTES
+            if route["name"] == "project-issues-bulk"
+        ) + math.ceil(size / 25)
+        self.stdout.write(f"Gain de la route groupée : x{speedup:.1f}")
+        failures = []
+        if speedup < options["min_bulk_speedup"]:
+            failures.append(
+                f"Route groupée {speedup:.1f} fois plus rapide seulement "
+                f"(min {options['min_bulk_speedup']})."
+            )
+        if results["groupé"]["queries"] > budget:
+            failures.append(
+                f"POST project-issues-bulk ({size} issues) : "
+                f"{results['groupé']['queries']} requêtes SQL (budget {budget})."
+            )
+        return failures
+
+    def bench_load(self, client, context, options):
+        """
+        Envoie --requests lectures (LOAD_ROUTES) depuis --clients clients
+        simultanés, d'abord par le gestionnaire WSGI (un thread par client), puis
+        par le gestionnaire ASGI et les vues asynchrones (une coroutine par client,
+        asyncio.gather). Affiche le débit (requêtes/s) et la latence p99 de chaque
+        chemin ; échoue si le débit ASGI est inférieur à --min-async-ratio fois le
+        débit WSGI ou si une latence p99 dépasse --max-p99 ms. Les réponses ne sont
+        pas mises en cache, pour mesurer les vues et non le cache.
+        """
+        clients, count = options["clients"], options["requests"]
+        if clients < 1 or count < 1:
+            raise CommandError("--clients et --requests doivent être positifs.")
+        headers = {"Authorization": f"Bearer {context['access']}"}
+        urls = {
+            path: [
+                reverse(f"{prefix}{name}", kwargs=kwargs(context))
+                for name, kwargs in LOAD_ROUTES
+            ]
+            for path, prefix in (("WSGI", ""), ("ASGI", "async-"))
+        }
+
+        def wsgi_client(index):
+            load_client = Client(headers=headers)
+            timings = []
+            try:
+                for n in range(count):
+                    url = urls["WSGI"][(index + n) % len(urls["WSGI"])]
+                    start = time.perf_counter()
+                    response = load_client.get(url)
+                    timings.append((time.perf_counter() - start) * 1000)
+                    self.check_status(f"GET {url} (WSGI)", response)
+            finally:
+                connections.close_all()
+            return timings
+
+        async def asgi_client(index):
+            load_client = AsyncClient()
+            timings = []
+            for n in range(count):
+                url = urls["ASGI"][(index + n) % len(urls["ASGI"])]
+                start = time.perf_counter()
+                response = await load_client.get(url, headers=headers)
+                timings.append((time.perf_counter() - start) * 1000)
+                self.check_status(f"GET {url} (ASGI)", response)
+            return timings
+
+        async def asgi_load():
+            return await asyncio.gather(*(asgi_client(i) for i in range(clients)))
+
+        def wsgi_load():
+            with ThreadPoolExecutor(max_workers=clients) as pool:
+                return list(pool.map(wsgi_client, range(clients)))
+
+        results = {}
+        with override_settings(RESPONSE_CACHE_TIMEOUT=0):
+            for path, run in (
+                ("WSGI", wsgi_load),
+                ("ASGI", lambda: asyncio.run(asgi_load())),
+            ):
+                start = time.perf_counter()
+                timings = sorted(t for session in run() for t in session)
+                elapsed = time.perf_counter() - start
+                results[path] = {
+                    "rate": len(timings) / elapsed,
+                    "p50": self.percentile(timings, 50),
+                    "p99": self.percentile(timings, 99),
+                }
+                self.stdout.write(
+                    f"{path:<5} {clients} client(s) x {count} requête(s)  "
+                    f"{results[path]['rate']:9.0f} requêtes/s  "
+                    f"p50 {results[path]['p50']:>8.2f} ms  "
+                    f"p99 {results[path]['p99']:>8.2f} ms"
+                )
+
+        ratio = results["ASGI"]["rate"] / results["WSGI"]["rate"]
+        self.stdout.write(f"Débit ASGI / WSGI : {ratio:.2f}")
+        failures = []
+        if ratio < options["min_async_ratio"]:
+            failures.append(
+                f"Débit ASGI {ratio:.2f} fois celui de WSGI "
+                f"(min {options['min_async_ratio']})."
+            )
+        for path, result in results.items():
+            if result["p99"] > options["max_p99"]:
+                failures.append(
+                    f"{path} : p99 {result['p99']:.2f} ms sous charge "
+                    f"(max {options['max_p99']:.0f} ms)."
+                )
+        return failures
+
+    def check_status(self, key, response):
+        if response.status_code >= 400:
+            raise CommandError(
+                f"{key} : réponse {response.status_code} "
+                f"({getattr(response, 'data', '')})"
+            )
+
+    def build_context(self, options):
+        """
+        Choisit les objets mesurés : le projet le plus volumineux de l'utilisateur,
+        son issue la plus commentée, etc.
+        """
+        projects = Project.objects.annotate(size=Count("issues")).order_by("-size")
+        if options["username"]:
+            projects = projects.filter(contributors__username=options["username"])
+        project = projects.first()
+        if project is None:
+            raise CommandError("Aucun projet : lancez d'abord seed_softdesk.")
+        user = (
+            project.contributors.get(username=options["username"])
+            if options["username"]
+            else project.author
+        )
+        issue = (
+            Issue.objects.filter(project=project)
+            .annotate(size=Count("comments"))
+            .order_by("-size")
+            .first()
+        )
+        comment = Comment.objects.filter(issue=issue).first() if issue else None
+        if issue is None or comment is None:
+            raise CommandError("Le projet mesuré doit avoir des issues commentées.")
+        return {
+            "user": user,
+            "password": options["password"],
+            "access": str(RefreshToken.for_user(user).access_token),
+            "project": project,
+            "issue": issue,
+            "comment": comment,
+            "contributor": Contributor.objects.filter(project=project).first(),
+        }
+
+    def route_key(self, route):
+        key = f"{route.get('method', 'get').upper()} {route['name']}"
+        return f"{key} ({route['label']})" if "label" in route else key
+
+    def route_url(self, route, context):
+        kwargs = route["kwargs"](context) if "kwargs" in route else {}
+        url = reverse(route["name"], kwargs=kwargs)
+        return f"{url}?{route['query']}" if "query" in route else url
+
+    def measure(self, client, route, context, options, url=None):
+        iterations = (
+            options["hashing_iterations"]
+            if route.get("hashing")
+            else options["iterations"]
+        )
+        method = getattr(client, route.get("method", "get"))
+        timings, queries = [], 0
+        for index in range(options["warmup"] + iterations):
+            # Objets propres à l'itération (cible d'un DELETE...), créés hors mesure
+            iteration = (
+                {**context, **route["prepare"](context, index)}
+                if "prepare" in route
+                else context
+            )
+            data = route["data"](iteration, index) if "data" in route else None
+            route_url = url or self.route_url(route, iteration)
+            start = time.perf_counter()
+            with CaptureQueriesContext(connection) as captured:
+                if route.get("events"):
+                    response = async_to_sync(self.first_event)(route_url, iteration)
+                else:
+                    response = method(route_url, data, format="json" if data else None)
+                    if response.streaming:
+                        b"".join(response.streaming_content)
+            elapsed = (time.perf_counter() - start) * 1000
+            self.check_status(self.route_key(route), response)
+            if index >= options["warmup"]:
+                timings.append(elapsed)
+                queries = max(queries, len(captured))
+
+        timings.sort()
+        return {
+            "p50": self.percentile(timings, 50),
+            "p95": self.percentile(timings, 95),
+            "p99": self.percentile(timings, 99),
+            "queries": queries,
+        }
+
+    async def first_event(self, url, context):
+        """
+        Ouvre le flux d'événements par le gestionnaire ASGI et lit sa première
+        trame : le flux ne se termine pas. Exécutée par async_to_sync, pour que
+        l'ORM asynchrone utilise la connexion mesurée.
+        """
+        response = await AsyncClient().get(
+            url, headers={"Authorization": f"Bearer {context['access']}"}
+        )
+        if response.streaming:
+            await anext(response.streaming_content)
+            await response.streaming_content.aclose()
+        return response
+
+    def percentile(self, values, percent):
+        if not values:
+            return 0.0
+        index = max(0, math.ceil(percent / 100 * len(values)) - 1)
+        return round(values[index], 3)
+
+    def report(self, key, route, result):
+        self.stdout.write(
+            f"{key:<45} p50 {result['p50']:>8.2f} ms  p95 {result['p95']:>8.2f} ms  "
+            f"p99 {result['p99']:>8.2f} ms  {result['queries']:>3} requête(s) "
+            f"/ budget {route['budget']}"
+        )
+
+    def check_budgets(self, routes, results, options):
+        """
+        Compare les résultats aux budgets de requêtes et à la référence éventuelle.
+        """
+        failures = []
+        for route in routes:
+            key = self.route_key(route)
+            result = results[key]
+            if result["queries"] > route["budget"]:
+                failures.append(
+                    f"{key} : {result['queries']} requêtes SQL "
+                    f"(budget {route['budget']})."
+                )
+        if options["baseline"]:
+            with open(options["baseline"], encoding="utf-8") as stream:
+                baseline = json.load(stream)
+            for key, result in results.items():
+                reference = baseline.get(key)
+                if reference and result["p95"] > reference["p95"] * (
+                    1 + options["threshold"]
+                ):
+                    failures.append(
+                        f"{key} : p95 {result['p95']:.2f} ms, référence "
+                        f"{reference['p95']:.2f} ms (+{options['threshold']:.0%} max)."
+                    )
+        return failures
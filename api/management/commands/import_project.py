@@ -0,0 +1,206 @@
+import json
+import sys
+import uuid
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from api.models import Comment, Contributor, Issue, Project, User
+from api.signals import post_bulk_save
+
+
+class Command(BaseCommand):
+    """
+    Importe un projet exporté au format NDJSON par /api/projects/<id>/export/.
+
+    Le fichier est lu ligne par ligne et les objets sont insérés par lots avec
+    bulk_create, dans une seule transaction : la mémoire utilisée ne dépend que de
+    la taille des lots. Les utilisateurs référencés doivent déjà exister.
+    Les dates de création sont celles de l'import.
+    """
+
+    help = "Importe un projet depuis un export NDJSON (fichier ou '-' pour stdin)."
+
+    models = {"contributor": Contributor, "issue": Issue, "comment": Comment}
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Chemin du fichier NDJSON, ou '-' pour stdin")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=settings.EXPORT_CHUNK_SIZE,
+            help="Nombre d'objets insérés par lot",
+        )
+
+    def handle(self, *args, **options):
+        self.chunk_size = options["chunk_size"]
+        self.user_ids = {}
+        self.project = None
+        self.buffer_type = None
+        self.buffer = []
+        self.counts = {}
+
+        stream = (
+            sys.stdin
+            if options["path"] == "-"
+            else open(options["path"], encoding="utf-8")
+        )
+        try:
+            with transaction.atomic():
+                for line_number, line in enumerate(stream, start=1):
+                    if line.strip():
+                        self.add_record(line_number, line)
+                self.flush()
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        if self.project is None:
+            raise CommandError("Aucun projet trouvé dans le fichier.")
+        summary = ", ".join(f"{count} {kind}(s)" for kind, count in self.counts.items())
+        self.stdout.write(
+            self.style.SUCCESS(f"Projet '{self.project.title}' importé : {summary}.")
+        )
+
+    def add_record(self, line_number, line):
+        """
+        Ajoute un enregistrement au lot courant, en vidant le lot si nécessaire.
+        """
+        try:
+            record = json.loads(line)
+            kind = record["type"]
+        except (ValueError, KeyError, TypeError):
+            raise CommandError(f"Ligne {line_number} : enregistrement invalide.")
+
+        if kind == "project":
+            self.create_project(record)
+            return
+        if kind not in self.models:
+            raise CommandError(f"Ligne {line_number} : type inconnu '{kind}'.")
+        if self.project is None:
+            raise CommandError(
+                f"Ligne {line_number} : le projet doit précéder ses enfants."
+            )
+        # Les lots sont vidés à chaque changement de type pour respecter les clés
+        # étrangères
+        if kind != self.buffer_type or len(self.buffer) >= self.chunk_size:
+            self.flush()
+            self.buffer_type = kind
+        self.buffer.append(record)
+
+    def create_project(self, record):
+        if self.project is not None:
+            raise CommandError("Le fichier ne doit contenir qu'un seul projet.")
+        project_id = self.parse_id(record["id"])
+        if Project.objects.filter(pk=project_id).exists():
+            raise CommandError(f"Le projet {project_id} existe déjà.")
+        self.project = Project.objects.create(
+            id=project_id,
+            title=record["title"],
+            description=record["description"],
+            type=record["project_type"],
+            author_id=self.resolve_users([record["author"]])[record["author"]],
+        )
+
+    def flush(self):
+        """
+        Insère le lot courant en une requête, après résolution de ses usernames.
+        """
+        if not self.buffer:
+            return
+        kind, records = self.buffer_type, self.buffer
+        self.buffer = []
+        usernames = {
+            record.get(key)
+            for record in records
+            for key in ("user", "author", "assignee")
+            if record.get(key)
+        }
+        user_ids = self.resolve_users(usernames)
+
+        if kind == "contributor":
+            users = {user_ids[record["user"]] for record in records}
+            existing = set(
+                Contributor.objects.filter(
+                    project=self.project, user_id__in=users
+                ).values_list("user_id", flat=True)
+            )
+            added = users - existing
+            Contributor.objects.bulk_create(
+                [Contributor(project=self.project, user_id=user) for user in added],
+                ignore_conflicts=True,
+            )
+            # Avec ignore_conflicts, SQLite ne renvoie pas les identifiants créés :
+            # ils sont relus, comme dans ContributorViewSet.bulk_add.
+            instances = list(
+                Contributor.objects.filter(
+                    project=self.project, user_id__in=added
+                ).only("id", "user_id", "project_id")
+            )
+        elif kind == "issue":
+            instances = [
+                Issue(
+                    id=self.parse_id(record["id"]),
+                    project=self.project,
+                    title=record["title"],
+                    description=record["description"],
+                    status=record["status"],
+                    priority=record["priority"],
+                    tag=record["tag"],
+                    author_id=user_ids[record["author"]],
+                    assignee_id=user_ids.get(record.get("assignee")),
+                )
+                for record in records
+            ]
+            Issue.objects.bulk_create(instances)
+        else:
+            instances = [
+                Comment(
+                    id=self.parse_id(record["id"]),
+                    issue_id=self.parse_id(record["issue"]),
+                    content=record["content"],
+                    author_id=user_ids[record["author"]],
+                )
+                for record in records
+            ]
+            Comment.objects.bulk_create(instances)
+
+        post_bulk_save.send(
+            sender=self.models[kind],
+            instances=instances,
+            created=True,
+            update_fields=None,
+        )
+        self.counts[kind] = self.counts.get(kind, 0) + len(instances)
+
+    def parse_id(self, value):
+        """
+        Convertit un identifiant de l'export (chaîne) en UUID, le type des clés
+        attendu par les receivers de post_bulk_save.
+
+        :raises CommandError: Si l'identifiant n'est pas un UUID.
+        """
+        try:
+            return uuid.UUID(str(value))
+        except ValueError:
+            raise CommandError(f"Identifiant invalide : {value!r}.")
+
+    def resolve_users(self, usernames):
+        """
+        Résout des usernames en identifiants, en une requête pour les usernames
+        inconnus.
+
+        :raises CommandError: Si un utilisateur n'existe pas.
+        """
+        missing = set(usernames) - set(self.user_ids)
+        if missing:
+            self.user_ids.update(
+                User.objects.filter(username__in=missing).values_list("username", "id")
+            )
+            unknown = missing - set(self.user_ids)
+            if unknown:
+                raise CommandError(
+                    f"Utilisateur(s) inconnu(s) : {', '.join(sorted(unknown))}."
+                )
+        return self.user_ids
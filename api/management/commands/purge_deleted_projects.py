@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.deletion import run_pending_jobs
+from api.models import DeletionJob
+
+
+class Command(BaseCommand):
+    """
+    Exécute les suppressions de projets en attente dans ce processus.
+
+    Une tâche restée à l'état `running` a été interrompue (arrêt du serveur
+    pendant la purge) : elle est remise en attente et reprise là où elle s'était
+    arrêtée, les lots déjà supprimés n'étant plus en base. À ne pas lancer
+    pendant qu'un serveur exécute lui-même une suppression.
+    """
+
+    help = "Exécute ou reprend les suppressions de projets en attente."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--retry-failed",
+            action="store_true",
+            help="Relance aussi les suppressions en échec",
+        )
+
+    def handle(self, *args, **options):
+        statuses = [DeletionJob.RUNNING]
+        if options["retry_failed"]:
+            statuses.append(DeletionJob.FAILED)
+        resumed = DeletionJob.objects.filter(status__in=statuses).update(
+            status=DeletionJob.PENDING, error="", updated_time=timezone.now()
+        )
+        pending = DeletionJob.objects.filter(status=DeletionJob.PENDING).count()
+        run_pending_jobs()
+        failed = DeletionJob.objects.filter(status=DeletionJob.FAILED).count()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{pending} suppression(s) exécutée(s) dont {resumed} reprise(s) ; "
+                f"{failed} en échec."
+            )
+        )
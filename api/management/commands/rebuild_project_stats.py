@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from api import stats
+from api.models import Project
+
+
+class Command(BaseCommand):
+    """
+    Recalcule les tables de synthèse des statistiques (api.stats) à partir des
+    issues et des commentaires, pour les initialiser ou corriger une dérive.
+    """
+
+    help = "Recalcule les statistiques des projets."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--project",
+            type=int,
+            action="append",
+            help="Identifiant d'un projet à recalculer (tous par défaut).",
+        )
+
+    def handle(self, *args, **options):
+        project_ids = options["project"]
+        if project_ids:
+            missing = set(project_ids) - set(
+                Project.objects.filter(pk__in=project_ids).values_list("pk", flat=True)
+            )
+            if missing:
+                names = ", ".join(map(str, sorted(missing)))
+                raise CommandError(f"Projet(s) introuvable(s) : {names}.")
+        with transaction.atomic():
+            statistics, days = stats.rebuild(project_ids or None)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Statistiques recalculées : {statistics} combinaison(s) d'issues, "
+                f"{days} jour(s) d'activité."
+            )
+        )
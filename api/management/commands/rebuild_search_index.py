@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api import search
+from api.models import Comment, Issue
+
+
+class Command(BaseCommand):
+    """
+    Reconstruit entièrement l'index de recherche plein texte à partir des issues
+    et des commentaires existants, par lots.
+    """
+
+    help = "Reconstruit l'index de recherche plein texte (FTS5)."
+
+    def handle(self, *args, **options):
+        if not search.search_available():
+            raise CommandError("La recherche plein texte nécessite SQLite (FTS5).")
+        chunk_size = settings.EXPORT_CHUNK_SIZE
+        search.drop_search_index()
+        search.create_search_index()
+
+        batch, count = [], 0
+        issues = Issue.objects.only("id", "project_id", "title", "description")
+        for issue in issues.iterator(chunk_size=chunk_size):
+            batch.append(search.issue_document(issue))
+            if len(batch) >= chunk_size:
+                count += self.flush(batch)
+        comments = Comment.objects.select_related("issue").only(
+            "id", "issue_id", "content", "issue__project_id"
+        )
+        for comment in comments.iterator(chunk_size=chunk_size):
+            batch.append(search.comment_document(comment, comment.issue.project_id))
+            if len(batch) >= chunk_size:
+                count += self.flush(batch)
+        count += self.flush(batch)
+        self.stdout.write(self.style.SUCCESS(f"{count} document(s) indexé(s)."))
+
+    def flush(self, batch):
+        search.index_documents(batch)
+        count = len(batch)
+        batch.clear()
+        return count
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.cache import bump_project_versions
+from api.counters import recount
+from api.models import Project
+
+
+class Command(BaseCommand):
+    """
+    Recalcule les compteurs dénormalisés (issues par projet et par statut,
+    commentaires par issue) pour corriger une éventuelle dérive.
+    """
+
+    help = "Recalcule les compteurs d'issues et de commentaires."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            projects, issues = recount()
+            # Les listes en cache exposent les compteurs.
+            bump_project_versions(*Project.objects.values_list("pk", flat=True))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Compteurs recalculés : {projects} projet(s), {issues} issue(s)."
+            )
+        )
@@ -0,0 +1,171 @@
+import random
+from datetime import date
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from api.models import Comment, Contributor, Issue, Project, User
+from api.signals import post_bulk_save
+
+
+class Command(BaseCommand):
+    """
+    Génère un jeu de données volumineux et réaliste : utilisateurs, projets,
+    contributeurs, issues et commentaires.
+
+    La répartition des issues entre projets et des commentaires entre issues suit
+    une loi de Zipf (paramètre --skew) : quelques projets concentrent l'essentiel
+    de l'activité, comme en production. Les objets sont créés avec bulk_create et
+    un unique hash de mot de passe précalculé pour tous les utilisateurs.
+    """
+
+    help = "Génère des données de test volumineuses (utilisateurs, projets, issues...)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument("--projects", type=int, default=50)
+        parser.add_argument(
+            "--contributors",
+            type=int,
+            default=10,
+            help="Nombre moyen de contributeurs par projet",
+        )
+        parser.add_argument("--issues", type=int, default=5000)
+        parser.add_argument("--comments", type=int, default=20000)
+        parser.add_argument(
+            "--skew",
+            type=float,
+            default=1.0,
+            help="Exposant de Zipf de la répartition (0 = uniforme)",
+        )
+        parser.add_argument(
+            "--password",
+            default="softdesk-seed",
+            help="Mot de passe commun à tous les utilisateurs générés",
+        )
+        parser.add_argument("--prefix", default="seed", help="Préfixe des usernames")
+        parser.add_argument("--random-seed", type=int, default=None)
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options["random_seed"])
+        self.batch_size = settings.BULK_BATCH_SIZE * 10
+        prefix = options["prefix"]
+        if User.objects.filter(username__startswith=f"{prefix}_").exists():
+            raise CommandError(
+                f"Des utilisateurs '{prefix}_*' existent déjà, utilisez --prefix."
+            )
+        if options["users"] < 1 or options["projects"] < 1:
+            raise CommandError("Il faut au moins un utilisateur et un projet.")
+
+        with transaction.atomic():
+            users = self.create_users(options["users"], prefix, options["password"])
+            projects, members = self.create_projects(
+                users, options["projects"], options["contributors"], prefix
+            )
+            issues = self.create_issues(
+                projects, members, options["issues"], options["skew"]
+            )
+            comments = self.create_comments(
+                issues, members, options["comments"], options["skew"]
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(users)} utilisateur(s), {len(projects)} projet(s), "
+                f"{sum(len(m) for m in members.values())} contributeur(s), "
+                f"{len(issues)} issue(s), {comments} commentaire(s) créés."
+            )
+        )
+
+    def zipf_weights(self, count, skew):
+        return [1 / (rank**skew) for rank in range(1, count + 1)]
+
+    def bulk_create(self, model, instances):
+        """
+        Insère les objets par lots en notifiant post_bulk_save (compteurs, index...).
+        """
+        for start in range(0, len(instances), self.batch_size):
+            batch = instances[start : start + self.batch_size]
+            model.objects.bulk_create(batch)
+            post_bulk_save.send(
+                sender=model, instances=batch, created=True, update_fields=None
+            )
+        return instances
+
+    def create_users(self, count, prefix, password):
+        password_hash = make_password(password)
+        return self.bulk_create(
+            User,
+            [
+                User(
+                    username=f"{prefix}_user_{index}",
+                    email=f"{prefix}_user_{index}@example.com",
+                    password=password_hash,
+                    birth_date=date(1990, 1, 1),
+                    consent=True,
+                )
+                for index in range(count)
+            ],
+        )
+
+    def create_projects(self, users, count, contributors, prefix):
+        types = [choice for choice, _ in Project._meta.get_field("type").choices]
+        projects, members, links = [], {}, []
+        for index in range(count):
+            author = self.random.choice(users)
+            project = Project(
+                title=f"{prefix} project {index}",
+                description=f"Projet généré n°{index}.",
+                type=self.random.choice(types),
+                author=author,
+            )
+            size = min(
+                len(users), max(1, int(self.random.expovariate(1 / contributors)))
+            )
+            team = {author, *self.random.sample(users, size)}
+            members[project.pk] = list(team)
+            links += [Contributor(project=project, user=user) for user in team]
+            projects.append(project)
+        self.bulk_create(Project, projects)
+        self.bulk_create(Contributor, links)
+        return projects, members
+
+    def create_issues(self, projects, members, count, skew):
+        statuses = [choice for choice, _ in Issue._meta.get_field("status").choices]
+        priorities = [choice for choice, _ in Issue._meta.get_field("priority").choices]
+        tags = [choice for choice, _ in Issue._meta.get_field("tag").choices]
+        weights = self.zipf_weights(len(projects), skew)
+        issues = [
+            Issue(
+                project=project,
+                title=f"Issue {index}",
+                description=f"Description générée de l'issue {index}. " * 5,
+                status=self.random.choice(statuses),
+                priority=self.random.choice(priorities),
+                tag=self.random.choice(tags),
+                author=self.random.choice(members[project.pk]),
+                assignee=self.random.choice(members[project.pk] + [None]),
+            )
+            for index, project in enumerate(
+                self.random.choices(projects, weights=weights, k=count)
+            )
+        ]
+        return self.bulk_create(Issue, issues)
+
+    def create_comments(self, issues, members, count, skew):
+        if not issues:
+            return 0
+        weights = self.zipf_weights(len(issues), skew)
+        comments = [
+            Comment(
+                issue=issue,
+                content=f"Commentaire généré n°{index}.",
+                author=self.random.choice(members[issue.project_id]),
+            )
+            for index, issue in enumerate(
+                self.random.choices(issues, weights=weights, k=count)
+            )
+        ]
+        return len(self.bulk_create(Comment, comments))
@@ -0,0 +1,51 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from softdesk.routers import REPLICA_DB_ALIAS
+
+
+class Command(BaseCommand):
+    """
+    Copie la base principale SQLite dans le réplica avec l'API de sauvegarde en
+    ligne de SQLite, qui produit une copie cohérente sans bloquer les écritures.
+
+    Destinée au développement local : en production, le réplica est tenu à jour
+    par un outil de réplication externe.
+    """
+
+    help = "Copie la base principale SQLite dans le réplica en lecture seule."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=float,
+            help="Recopie en boucle toutes les N secondes",
+        )
+
+    def handle(self, *args, **options):
+        if REPLICA_DB_ALIAS not in settings.DATABASES:
+            raise CommandError("Aucune base 'replica' (DATABASE_REPLICA_PATH).")
+        if connections[DEFAULT_DB_ALIAS].vendor != "sqlite":
+            raise CommandError("La copie du réplica nécessite SQLite.")
+        while True:
+            start = time.perf_counter()
+            self.copy()
+            self.stdout.write(
+                f"Réplica synchronisé en {(time.perf_counter() - start) * 1000:.0f} ms."
+            )
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
+
+    def copy(self):
+        source = connections[DEFAULT_DB_ALIAS]
+        source.ensure_connection()
+        target = sqlite3.connect(settings.DATABASES[REPLICA_DB_ALIAS]["NAME"])
+        try:
+            source.connection.backup(target)
+        finally:
+            target.close()
@@ -0,0 +1,78 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:18
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+# Compteur de Project associé à chaque statut d'issue (api.counters.STATUS_COUNTERS)
+STATUS_COUNTERS = {
+    "To Do": "todo_issue_count",
+    "In Progress": "in_progress_issue_count",
+    "Done": "done_issue_count",
+}
+
+
+def count(queryset, field):
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{field: OuterRef("pk")})
+            .order_by()
+            .values(field)
+            .annotate(total=Count("pk"))
+            .values("total"),
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def backfill_counters(apps, schema_editor):
+    """
+    Initialise les compteurs des données existantes, comme recount_counters :
+    partis de 0, ils seraient rendus négatifs (CHECK >= 0) par la première
+    suppression ou le premier changement de statut d'une issue existante.
+    """
+    Project = apps.get_model("api", "Project")
+    Issue = apps.get_model("api", "Issue")
+    Comment = apps.get_model("api", "Comment")
+    counters = {"issue_count": count(Issue.objects.all(), "project")}
+    for status, field in STATUS_COUNTERS.items():
+        counters[field] = count(Issue.objects.filter(status=status), "project")
+    Project.objects.update(**counters)
+    Issue.objects.update(comment_count=count(Comment.objects.all(), "issue"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0004_conditional_get"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="issue",
+            name="comment_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="done_issue_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="in_progress_issue_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="issue_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="todo_issue_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,135 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:18
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+# Champs d'une ligne d'IssueStatistic (api.models.ISSUE_STAT_FIELDS)
+ISSUE_STAT_FIELDS = ("project_id", "status", "priority", "tag", "assignee_id")
+
+
+def backfill_statistics(apps, schema_editor):
+    """
+    Initialise les tables de synthèse à partir des données existantes, comme
+    rebuild_project_stats : vides, elles seraient rendues négatives (CHECK >= 0)
+    par la première modification ou suppression d'une issue existante.
+    """
+    Issue = apps.get_model("api", "Issue")
+    Comment = apps.get_model("api", "Comment")
+    IssueStatistic = apps.get_model("api", "IssueStatistic")
+    CommentActivity = apps.get_model("api", "CommentActivity")
+    groups = (
+        Issue.objects.order_by()
+        .values(*ISSUE_STAT_FIELDS)
+        .annotate(issue_count=Count("pk"))
+    )
+    IssueStatistic.objects.bulk_create(
+        (IssueStatistic(**row) for row in groups.iterator()),
+        batch_size=settings.BULK_BATCH_SIZE,
+    )
+    days = (
+        Comment.objects.order_by()
+        .annotate(day=TruncDate("created_time"))
+        .values("issue__project_id", "day")
+        .annotate(comment_count=Count("pk"))
+    )
+    CommentActivity.objects.bulk_create(
+        (
+            CommentActivity(
+                project_id=row["issue__project_id"],
+                day=row["day"],
+                comment_count=row["comment_count"],
+            )
+            for row in days.iterator()
+        ),
+        batch_size=settings.BULK_BATCH_SIZE,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0007_deletion"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CommentActivity",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("comment_count", models.PositiveIntegerField(default=0)),
+                (
+                    "project",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="comment_activity",
+                        to="api.project",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("project", "day"), name="comment_activity_key"
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="IssueStatistic",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("status", models.CharField(max_length=20)),
+                ("priority", models.CharField(max_length=10)),
+                ("tag", models.CharField(max_length=10)),
+                ("issue_count", models.PositiveIntegerField(default=0)),
+                (
+                    "assignee",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "project",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="issue_statistics",
+                        to="api.project",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("project", "status", "priority", "tag", "assignee"),
+                        name="issue_statistic_key",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_statistics, migrations.RunPython.noop),
+    ]
@@ -1,26 +1,51 @@
 from rest_framework.exceptions import PermissionDenied
-from .models import Contributor, Project, Issue
+from softdesk.metrics import timer
+from .cache import is_contributor
+from .models import Project, Issue
 from django.shortcuts import get_object_or_404
 
 
 class ContributorPermissionMixin:
+    def is_project_contributor(self, project):
+        """
+        Indique si l'utilisateur authentifié est contributeur du projet (via le
+        cache d'appartenance).
+        """
+        with timer("perm"):
+            return is_contributor(self.request, project.pk)
+
     def check_project_permission(self, project):
         """
-        Vérifie que l'utilisateur authentifié est contributeur du projet passé en paramètre.
+        Vérifie que l'utilisateur authentifié est contributeur du projet passé en
+        paramètre.
         """
-        if not Contributor.objects.filter(
-            user=self.request.user, project=project
-        ).exists():
+        if not self.is_project_contributor(project):
             raise PermissionDenied("Vous n'êtes pas contributeur de ce projet")
 
 
 class ProjectContextMixin:
     def get_project(self):
-        project_pk = self.kwargs.get("project_pk")
-        return get_object_or_404(Project, pk=project_pk)
+        """
+        Retourne le projet de l'URL, chargé une seule fois par requête.
+        """
+        if not hasattr(self, "_project"):
+            project_pk = self.kwargs.get("project_pk")
+            self._project = get_object_or_404(
+                Project, pk=project_pk, pending_delete=False
+            )
+        return self._project
 
 
 class IssueContextMixin:
     def get_issue(self):
-        issue_pk = self.kwargs.get("issue_pk")
-        return get_object_or_404(Issue, pk=issue_pk)
+        """
+        Retourne l'issue de l'URL, chargée une seule fois par requête.
+        """
+        if not hasattr(self, "_issue"):
+            issue_pk = self.kwargs.get("issue_pk")
+            self._issue = get_object_or_404(
+                Issue.objects.select_related("project"),
+                pk=issue_pk,
+                project__pending_delete=False,
+            )
+        return self._issue
@@ -12,6 +12,7 @@ class Project(models.Model):
 
     id = models.UUIDField(default=uuid.uuid4, primary_key=True, editable=False)
     created_time = models.DateTimeField(auto_now_add=True)
+    updated_time = models.DateTimeField(auto_now=True)
     title = models.CharField(max_length=255)
     description = models.TextField()
     type = models.CharField(
@@ -28,6 +29,14 @@ class Project(models.Model):
         User, through="Contributor", related_name="contributed_projects", blank=True
     )
 
+    # Compteurs dénormalisés, maintenus par api.counters
+    issue_count = models.PositiveIntegerField(default=0, editable=False)
+    todo_issue_count = models.PositiveIntegerField(default=0, editable=False)
+    in_progress_issue_count = models.PositiveIntegerField(default=0, editable=False)
+    done_issue_count = models.PositiveIntegerField(default=0, editable=False)
+    # Projet en cours de suppression (api.deletion) : masqué de toutes les vues
+    pending_delete = models.BooleanField(default=False, editable=False)
+
     def __str__(self):
         """
         Représentation en chaîne d'un projet.
@@ -35,6 +44,10 @@ class Project(models.Model):
         return self.title
 
 
+# Champs d'une issue qui déterminent sa ligne dans IssueStatistic
+ISSUE_STAT_FIELDS = ("project_id", "status", "priority", "tag", "assignee_id")
+
+
 class Issue(models.Model):
     """
     Modèle pour gérer les tickets d'incidents liés à un projet.
@@ -43,6 +56,7 @@ class Issue(models.Model):
 
     id = models.UUIDField(default=uuid.uuid4, primary_key=True, editable=False)
     created_time = models.DateTimeField(auto_now_add=True)
+    updated_time = models.DateTimeField(auto_now=True)
     title = models.CharField(max_length=255)
     description = models.TextField()
     status = models.CharField(
@@ -67,6 +81,57 @@ class Issue(models.Model):
     assignee = models.ForeignKey(
         User, on_delete=models.SET_NULL, null=True, related_name="assigned_issues"
     )
+    # Compteur dénormalisé, maintenu par api.counters
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["project", "created_time", "id"],
+                name="issue_project_created_idx",
+            ),
+            models.Index(
+                fields=["project", "status", "created_time", "id"],
+                name="issue_project_status_idx",
+            ),
+            models.Index(
+                fields=["project", "priority", "created_time", "id"],
+                name="issue_project_priority_idx",
+            ),
+            models.Index(
+                fields=["project", "tag", "created_time", "id"],
+                name="issue_project_tag_idx",
+            ),
+            models.Index(
+                fields=["project", "assignee", "created_time", "id"],
+                name="issue_project_assignee_idx",
+            ),
+            models.Index(
+                fields=["project", "updated_time"], name="issue_project_updated_idx"
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Mémorise le statut chargé depuis la base, afin de détecter ses changements
+        lors de la sauvegarde (mise à jour des compteurs par statut), ainsi que la
+        clé de l'issue dans les statistiques du projet (api.stats).
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = instance.__dict__.get("status")
+        instance._loaded_stat_key = instance.stat_key()
+        return instance
+
+    def stat_key(self):
+        """
+        Retourne la ligne d'IssueStatistic comptant l'issue : (project_id, status,
+        priority, tag, assignee_id), ou None si l'un de ces champs n'est pas chargé.
+        """
+        values = self.__dict__
+        if any(field not in values for field in ISSUE_STAT_FIELDS):
+            return None
+        return tuple(values[field] for field in ISSUE_STAT_FIELDS)
 
     def __str__(self):
         return f"{self.title} - {self.status}"
@@ -80,10 +145,18 @@ class Comment(models.Model):
 
     id = models.UUIDField(default=uuid.uuid4, primary_key=True, editable=False)
     created_time = models.DateTimeField(auto_now_add=True)
+    updated_time = models.DateTimeField(auto_now=True)
     content = models.TextField()
     issue = models.ForeignKey(Issue, on_delete=models.CASCADE, related_name="comments")
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name="comments")
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["issue", "updated_time"], name="comment_issue_updated_idx"
+            ),
+        ]
+
     def __str__(self):
         return f"Comment by {self.author.username} on {self.issue.title}"
 
@@ -110,3 +183,140 @@ class Contributor(models.Model):
         Représentation en chaîne d'une contribution utilisateur à un projet.
         """
         return f"{self.user.username} - {self.project.title}"
+
+
+class ChangeLogEntry(models.Model):
+    """
+    Entrée du journal des modifications d'un projet (création, modification ou
+    suppression d'une issue, d'un commentaire ou d'un contributeur).
+    Écrite par api.signals et lue par le flux de synchronisation (api.changelog) ;
+    l'identifiant auto-incrémenté sert de curseur.
+    """
+
+    CREATED, UPDATED, DELETED = "created", "updated", "deleted"
+
+    # Sans contrainte de clé étrangère : les entrées des objets supprimés en
+    # cascade avec un projet sont écrites avant la suppression du projet, puis
+    # purgées avec lui.
+    project = models.ForeignKey(
+        Project, on_delete=models.DO_NOTHING, db_constraint=False, related_name="+"
+    )
+    model = models.CharField(
+        max_length=20,
+        choices=[
+            ("issue", "issue"),
+            ("comment", "comment"),
+            ("contributor", "contributor"),
+        ],
+    )
+    object_id = models.CharField(max_length=36)
+    action = models.CharField(
+        max_length=10,
+        choices=[(CREATED, CREATED), (UPDATED, UPDATED), (DELETED, DELETED)],
+    )
+    created_time = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["project", "id"], name="changelog_project_id_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.model} {self.object_id} {self.action}"
+
+
+class DeletionJob(models.Model):
+    """
+    Suppression en arrière-plan d'un projet (voir api.deletion), avec sa progression.
+    Le projet étant supprimé à la fin de la tâche, seul son identifiant est conservé.
+    """
+
+    PENDING, RUNNING, DONE, FAILED = "pending", "running", "done", "failed"
+
+    project_id = models.UUIDField(db_index=True)
+    project_title = models.CharField(max_length=255)
+    requested_by = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="deletion_jobs"
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=[
+            (PENDING, PENDING),
+            (RUNNING, RUNNING),
+            (DONE, DONE),
+            (FAILED, FAILED),
+        ],
+        default=PENDING,
+    )
+    issues_total = models.PositiveIntegerField(default=0)
+    issues_deleted = models.PositiveIntegerField(default=0)
+    comments_total = models.PositiveIntegerField(default=0)
+    comments_deleted = models.PositiveIntegerField(default=0)
+    contributors_total = models.PositiveIntegerField(default=0)
+    contributors_deleted = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_time = models.DateTimeField(auto_now_add=True)
+    updated_time = models.DateTimeField(auto_now=True)
+    finished_time = models.DateTimeField(null=True)
+
+    def __str__(self):
+        return f"{self.project_title} - {self.status}"
+
+
+class IssueStatistic(models.Model):
+    """
+    Nombre d'issues d'un projet par combinaison (statut, priorité, tag, assigné).
+    Table de synthèse maintenue par api.stats dans la transaction de chaque
+    écriture d'issue ; sa taille dépend du nombre de combinaisons, pas du
+    nombre d'issues.
+    """
+
+    project = models.ForeignKey(
+        Project, on_delete=models.CASCADE, related_name="issue_statistics"
+    )
+    status = models.CharField(max_length=20)
+    priority = models.CharField(max_length=10)
+    tag = models.CharField(max_length=10)
+    # Sans contrainte de clé étrangère : les lignes d'un utilisateur supprimé sont
+    # reportées sur les issues sans assigné (api.stats.assignee_deleted).
+    assignee = models.ForeignKey(
+        User,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        related_name="+",
+    )
+    issue_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["project", "status", "priority", "tag", "assignee"],
+                name="issue_statistic_key",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.project_id} {self.status}/{self.priority}/{self.tag}"
+
+
+class CommentActivity(models.Model):
+    """
+    Nombre de commentaires d'un projet par jour de création, maintenu par api.stats.
+    """
+
+    project = models.ForeignKey(
+        Project, on_delete=models.CASCADE, related_name="comment_activity"
+    )
+    day = models.DateField()
+    comment_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["project", "day"], name="comment_activity_key"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.project_id} {self.day}"
@@ -0,0 +1,176 @@
+import base64
+import binascii
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Pagination par curseur (keyset) sur le couple (created_time, id).
+
+    Contrairement à la pagination par numéro de page, aucune requête COUNT(*) ni
+    OFFSET n'est exécutée : chaque page est obtenue par une recherche indexée à
+    partir de la dernière ligne de la page précédente. Le temps de réponse est donc
+    constant quelle que soit la profondeur de la page, et les pages restent stables
+    lorsque de nouvelles lignes sont insérées.
+    """
+
+    cursor_query_param = "cursor"
+    page_size = PageNumberPagination.page_size
+    invalid_cursor_message = "Curseur invalide."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        if request.query_params.get("ordering", "created_time") != "created_time":
+            raise ValidationError(
+                "La pagination par curseur n'est possible qu'avec le tri par défaut."
+            )
+        cursor = self.decode_cursor(request, queryset.model)
+
+        reverse = cursor is not None and cursor[0]
+        if reverse:
+            queryset = queryset.order_by("-created_time", "-id")
+        else:
+            queryset = queryset.order_by("created_time", "id")
+
+        if cursor is not None:
+            _, created_time, pk = cursor
+            # La borne redondante sur created_time seule permet à SQLite de
+            # chercher la position dans l'index (projet, created_time, id) ; la
+            # disjonction seule ne l'utilise que sur le projet et parcourt toutes
+            # les lignes précédentes.
+            if reverse:
+                queryset = queryset.filter(
+                    Q(created_time__lt=created_time)
+                    | Q(created_time=created_time, id__lt=pk),
+                    created_time__lte=created_time,
+                )
+            else:
+                queryset = queryset.filter(
+                    Q(created_time__gt=created_time)
+                    | Q(created_time=created_time, id__gt=pk),
+                    created_time__gte=created_time,
+                )
+
+        # On charge un élément de plus pour savoir s'il reste des résultats.
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+
+        if reverse:
+            results.reverse()
+            self.has_previous = has_more
+            self.has_next = True
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.build_link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.build_link(self.page[0], reverse=True)
+
+    def build_link(self, obj, reverse):
+        url = remove_query_param(self.base_url, "page")
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(obj, reverse)
+        )
+
+    def encode_cursor(self, obj, reverse):
+        """
+        Encode la position (sens, created_time, id) d'un objet en une chaîne opaque.
+        """
+        position = f"{int(reverse)}|{obj.created_time.isoformat()}|{obj.pk}"
+        return base64.urlsafe_b64encode(position.encode()).decode()
+
+    def decode_cursor(self, request, model):
+        """
+        Décode le curseur passé en paramètre de requête. L'identifiant est converti
+        par la clé primaire du modèle paginé (UUID des issues et commentaires,
+        entier des contributeurs).
+
+        :return: Un tuple (reverse, created_time, id), ou None si aucun curseur
+            n'est fourni.
+        :raises NotFound: Si le curseur est mal formé.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = base64.urlsafe_b64decode(encoded.encode()).decode()
+            reverse, created_time, pk = position.split("|")
+            created_time = parse_datetime(created_time)
+            if created_time is None or reverse not in ("0", "1"):
+                raise ValueError
+            return reverse == "1", created_time, model._meta.pk.to_python(pk)
+        except (
+            binascii.Error,
+            UnicodeDecodeError,
+            TypeError,
+            ValueError,
+            DjangoValidationError,
+        ):
+            raise NotFound(self.invalid_cursor_message)
+
+
+class OptInCursorPagination(PageNumberPagination):
+    """
+    Pagination par numéro de page, avec un mode curseur optionnel.
+
+    Le mode curseur (KeysetPagination) est activé lorsque la requête contient le
+    paramètre `cursor` ou `pagination=cursor`. Sans ces paramètres, le comportement
+    reste celui de la pagination par numéro de page configurée dans les settings.
+    """
+
+    mode_query_param = "pagination"
+    keyset_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if (
+            self.keyset_class.cursor_query_param in request.query_params
+            or request.query_params.get(self.mode_query_param) == "cursor"
+        ):
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -0,0 +1,210 @@
+import hashlib
+import html
+import uuid
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections, router
+
+from .models import Contributor, Project
+
+SEARCH_TABLE = "api_search_index"
+
+# Marqueurs de surlignage insérés par SQLite puis remplacés après échappement HTML
+HIGHLIGHT_START, HIGHLIGHT_END = "\x02", "\x03"
+
+
+def search_available():
+    """
+    La recherche plein texte s'appuie sur les tables virtuelles FTS5 de SQLite.
+    """
+    return connection.vendor == "sqlite"
+
+
+def create_search_index(using=DEFAULT_DB_ALIAS, **kwargs):
+    """
+    Crée la table virtuelle FTS5 de l'index de recherche si elle n'existe pas.
+
+    Appelée après chaque migration (signal post_migrate).
+    """
+    if connections[using].vendor != "sqlite":
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+            "kind UNINDEXED, object_id UNINDEXED, project_id UNINDEXED, "
+            "issue_id UNINDEXED, title, body, "
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        )
+
+
+def drop_search_index():
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+
+def document_id(value):
+    """
+    Forme canonique (hexadécimale) d'un identifiant, reçu en UUID ou en chaîne.
+    """
+    return uuid.UUID(str(value)).hex
+
+
+def search_rowid(kind, object_id):
+    """
+    Rowid déterministe d'un document, dérivé de son type et de son identifiant.
+
+    Il permet de mettre à jour ou de supprimer un document par une recherche sur
+    la clé primaire de la table FTS5, sans parcourir l'index.
+    """
+    key = f"{kind}:{uuid.UUID(str(object_id))}"
+    digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") & 0x7FFFFFFFFFFFFFFF
+
+
+def issue_document(issue):
+    return (
+        search_rowid("issue", issue.pk),
+        "issue",
+        document_id(issue.pk),
+        document_id(issue.project_id),
+        document_id(issue.pk),
+        issue.title,
+        issue.description,
+    )
+
+
+def comment_document(comment, project_id):
+    return (
+        search_rowid("comment", comment.pk),
+        "comment",
+        document_id(comment.pk),
+        document_id(project_id),
+        document_id(comment.issue_id),
+        "",
+        comment.content,
+    )
+
+
+def index_documents(documents):
+    """
+    Ajoute ou remplace des documents dans l'index de recherche.
+
+    :param documents: Tuples produits par issue_document / comment_document.
+    """
+    documents = list(documents)
+    if not documents or not search_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s",
+            [(document[0],) for document in documents],
+        )
+        cursor.executemany(
+            f"INSERT INTO {SEARCH_TABLE} "
+            "(rowid, kind, object_id, project_id, issue_id, title, body) "
+            "VALUES (%s, %s, %s, %s, %s, %s, %s)",
+            documents,
+        )
+
+
+def unindex_document(kind, object_id):
+    """
+    Retire un document de l'index de recherche.
+    """
+    if not search_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s",
+            [search_rowid(kind, object_id)],
+        )
+
+
+def unindex_documents(kind, object_ids):
+    """
+    Retire de l'index de recherche les documents d'un même type.
+    """
+    if not search_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s",
+            [(search_rowid(kind, object_id),) for object_id in object_ids],
+        )
+
+
+def build_match_query(terms):
+    """
+    Transforme la saisie de l'utilisateur en requête FTS5 : chaque mot est cité,
+    ce qui neutralise la syntaxe FTS5, et tous les mots doivent être présents.
+    """
+    words = [word.replace('"', '""') for word in terms.split()]
+    return " ".join(f'"{word}"' for word in words)
+
+
+def format_highlight(text):
+    """
+    Échappe le texte renvoyé par SQLite puis remplace les marqueurs par des
+    balises <mark>.
+    """
+    return (
+        html.escape(text)
+        .replace(HIGHLIGHT_START, "<mark>")
+        .replace(HIGHLIGHT_END, "</mark>")
+    )
+
+
+def search(user, terms, limit, offset=0, project_id=None):
+    """
+    Recherche les issues et commentaires des projets auxquels l'utilisateur contribue.
+
+    Les résultats sont classés par pertinence (BM25, le titre pesant plus que le
+    corps) et accompagnés d'un extrait surligné.
+
+    :return: Liste de dictionnaires (au plus `limit`).
+    """
+    contributor_table = Contributor._meta.db_table
+    project_table = Project._meta.db_table
+    params = [
+        HIGHLIGHT_START,
+        HIGHLIGHT_END,
+        HIGHLIGHT_START,
+        HIGHLIGHT_END,
+        build_match_query(terms),
+        user.pk,
+    ]
+    project_filter = ""
+    if project_id is not None:
+        project_filter = "AND project_id = %s"
+        params.append(document_id(project_id))
+    params += [limit, offset]
+
+    with connections[router.db_for_read(Contributor)].cursor() as cursor:
+        cursor.execute(
+            f"SELECT kind, object_id, project_id, issue_id, "
+            f"highlight({SEARCH_TABLE}, 4, %s, %s), "
+            f"snippet({SEARCH_TABLE}, 5, %s, %s, '…', 16), "
+            f"bm25({SEARCH_TABLE}, 0, 0, 0, 0, 5.0, 1.0) AS rank "
+            f"FROM {SEARCH_TABLE} "
+            f"WHERE {SEARCH_TABLE} MATCH %s "
+            f"AND project_id IN "
+            f"(SELECT c.project_id FROM {contributor_table} c "
+            f"JOIN {project_table} p ON p.id = c.project_id "
+            f"WHERE c.user_id = %s AND NOT p.pending_delete) "
+            f"{project_filter} "
+            f"ORDER BY rank LIMIT %s OFFSET %s",
+            params,
+        )
+        rows = cursor.fetchall()
+
+    return [
+        {
+            "type": kind,
+            "id": str(uuid.UUID(object_id)),
+            "project": str(uuid.UUID(project)),
+            "issue": str(uuid.UUID(issue)),
+            "title": format_highlight(title) if kind == "issue" else None,
+            "snippet": format_highlight(snippet),
+            "rank": rank,
+        }
+        for kind, object_id, project, issue, title, snippet, rank in rows
+    ]
@@ -1,8 +1,13 @@
+from django.conf import settings
+from django.db.models import Count, IntegerField, OuterRef, Prefetch, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.urls import reverse
 from rest_framework import serializers
-from .models import Project, Issue, Comment, Contributor, User
+from softdesk.serializers import DynamicFieldsMixin
+from .models import Project, Issue, Comment, Contributor, DeletionJob, User
 
 
-class ProjectListSerializer(serializers.ModelSerializer):
+class ProjectListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Serializer pour l'affichage simplifié des projets.
 
@@ -13,10 +18,19 @@ class ProjectListSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Project
-        fields = ("id", "title", "type", "author")
-
-
-class ProjectSerializer(serializers.ModelSerializer):
+        fields = (
+            "id",
+            "title",
+            "type",
+            "author",
+            "issue_count",
+            "todo_issue_count",
+            "in_progress_issue_count",
+            "done_issue_count",
+        )
+
+
+class ProjectSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Serializer complet pour les projets.
 
@@ -27,26 +41,78 @@ class ProjectSerializer(serializers.ModelSerializer):
 
     author = serializers.ReadOnlyField(source="author.username")
     contributors = serializers.SerializerMethodField()
+    contributor_count = serializers.SerializerMethodField()
+    contributors_url = serializers.SerializerMethodField()
 
     class Meta:
         model = Project
-        fields = "__all__"
+        # Un projet en cours de suppression n'est plus exposé : le champ est interne.
+        exclude = ("pending_delete",)
         read_only_fields = ("author", "created_time")
 
     def get_contributors(self, obj):
         """
-        Retourne une liste contenant l'id et le nom d'utilisateur des contributeurs du projet.
+        Retourne une liste contenant l'id et le nom d'utilisateur des premiers
+        contributeurs du projet (au plus PROJECT_CONTRIBUTORS_PREVIEW, par ordre
+        alphabétique). La liste complète est paginée à l'adresse 'contributors_url'.
 
         :param obj: Instance de Project
         :return: Liste de dictionnaires avec les clés 'id' et 'username'
         """
-        return [
-            {"id": user.id, "username": user.username}
-            for user in obj.contributors.all()
-        ]
+        users = getattr(obj, "contributor_preview", None)
+        if users is None:
+            users = obj.contributors.only("id", "username").order_by("username")
+            users = users[: settings.PROJECT_CONTRIBUTORS_PREVIEW]
+        return [{"id": user.id, "username": user.username} for user in users]
+
+    def get_contributor_count(self, obj):
+        """
+        Retourne le nombre total de contributeurs du projet.
+        """
+        count = getattr(obj, "contributor_count", None)
+        return obj.contributor_set.count() if count is None else count
 
+    def get_contributors_url(self, obj):
+        """
+        Retourne l'adresse de la liste paginée des contributeurs du projet.
+        """
+        url = reverse("project-contributors-list", kwargs={"project_pk": obj.pk})
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request else url
 
-class IssueSerializer(serializers.ModelSerializer):
+
+def with_contributor_preview(queryset):
+    """
+    Prépare un queryset de projets pour ProjectSerializer : aperçu plafonné des
+    contributeurs, dont seules les colonnes id et username sont lues (un seul
+    prefetch pour tous les projets), et nombre total de contributeurs calculé par
+    sous-requête.
+
+    :param queryset: Queryset de Project.
+    :return: Le queryset annoté.
+    """
+    count = (
+        Contributor.objects.filter(project=OuterRef("pk"))
+        .order_by()
+        .values("project")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    preview = User.objects.only("id", "username").order_by("username")
+    return queryset.prefetch_related(
+        Prefetch(
+            "contributors",
+            queryset=preview[: settings.PROJECT_CONTRIBUTORS_PREVIEW],
+            to_attr="contributor_preview",
+        )
+    ).annotate(
+        contributor_count=Coalesce(
+            Subquery(count, output_field=IntegerField()), Value(0)
+        )
+    )
+
+
+class IssueSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Serializer pour les tickets (issues) d'un projet.
 
@@ -86,7 +152,24 @@ class IssueSerializer(serializers.ModelSerializer):
         return data
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class IssueBulkItemSerializer(serializers.ModelSerializer):
+    """
+    Serializer d'un élément d'une requête de création / mise à jour groupée de tickets.
+
+    Aucune requête n'est exécutée lors de la validation : l'assigné est reçu sous forme
+    de username et résolu pour l'ensemble du lot en une seule requête par la vue.
+    Le champ 'id' n'est utilisé que pour les mises à jour.
+    """
+
+    id = serializers.UUIDField(required=False)
+    assignee = serializers.CharField(allow_null=True, required=False)
+
+    class Meta:
+        model = Issue
+        fields = ("id", "title", "description", "status", "priority", "tag", "assignee")
+
+
+class CommentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Serializer pour les commentaires associés aux tickets (issues).
 
@@ -102,7 +185,7 @@ class CommentSerializer(serializers.ModelSerializer):
         read_only_fields = ("author", "created_time")
 
 
-class ContributorSerializer(serializers.ModelSerializer):
+class ContributorSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Serializer pour la gestion des contributeurs.
 
@@ -120,3 +203,34 @@ class ContributorSerializer(serializers.ModelSerializer):
         model = Contributor
         fields = "__all__"
         read_only_fields = ("created_time",)
+
+
+class ContributorBulkSerializer(serializers.Serializer):
+    """
+    Serializer d'une requête d'ajout / de retrait groupé de contributeurs.
+    """
+
+    usernames = serializers.ListField(
+        child=serializers.CharField(),
+        allow_empty=False,
+        max_length=settings.BULK_MAX_ITEMS,
+    )
+
+
+class DeletionJobSerializer(serializers.ModelSerializer):
+    """
+    Serializer d'une tâche de suppression de projet, avec sa progression (en %).
+    """
+
+    progress = serializers.SerializerMethodField()
+
+    class Meta:
+        model = DeletionJob
+        exclude = ("requested_by",)
+
+    def get_progress(self, obj):
+        if obj.status == DeletionJob.DONE:
+            return 100
+        total = obj.issues_total + obj.comments_total + obj.contributors_total
+        deleted = obj.issues_deleted + obj.comments_deleted + obj.contributors_deleted
+        return min(99, deleted * 100 // total) if total else 0
@@ -0,0 +1,218 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+from users.models import User, users_anonymized
+
+from .cache import bump_project_versions, invalidate_membership
+from . import changelog, counters, events, search, stats
+from .models import ChangeLogEntry, Comment, Contributor, Issue, Project
+
+# Envoyé après une écriture groupée (bulk_create / bulk_update), qui ne déclenche
+# pas post_save. Arguments : sender (modèle), instances, created, update_fields.
+post_bulk_save = Signal()
+# Envoyé après une suppression groupée sans collecteur (QuerySet._raw_delete),
+# qui ne déclenche pas post_delete. Arguments : sender (modèle), instances.
+post_bulk_delete = Signal()
+
+# Champs d'une issue comptés par api.stats
+STAT_FIELDS = {"status", "priority", "tag", "assignee"}
+
+
+@receiver(post_save, sender=Contributor)
+@receiver(post_delete, sender=Contributor)
+def contributor_changed(sender, instance, **kwargs):
+    """
+    Invalide le cache d'appartenance lorsqu'un contributeur est ajouté ou retiré,
+    et marque le projet comme modifié.
+    """
+    invalidate_membership((instance.user_id, instance.project_id))
+    # La liste des contributeurs fait partie de la représentation du projet
+    Project.objects.filter(pk=instance.project_id).update(updated_time=timezone.now())
+    bump_project_versions(instance.project_id)
+
+
+@receiver(post_delete, sender=Contributor)
+def contributor_removed(sender, instance, **kwargs):
+    events.contributors_removed([instance])
+
+
+@receiver(post_bulk_delete, sender=Contributor)
+def contributors_bulk_removed(sender, instances, **kwargs):
+    events.contributors_removed(instances)
+
+
+@receiver(post_bulk_save, sender=Contributor)
+@receiver(post_bulk_delete, sender=Contributor)
+def contributors_bulk_changed(sender, instances, **kwargs):
+    """
+    Invalide le cache d'appartenance des contributeurs ajoutés ou retirés en masse.
+    """
+    invalidate_membership(
+        *((instance.user_id, instance.project_id) for instance in instances)
+    )
+    project_ids = {instance.project_id for instance in instances}
+    Project.objects.filter(pk__in=project_ids).update(updated_time=timezone.now())
+    bump_project_versions(*project_ids)
+
+
+@receiver(users_anonymized)
+def users_anonymized_changed(sender, users, **kwargs):
+    """
+    Les listes en cache exposent le nom des auteurs et des contributeurs : celles
+    des projets des utilisateurs anonymisés sont invalidées.
+    """
+    project_ids = Contributor.objects.filter(
+        user_id__in=[user.pk for user in users]
+    ).values_list("project_id", flat=True)
+    bump_project_versions(*project_ids)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    stats.assignee_deleted(instance.pk)
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def project_changed(sender, instance, **kwargs):
+    """
+    Invalide les réponses mises en cache pour le projet.
+    """
+    bump_project_versions(instance.pk)
+
+
+@receiver(post_delete, sender=Project)
+def project_deleted(sender, instance, **kwargs):
+    changelog.forget_project(instance.pk)
+
+
+@receiver(post_save, sender=Issue)
+def issue_saved(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Met à jour les compteurs du projet, ainsi que l'index de recherche lorsque le
+    titre ou la description d'une issue change, invalide les réponses en cache et
+    publie l'événement correspondant.
+    """
+    events.issues_saved([instance], created)
+    if created:
+        counters.issues_created([instance])
+        stats.issues_created([instance])
+    else:
+        counters.issues_updated([instance])
+        stats.issues_updated([instance])
+    if update_fields is None or {"title", "description"} & set(update_fields):
+        search.index_documents([search.issue_document(instance)])
+    bump_project_versions(instance.project_id)
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, **kwargs):
+    """
+    Indexe le contenu d'un commentaire créé ou modifié et met à jour le compteur
+    de commentaires de son issue.
+    """
+    project_id = instance.issue.project_id
+    if created:
+        counters.comments_changed([instance], 1)
+        stats.comments_changed([instance], {instance.issue_id: project_id}, 1)
+        events.comments_created([instance], {instance.issue_id: project_id})
+    search.index_documents([search.comment_document(instance, project_id)])
+    bump_project_versions(project_id)
+
+
+@receiver(post_delete, sender=Issue)
+@receiver(post_delete, sender=Comment)
+def document_deleted(sender, instance, **kwargs):
+    """
+    Met à jour les compteurs et retire une issue ou un commentaire supprimé de
+    l'index de recherche.
+    """
+    if sender is Issue:
+        counters.issues_deleted([instance])
+        stats.issues_deleted([instance])
+        bump_project_versions(instance.project_id)
+    else:
+        project_id = instance.issue.project_id
+        counters.comments_changed([instance], -1)
+        stats.comments_changed([instance], {instance.issue_id: project_id}, -1)
+        bump_project_versions(project_id)
+    search.unindex_document(sender._meta.model_name, instance.pk)
+
+
+@receiver(post_bulk_save, sender=Issue)
+def issues_bulk_saved(sender, instances, created, update_fields=None, **kwargs):
+    events.issues_saved(instances, created)
+    if created:
+        counters.issues_created(instances)
+        stats.issues_created(instances)
+    else:
+        if update_fields is None or "status" in update_fields:
+            counters.issues_updated(instances)
+        if update_fields is None or STAT_FIELDS & set(update_fields):
+            stats.issues_updated(instances)
+    if update_fields is None or {"title", "description"} & set(update_fields):
+        search.index_documents(search.issue_document(issue) for issue in instances)
+    bump_project_versions(*(issue.project_id for issue in instances))
+
+
+@receiver(post_bulk_delete, sender=Comment)
+def comments_bulk_deleted(sender, instances, **kwargs):
+    counters.comments_changed(instances, -1)
+    stats.comments_changed(
+        instances,
+        {comment.issue_id: comment.issue.project_id for comment in instances},
+        -1,
+    )
+    search.unindex_documents("comment", [comment.pk for comment in instances])
+    bump_project_versions(*{comment.issue.project_id for comment in instances})
+
+
+@receiver(post_bulk_save, sender=Comment)
+def comments_bulk_saved(sender, instances, created, **kwargs):
+    if created:
+        counters.comments_changed(instances, 1)
+    project_ids = dict(
+        Issue.objects.filter(
+            pk__in={comment.issue_id for comment in instances}
+        ).values_list("id", "project_id")
+    )
+    search.index_documents(
+        search.comment_document(comment, project_ids[comment.issue_id])
+        for comment in instances
+    )
+    if created:
+        stats.comments_changed(instances, project_ids, 1)
+        events.comments_created(instances, project_ids)
+    bump_project_versions(*project_ids.values())
+
+
+@receiver(post_save, sender=Issue)
+@receiver(post_save, sender=Comment)
+@receiver(post_save, sender=Contributor)
+def log_saved(sender, instance, created, **kwargs):
+    """
+    Journalise la création ou la modification d'un objet synchronisé (api.changelog).
+    """
+    action = ChangeLogEntry.CREATED if created else ChangeLogEntry.UPDATED
+    changelog.record(sender, action, [instance])
+
+
+@receiver(post_delete, sender=Issue)
+@receiver(post_delete, sender=Comment)
+@receiver(post_delete, sender=Contributor)
+def log_deleted(sender, instance, **kwargs):
+    changelog.record(sender, ChangeLogEntry.DELETED, [instance])
+
+
+@receiver(post_bulk_save, sender=Issue)
+@receiver(post_bulk_save, sender=Comment)
+@receiver(post_bulk_save, sender=Contributor)
+def log_bulk_saved(sender, instances, created, **kwargs):
+    action = ChangeLogEntry.CREATED if created else ChangeLogEntry.UPDATED
+    changelog.record(sender, action, instances)
+
+
+@receiver(post_bulk_delete, sender=Contributor)
+@receiver(post_bulk_delete, sender=Comment)
+def log_bulk_deleted(sender, instances, **kwargs):
+    changelog.record(sender, ChangeLogEntry.DELETED, instances)
@@ -0,0 +1,213 @@
+"""
+Statistiques des projets, servies par /projects/<pk>/stats/ à partir de tables
+de synthèse plutôt que des issues elles-mêmes.
+
+IssueStatistic compte les issues de chaque projet par (statut, priorité, tag,
+assigné) et CommentActivity ses commentaires par jour. Les receivers de
+api.signals les mettent à jour dans la transaction de chaque écriture, avec une
+requête UPDATE (expression F()) par ligne touchée, comme api.counters : une
+création d'issue touche une ligne, une modification deux. Le coût d'une lecture
+dépend du nombre de combinaisons présentes, pas du nombre d'issues du projet.
+La commande rebuild_project_stats recalcule les deux tables, une requête
+GROUP BY chacune.
+"""
+
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import ISSUE_STAT_FIELDS, Comment, CommentActivity, Issue, IssueStatistic
+
+
+def upsert(model, key_fields, deltas, field):
+    """
+    Ajoute chaque variation au compteur `field` de sa ligne, créée au besoin.
+
+    La ligne est d'abord mise à jour (F()), puis créée si elle n'existe pas :
+    les écritures étant sérialisées par SQLite, aucune autre transaction ne
+    peut la créer entre les deux requêtes.
+
+    :param deltas: Dictionnaire {clé (valeurs de key_fields): variation}.
+    """
+    for key, delta in deltas.items():
+        if not delta:
+            continue
+        lookup = dict(zip(key_fields, key))
+        updated = model.objects.filter(**lookup).update(**{field: F(field) + delta})
+        if not updated and delta > 0:
+            model.objects.create(**lookup, **{field: delta})
+
+
+def apply_issue_deltas(deltas):
+    upsert(IssueStatistic, ISSUE_STAT_FIELDS, deltas, "issue_count")
+
+
+def issues_created(issues):
+    deltas = Counter()
+    for issue in issues:
+        issue._loaded_stat_key = issue.stat_key()
+        deltas[issue._loaded_stat_key] += 1
+    apply_issue_deltas(deltas)
+
+
+def issues_updated(issues):
+    """
+    Déplace les issues modifiées vers leur nouvelle ligne. La ligne précédente est
+    celle mémorisée par Issue.from_db ; une issue chargée partiellement est ignorée.
+    """
+    deltas = Counter()
+    for issue in issues:
+        previous, current = getattr(issue, "_loaded_stat_key", None), issue.stat_key()
+        if previous is not None and current is not None and previous != current:
+            deltas[previous] -= 1
+            deltas[current] += 1
+        if current is not None:
+            issue._loaded_stat_key = current
+    apply_issue_deltas(deltas)
+
+
+def issues_deleted(issues):
+    deltas = Counter()
+    for issue in issues:
+        key = getattr(issue, "_loaded_stat_key", None) or issue.stat_key()
+        if key is not None:
+            deltas[key] -= 1
+    apply_issue_deltas(deltas)
+
+
+def assignee_deleted(user_id):
+    """
+    Reporte les issues d'un utilisateur supprimé sur les lignes sans assigné : la
+    suppression remet Issue.assignee à NULL (SET_NULL) sans signal par issue.
+    """
+    rows = IssueStatistic.objects.filter(assignee_id=user_id)
+    deltas = Counter()
+    for row in rows.values(*ISSUE_STAT_FIELDS, "issue_count"):
+        key = tuple(row[field] for field in ISSUE_STAT_FIELDS)
+        deltas[key[:-1] + (None,)] += row["issue_count"]
+    rows.delete()
+    apply_issue_deltas(deltas)
+
+
+def comments_changed(comments, project_ids, delta):
+    """
+    Ajoute `delta` à l'activité du jour de création de chaque commentaire.
+
+    :param project_ids: Dictionnaire {issue_id: project_id}.
+    """
+    deltas = Counter()
+    for comment in comments:
+        day = timezone.localdate(comment.created_time)
+        deltas[project_ids[comment.issue_id], day] += delta
+    upsert(CommentActivity, ("project_id", "day"), deltas, "comment_count")
+
+
+def project_stats(project, days):
+    """
+    Calcule les statistiques d'un projet à partir des tables de synthèse.
+
+    :param days: Nombre de jours d'activité des commentaires renvoyés.
+    """
+    rows = list(
+        IssueStatistic.objects.filter(project=project, issue_count__gt=0)
+        .order_by()
+        .values(
+            "status",
+            "priority",
+            "tag",
+            "assignee_id",
+            "assignee__username",
+            "issue_count",
+        )
+    )
+    by_status, by_priority, by_tag = Counter(), Counter(), Counter()
+    by_assignee = defaultdict(int)
+    usernames = {}
+    for row in rows:
+        count = row["issue_count"]
+        by_status[row["status"]] += count
+        by_priority[row["priority"]] += count
+        by_tag[row["tag"]] += count
+        by_assignee[row["assignee_id"]] += count
+        usernames[row["assignee_id"]] = row["assignee__username"]
+
+    since = timezone.localdate() - timedelta(days=days - 1)
+    activity = (
+        CommentActivity.objects.filter(
+            project=project, day__gte=since, comment_count__gt=0
+        )
+        .order_by("day")
+        .values_list("day", "comment_count")
+    )
+    return {
+        "issue_count": sum(by_status.values()),
+        "by_status": dict(by_status),
+        "by_priority": dict(by_priority),
+        "by_tag": dict(by_tag),
+        "by_assignee": [
+            {"id": user_id, "username": usernames[user_id], "issue_count": count}
+            for user_id, count in sorted(by_assignee.items(), key=lambda item: -item[1])
+        ],
+        "breakdown": [
+            {
+                "status": row["status"],
+                "priority": row["priority"],
+                "tag": row["tag"],
+                "assignee": row["assignee__username"],
+                "issue_count": row["issue_count"],
+            }
+            for row in rows
+        ],
+        "comment_activity": [
+            {"day": day, "comment_count": count} for day, count in activity
+        ],
+    }
+
+
+def rebuild(project_ids=None):
+    """
+    Recalcule les tables de synthèse à partir des issues et des commentaires,
+    une requête GROUP BY par table.
+
+    :param project_ids: Projets à recalculer (tous par défaut).
+    :return: Nombre de lignes d'IssueStatistic et de CommentActivity écrites.
+    """
+    issues, comments = Issue.objects.all(), Comment.objects.all()
+    statistics, activity = IssueStatistic.objects.all(), CommentActivity.objects.all()
+    if project_ids is not None:
+        issues = issues.filter(project_id__in=project_ids)
+        comments = comments.filter(issue__project_id__in=project_ids)
+        statistics = statistics.filter(project_id__in=project_ids)
+        activity = activity.filter(project_id__in=project_ids)
+    statistics.delete()
+    activity.delete()
+
+    groups = (
+        issues.order_by().values(*ISSUE_STAT_FIELDS).annotate(issue_count=Count("pk"))
+    )
+    created = IssueStatistic.objects.bulk_create(
+        (IssueStatistic(**row) for row in groups.iterator()),
+        batch_size=settings.BULK_BATCH_SIZE,
+    )
+    days = (
+        comments.order_by()
+        .annotate(day=TruncDate("created_time"))
+        .values("issue__project_id", "day")
+        .annotate(comment_count=Count("pk"))
+    )
+    created_days = CommentActivity.objects.bulk_create(
+        (
+            CommentActivity(
+                project_id=row["issue__project_id"],
+                day=row["day"],
+                comment_count=row["comment_count"],
+            )
+            for row in days.iterator()
+        ),
+        batch_size=settings.BULK_BATCH_SIZE,
+    )
+    return len(created), len(created_days)
@@ -1,3 +1,1600 @@
-from django.test import TestCase
+import asyncio
+import contextlib
+import io
+import json
+import tempfile
+import uuid
+from datetime import date, datetime, time, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import CommandError, ManagementUtility, call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.http import HttpResponse
+from django.test import (
+    AsyncClient,
+    RequestFactory,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import RefreshToken
+from softdesk.cache import response_cache
+from softdesk.events import Event, broker
+from softdesk.metrics import PHASES, registry
+from softdesk.mixins import CachedListMixin
+from softdesk.parsers import FastJSONParser
+from softdesk.renderers import FastJSONRenderer
+from softdesk.middleware import ReplicaRoutingMiddleware
+from softdesk.routers import (
+    REPLICA_DB_ALIAS,
+    PrimaryReplicaRouter,
+    primary,
+    use_replica,
+)
+
+from users.authentication import CachedJWTAuthentication
+from users.models import User
+
+from . import changelog, deletion, search, stats
+from .cache import is_contributor
+from .events import EventStreamToken, project_topic
+from .filters import IssueFilterBackend
+from .management.commands import bench_softdesk
+from .models import (
+    ChangeLogEntry,
+    Comment,
+    CommentActivity,
+    Contributor,
+    DeletionJob,
+    Issue,
+    IssueStatistic,
+    Project,
+)
+from .serializers import IssueSerializer
+from .signals import post_bulk_save
+
+
+def create_user(username, **extra):
+    return User.objects.create_user(
+        username=username, password="password", birth_date=date(1990, 1, 1), **extra
+    )
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class SoftdeskTestCase(TestCase):
+    """
+    Base des tests de l'API : un auteur, un contributeur, un utilisateur extérieur
+    et un projet. Le cache (appartenance, listes, limites de débit) est vidé avant
+    chaque test.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.author = create_user("author")
+        self.member = create_user("member")
+        self.outsider = create_user("outsider")
+        self.project = Project.objects.create(
+            title="Projet",
+            description="Description",
+            type="Backend",
+            author=self.author,
+        )
+        Contributor.objects.create(user=self.author, project=self.project)
+        Contributor.objects.create(user=self.member, project=self.project)
+        self.client = self.client_for(self.author)
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def create_issue(self, **fields):
+        fields.setdefault("title", "Issue")
+        fields.setdefault("description", "Description")
+        fields.setdefault("project", self.project)
+        fields.setdefault("author", self.author)
+        return Issue.objects.create(**fields)
+
+    def result_ids(self, response):
+        return [item["id"] for item in response.json()["results"]]
+
+    def issues_url(self, project=None):
+        return f"/api/projects/{(project or self.project).pk}/issues/"
+
+    def comments_url(self, issue):
+        return f"{self.issues_url(issue.project)}{issue.pk}/comments/"
+
+
+class IssueFilterIndexTests(SoftdeskTestCase):
+    """
+    Chaque filtre de IssueFilterBackend est servi par son index composite.
+    """
+
+    def query_plan(self, params):
+        request = Request(APIRequestFactory().get("/", params))
+        queryset = IssueFilterBackend().filter_queryset(
+            request,
+            Issue.objects.filter(project=self.project).order_by("created_time", "id"),
+            None,
+        )
+        sql, sql_params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", sql_params)
+            return " ".join(row[-1] for row in cursor.fetchall())
+
+    def test_filters_use_their_index(self):
+        for params, index in (
+            ({}, "issue_project_created_idx"),
+            ({"status": "Done"}, "issue_project_status_idx"),
+            ({"priority": "High"}, "issue_project_priority_idx"),
+            ({"tag": "Bug"}, "issue_project_tag_idx"),
+            ({"assignee": "member"}, "issue_project_assignee_idx"),
+        ):
+            with self.subTest(params=params):
+                plan = self.query_plan(params)
+                self.assertIn(index, plan)
+                self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_filter_results(self):
+        done = self.create_issue(status="Done", assignee=self.member)
+        self.create_issue(status="To Do")
+        response = self.client.get(self.issues_url(), {"status": "Done"})
+        self.assertEqual(self.result_ids(response), [str(done.pk)])
+        response = self.client.get(self.issues_url(), {"assignee": "member"})
+        self.assertEqual(self.result_ids(response), [str(done.pk)])
+        response = self.client.get(self.issues_url(), {"status": "Unknown"})
+        self.assertEqual(response.status_code, 400)
+
+
+class KeysetPaginationTests(SoftdeskTestCase):
+    """
+    Pagination par curseur des listes imbriquées (?pagination=cursor).
+    """
+
+    def walk(self, url):
+        ids, pages = [], 0
+        while url:
+            data = self.client.get(url).json()
+            ids.extend(item["id"] for item in data["results"])
+            url, pages = data["next"], pages + 1
+        return ids, pages
+
+    def test_forward_and_backward(self):
+        issues = [self.create_issue(title=f"Issue {n}") for n in range(25)]
+        ids, pages = self.walk(f"{self.issues_url()}?pagination=cursor")
+        self.assertEqual(ids, [str(issue.pk) for issue in issues])
+        self.assertEqual(pages, 3)
+
+        first = self.client.get(f"{self.issues_url()}?pagination=cursor").json()
+        second = self.client.get(first["next"]).json()
+        back = self.client.get(second["previous"]).json()
+        self.assertEqual(back["results"], first["results"])
+
+    def test_pages_stable_under_inserts(self):
+        issues = [self.create_issue(title=f"Issue {n}") for n in range(15)]
+        first = self.client.get(f"{self.issues_url()}?pagination=cursor").json()
+        self.create_issue(title="Nouvelle")
+        second = self.client.get(first["next"]).json()
+        self.assertEqual(
+            [item["id"] for item in second["results"][:5]],
+            [str(issue.pk) for issue in issues[10:]],
+        )
+
+    def test_integer_primary_keys(self):
+        for n in range(12):
+            Contributor.objects.create(
+                user=create_user(f"contributor{n}"), project=self.project
+            )
+        url = f"/api/projects/{self.project.pk}/contributors/?pagination=cursor"
+        ids, pages = self.walk(url)
+        self.assertEqual(pages, 2)
+        self.assertEqual(len(set(ids)), 14)
+
+    def test_cursor_seeks_in_index(self):
+        for n in range(15):
+            self.create_issue(title=f"Issue {n}")
+        first = self.client.get(f"{self.issues_url()}?pagination=cursor").json()
+        with CaptureQueriesContext(connection) as captured:
+            self.client.get(first["next"])
+        page_query = captured.captured_queries[-1]["sql"]
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {page_query}")
+            plan = " ".join(row[-1] for row in cursor.fetchall())
+        self.assertIn(
+            "issue_project_created_idx (project_id=? AND created_time>?)", plan
+        )
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.issues_url(), {"cursor": "invalide"})
+        self.assertEqual(response.status_code, 404)
+
+
+class MembershipCacheTests(SoftdeskTestCase):
+    """
+    Cache d'appartenance aux projets (par requête et partagé entre workers).
+    """
+
+    def request_for(self, user):
+        request = APIRequestFactory().get("/")
+        request.user = user
+        return request
+
+    def test_cached_per_request_and_shared(self):
+        request = self.request_for(self.member)
+        with self.assertNumQueries(1):
+            self.assertTrue(is_contributor(request, self.project.pk))
+            self.assertTrue(is_contributor(request, self.project.pk))
+        with self.assertNumQueries(0):
+            self.assertTrue(
+                is_contributor(self.request_for(self.member), self.project.pk)
+            )
+        self.assertFalse(
+            is_contributor(self.request_for(self.outsider), self.project.pk)
+        )
+
+    def test_invalidated_on_contributor_change(self):
+        self.assertTrue(is_contributor(self.request_for(self.member), self.project.pk))
+        with self.captureOnCommitCallbacks(execute=True):
+            Contributor.objects.get(user=self.member).delete()
+        self.assertFalse(is_contributor(self.request_for(self.member), self.project.pk))
+        self.assertFalse(
+            is_contributor(self.request_for(self.outsider), self.project.pk)
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            Contributor.objects.create(user=self.outsider, project=self.project)
+        self.assertTrue(
+            is_contributor(self.request_for(self.outsider), self.project.pk)
+        )
+
+    def test_invalidated_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Contributor.objects.get(user=self.member).delete()
+            # Un autre worker, qui voit encore la ligne validée, remplit le cache
+            # avant la validation de la suppression.
+            with mock.patch("django.db.models.QuerySet.exists", return_value=True):
+                self.assertTrue(
+                    is_contributor(self.request_for(self.member), self.project.pk)
+                )
+        self.assertFalse(is_contributor(self.request_for(self.member), self.project.pk))
+
+    def test_outsider_sees_no_issue(self):
+        self.create_issue()
+        response = self.client_for(self.outsider).get(self.issues_url())
+        self.assertEqual(self.result_ids(response), [])
+
+
+class BulkIssueTests(SoftdeskTestCase):
+    """
+    Création et mise à jour groupées de tickets (/issues/bulk/).
+    """
+
+    def bulk_url(self):
+        return f"{self.issues_url()}bulk/"
+
+    def items(self, count, **fields):
+        return [
+            {"title": f"Bulk {n}", "description": "Description", **fields}
+            for n in range(count)
+        ]
+
+    def test_create(self):
+        response = self.client.post(
+            self.bulk_url(), self.items(3, assignee="member"), format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data), 3)
+        self.assertEqual(
+            Issue.objects.filter(project=self.project, assignee=self.member).count(), 3
+        )
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.issue_count, 3)
+
+    def test_query_count_does_not_depend_on_size(self):
+        # Premier appel : remplit le cache d'appartenance et crée les lignes de
+        # statistiques.
+        self.client.post(
+            self.bulk_url(), self.items(1, assignee="member"), format="json"
+        )
+        counts = []
+        for size in (2, 50):
+            with CaptureQueriesContext(connection) as captured:
+                self.client.post(
+                    self.bulk_url(), self.items(size, assignee="member"), format="json"
+                )
+            counts.append(len(captured))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_errors_per_item_and_nothing_written(self):
+        items = self.items(3)
+        items[1]["assignee"] = "outsider"
+        items[2]["status"] = "Unknown"
+        response = self.client.post(self.bulk_url(), items, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error["index"] for error in response.data["errors"]], [1, 2])
+        self.assertFalse(Issue.objects.exists())
+
+    def test_partial_update(self):
+        mine = self.create_issue()
+        theirs = self.create_issue(author=self.member)
+        response = self.client.patch(
+            self.bulk_url(), [{"id": str(mine.pk), "status": "Done"}], format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        mine.refresh_from_db()
+        self.assertEqual(mine.status, "Done")
+
+        response = self.client.patch(
+            self.bulk_url(), [{"id": str(theirs.pk), "status": "Done"}], format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["errors"][0]["index"], 0)
+
+    def test_too_many_items(self):
+        with self.settings(BULK_MAX_ITEMS=2):
+            response = self.client.post(self.bulk_url(), self.items(3), format="json")
+        self.assertEqual(response.status_code, 400)
+
+
+class SparseFieldsetTests(SoftdeskTestCase):
+    """
+    Sélection des champs (?fields= / ?omit=) et chargement partiel des colonnes.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.issue = self.create_issue(description="Texte long " * 100)
+
+    def issue_query(self, params):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(self.issues_url(), params)
+        sql = next(
+            query["sql"]
+            for query in captured.captured_queries
+            if query["sql"].startswith('SELECT "api_issue"."id"')
+            and "LIMIT" in query["sql"]
+        )
+        return response.json()["results"][0], sql
+
+    def test_fields(self):
+        item, sql = self.issue_query({"fields": "id,title,unknown"})
+        self.assertEqual(set(item), {"id", "title"})
+        self.assertNotIn('"api_issue"."description"', sql)
+        self.assertNotIn("users_user", sql)
+
+    def test_omit(self):
+        item, sql = self.issue_query({"omit": "description"})
+        self.assertNotIn("description", item)
+        self.assertIn("title", item)
+        self.assertNotIn('"api_issue"."description"', sql)
+
+    def test_writes_ignore_selection(self):
+        response = self.client.post(
+            f"{self.issues_url()}?fields=id",
+            {"title": "Nouvelle", "description": "D", "project": str(self.project.pk)},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertIn("title", response.data)
+
+
+class ConditionalGetTests(SoftdeskTestCase):
+    """
+    Validateurs ETag / Last-Modified et réponses 304 des listes et des détails.
+    """
+
+    def test_list_not_modified(self):
+        issue = self.create_issue()
+        response = self.client.get(self.issues_url())
+        etag = response["ETag"]
+        self.assertTrue(response.has_header("Last-Modified"))
+
+        response = self.client.get(self.issues_url(), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        issue.title = "Modifiée"
+        issue.save()
+        response = self.client.get(self.issues_url(), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_list_etag_changes_on_delete(self):
+        first = self.create_issue()
+        self.create_issue()
+        etag = self.client.get(self.issues_url())["ETag"]
+        first.delete()
+        response = self.client.get(self.issues_url(), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_detail_if_modified_since(self):
+        issue = self.create_issue()
+        url = f"{self.issues_url()}{issue.pk}/"
+        last_modified = self.client.get(url)["Last-Modified"]
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_project_detail(self):
+        url = f"/api/projects/{self.project.pk}/"
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+
+class ProjectExportImportTests(SoftdeskTestCase):
+    """
+    Export NDJSON d'un projet et réimport par la commande import_project.
+    """
+
+    def export(self):
+        response = self.client.get(f"/api/projects/{self.project.pk}/export/")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        return b"".join(response.streaming_content).decode()
+
+    def test_round_trip(self):
+        issue = self.create_issue(title="Importée", assignee=self.member)
+        Comment.objects.create(issue=issue, author=self.member, content="Commentaire")
+        content = self.export()
+        records = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual(
+            [record["type"] for record in records],
+            ["project", "contributor", "contributor", "issue", "comment"],
+        )
+
+        project_id = self.project.pk
+        self.project.delete()
+        with tempfile.NamedTemporaryFile("w", suffix=".ndjson") as stream:
+            stream.write(content)
+            stream.flush()
+            call_command("import_project", stream.name, stdout=io.StringIO())
+
+        project = Project.objects.get(pk=project_id)
+        self.assertEqual(project.issue_count, 1)
+        self.assertEqual(
+            set(project.contributors.values_list("username", flat=True)),
+            {"author", "member"},
+        )
+        imported = Issue.objects.get(pk=issue.pk)
+        self.assertEqual(imported.assignee, self.member)
+        self.assertEqual(imported.comment_count, 1)
+        self.assertFalse(
+            ChangeLogEntry.objects.filter(object_id="None").exists(),
+        )
+        response = self.client.get(f"/api/projects/{project_id}/changes/", {"since": 0})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["contributors"]["changed"]), 2)
+        results = self.client.get("/api/search/", {"q": "Importée"}).json()["results"]
+        self.assertEqual([result["id"] for result in results], [str(issue.pk)])
+
+    def test_invalid_id(self):
+        line = json.dumps(
+            {
+                "type": "project",
+                "id": "pas-un-uuid",
+                "title": "P",
+                "description": "D",
+                "project_type": "Backend",
+                "author": "author",
+            }
+        )
+        with tempfile.NamedTemporaryFile("w", suffix=".ndjson") as stream:
+            stream.write(line + "\n")
+            stream.flush()
+            with self.assertRaises(CommandError):
+                call_command("import_project", stream.name, stdout=io.StringIO())
+
+
+class SearchTests(SoftdeskTestCase):
+    """
+    Recherche plein texte sur les issues et les commentaires.
+    """
+
+    def search(self, user=None, **params):
+        client = self.client_for(user) if user else self.client
+        response = client.get("/api/search/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()["results"]
+
+    def test_ranked_and_scoped_to_contributors(self):
+        in_title = self.create_issue(title="Panne du serveur", description="Détail")
+        in_body = self.create_issue(title="Autre", description="Le serveur redémarre")
+        Comment.objects.create(
+            issue=in_body, author=self.member, content="serveur lent"
+        )
+        results = self.search(q="serveur")
+        self.assertEqual(results[0]["id"], str(in_title.pk))
+        self.assertEqual(len(results), 3)
+        self.assertIn("<mark>serveur</mark>", results[0]["title"])
+        self.assertEqual(self.search(self.outsider, q="serveur"), [])
+
+    def test_update_and_delete_reindex(self):
+        issue = self.create_issue(title="Ancien titre")
+        issue.title = "Nouveau titre"
+        issue.save()
+        self.assertEqual(self.search(q="Ancien"), [])
+        self.assertEqual(len(self.search(q="Nouveau")), 1)
+        issue.delete()
+        self.assertEqual(self.search(q="Nouveau"), [])
+
+    def test_documents_accept_string_ids(self):
+        issue = self.create_issue()
+        from_string = Issue(
+            id=str(issue.pk),
+            project_id=str(self.project.pk),
+            title=issue.title,
+            description=issue.description,
+        )
+        self.assertEqual(
+            search.issue_document(from_string), search.issue_document(issue)
+        )
+        comment = Comment(id=str(uuid.uuid4()), issue_id=str(issue.pk), content="C")
+        document = search.comment_document(comment, str(self.project.pk))
+        self.assertEqual(document[3], self.project.pk.hex)
+
+
+class CounterTests(SoftdeskTestCase):
+    """
+    Compteurs dénormalisés des projets (issues par statut) et des issues
+    (commentaires).
+    """
+
+    def counters(self):
+        self.project.refresh_from_db()
+        return (
+            self.project.issue_count,
+            self.project.todo_issue_count,
+            self.project.in_progress_issue_count,
+            self.project.done_issue_count,
+        )
+
+    def test_issue_lifecycle(self):
+        issue = self.create_issue()
+        self.create_issue(status="Done")
+        self.assertEqual(self.counters(), (2, 1, 0, 1))
+        response = self.client.patch(
+            f"{self.issues_url()}{issue.pk}/", {"status": "In Progress"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.counters(), (2, 0, 1, 1))
+        self.client.delete(f"{self.issues_url()}{issue.pk}/")
+        self.assertEqual(self.counters(), (1, 0, 0, 1))
+
+    def test_comment_count(self):
+        issue = self.create_issue()
+        for n in range(2):
+            self.client.post(
+                self.comments_url(issue),
+                {"content": f"Commentaire {n}", "issue": str(issue.pk)},
+                format="json",
+            )
+        issue.refresh_from_db()
+        self.assertEqual(issue.comment_count, 2)
+        Comment.objects.filter(issue=issue).first().delete()
+        issue.refresh_from_db()
+        self.assertEqual(issue.comment_count, 1)
+
+    def test_recount(self):
+        issue = self.create_issue()
+        Project.objects.update(issue_count=5, todo_issue_count=0)
+        Issue.objects.update(comment_count=3)
+        call_command("recount_counters", stdout=io.StringIO())
+        self.assertEqual(self.counters(), (1, 1, 0, 0))
+        issue.refresh_from_db()
+        self.assertEqual(issue.comment_count, 0)
+
+
+class CounterMigrationTests(TransactionTestCase):
+    """
+    La migration qui ajoute les compteurs les initialise sur les données
+    existantes.
+    """
+
+    before = [("api", "0004_conditional_get")]
+    after = [("api", "0005_counters")]
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_backfill(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.before)
+        apps = executor.loader.project_state(self.before).apps
+        User = apps.get_model("users", "User")
+        Project = apps.get_model("api", "Project")
+        Issue = apps.get_model("api", "Issue")
+        Comment = apps.get_model("api", "Comment")
+        user = User.objects.create(username="author", birth_date=date(1990, 1, 1))
+        project = Project.objects.create(
+            title="P", description="D", type="Backend", author=user
+        )
+        issues = [
+            Issue.objects.create(
+                title="I", description="D", status=status, project=project, author=user
+            )
+            for status in ("To Do", "Done", "Done")
+        ]
+        Comment.objects.create(issue=issues[0], author=user, content="C")
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.after)
+        apps = executor.loader.project_state(self.after).apps
+        project = apps.get_model("api", "Project").objects.get(pk=project.pk)
+        self.assertEqual(
+            (
+                project.issue_count,
+                project.todo_issue_count,
+                project.in_progress_issue_count,
+                project.done_issue_count,
+            ),
+            (3, 1, 0, 2),
+        )
+        issue = apps.get_model("api", "Issue").objects.get(pk=issues[0].pk)
+        self.assertEqual(issue.comment_count, 1)
+
+
+class AsyncViewTests(SoftdeskTestCase):
+    """
+    Les vues asynchrones (/api/async/...) renvoient les mêmes représentations que
+    les vues DRF, avec une authentification JWT.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.issue = self.create_issue()
+        self.comment = Comment.objects.create(
+            issue=self.issue, author=self.author, content="Commentaire"
+        )
+        self.async_client = AsyncClient()
+
+    def headers(self, user):
+        return {"Authorization": f"Bearer {RefreshToken.for_user(user).access_token}"}
+
+    def urls(self):
+        project = f"projects/{self.project.pk}/"
+        issue = f"{project}issues/{self.issue.pk}/"
+        contributor = Contributor.objects.get(project=self.project, user=self.member)
+        return [
+            "projects/",
+            project,
+            f"{project}issues/",
+            issue,
+            f"{issue}comments/",
+            f"{issue}comments/{self.comment.pk}/",
+            f"{project}contributors/",
+            f"{project}contributors/{contributor.pk}/",
+        ]
+
+    async def test_same_representations(self):
+        for path in await sync_to_async(self.urls)():
+            with self.subTest(path=path):
+                expected = await sync_to_async(self.client.get)(f"/api/{path}")
+                response = await self.async_client.get(
+                    f"/api/async/{path}", headers=self.headers(self.author)
+                )
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json(), expected.json())
+
+    async def test_requires_token(self):
+        response = await self.async_client.get("/api/async/projects/")
+        self.assertEqual(response.status_code, 401)
+        self.assertIn("Bearer", response["WWW-Authenticate"])
+        response = await self.async_client.get(
+            "/api/async/projects/", headers={"Authorization": "Bearer invalide"}
+        )
+        self.assertEqual(response.status_code, 401)
+
+    async def test_outsider(self):
+        headers = self.headers(self.outsider)
+        project = f"/api/async/projects/{self.project.pk}/"
+        response = await self.async_client.get(project, headers=headers)
+        self.assertEqual(response.status_code, 404)
+        response = await self.async_client.get(f"{project}issues/", headers=headers)
+        self.assertEqual(response.json()["results"], [])
+        response = await self.async_client.get(
+            f"{project}issues/{self.issue.pk}/", headers=headers
+        )
+        self.assertEqual(response.status_code, 404)
+
+    async def test_read_only(self):
+        response = await self.async_client.post(
+            "/api/async/projects/", {}, headers=self.headers(self.author)
+        )
+        self.assertEqual(response.status_code, 405)
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class BenchCommandTests(TestCase):
+    """
+    Commandes seed_softdesk et bench_softdesk, lancées comme par manage.py
+    (contrôles système compris).
+    """
+
+    def setUp(self):
+        cache.clear()
+        call_command(
+            "seed_softdesk",
+            users=10,
+            projects=2,
+            issues=40,
+            comments=60,
+            random_seed=1,
+            stdout=io.StringIO(),
+        )
+
+    def run_command(self, *args):
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            ManagementUtility(["manage.py", *args]).execute()
+        return stdout.getvalue()
+
+    def test_seed(self):
+        self.assertEqual(Project.objects.count(), 2)
+        self.assertEqual(Issue.objects.count(), 40)
+        self.assertEqual(Comment.objects.count(), 60)
+
+    def test_bench_routes(self):
+        counts = (Project.objects.count(), Issue.objects.count(), User.objects.count())
+        output = self.run_command(
+            "bench_softdesk", "--iterations", "1", "--warmup", "1"
+        )
+        self.assertIn("Toutes les routes respectent leur budget.", output)
+        for route in bench_softdesk.ROUTES:
+            with self.subTest(route=route["name"]):
+                self.assertIn(bench_softdesk.Command().route_key(route), output)
+        # Écritures annulées
+        self.assertEqual(
+            (Project.objects.count(), Issue.objects.count(), User.objects.count()),
+            counts,
+        )
+
+    def test_budget_exceeded(self):
+        routes = [{"name": "project-list", "budget": 0}]
+        with mock.patch.object(bench_softdesk, "ROUTES", routes):
+            with self.assertRaisesMessage(CommandError, "GET project-list"):
+                call_command(
+                    "bench_softdesk", iterations=1, warmup=0, stdout=io.StringIO()
+                )
+
+    def test_bench_bulk(self):
+        output = self.run_command(
+            "bench_softdesk",
+            "--mode",
+            "bulk",
+            "--bulk-size",
+            "20",
+            "--min-bulk-speedup",
+            "0",
+        )
+        self.assertIn("Gain de la route groupée", output)
+
+
+@override_settings(PERFORMANCE_METRICS=True)
+class MetricsTests(SoftdeskTestCase):
+    """
+    En-tête Server-Timing et histogrammes par route exposés sur /api/metrics/.
+    """
+
+    def setUp(self):
+        super().setUp()
+        registry.clear()
+        # Le middleware est chargé à la première requête d'un nouveau client.
+        self.client = self.client_for(self.author)
+
+    def test_server_timing(self):
+        response = self.client.get("/api/projects/")
+        self.assertEqual(response.status_code, 200)
+        timing = response["Server-Timing"]
+        for phase in (*PHASES, "total"):
+            self.assertIn(f"{phase};dur=", timing)
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="[1-9]\d* queries"')
+
+    def test_metrics(self):
+        self.client.get(self.issues_url())
+        admin = create_user("admin", is_staff=True)
+        response = self.client_for(admin).get("/api/metrics/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        content = response.content.decode()
+        self.assertIn(
+            'softdesk_responses_total{route="project-issues-list",method="GET",'
+            'status="200"} 1',
+            content,
+        )
+        self.assertIn(
+            'softdesk_request_duration_seconds_count{route="project-issues-list",'
+            'method="GET",phase="serialize"} 1',
+            content,
+        )
+
+    def test_metrics_admin_only(self):
+        self.assertEqual(self.client.get("/api/metrics/").status_code, 403)
+
+    @override_settings(PERFORMANCE_METRICS=False)
+    def test_disabled(self):
+        client = self.client_for(self.author)
+        self.assertNotIn("Server-Timing", client.get("/api/projects/"))
+        admin = create_user("admin", is_staff=True)
+        self.assertEqual(self.client_for(admin).get("/api/metrics/").status_code, 404)
+        self.assertEqual(registry.render().count("softdesk_responses_total{"), 0)
+
+
+@override_settings(PROJECT_CONTRIBUTORS_PREVIEW=3)
+class ContributorPreviewTests(SoftdeskTestCase):
+    """
+    Aperçu plafonné des contributeurs dans le détail d'un projet.
+    """
+
+    def setUp(self):
+        super().setUp()
+        users = User.objects.bulk_create(
+            User(username=f"user{n:02}", birth_date=date(1990, 1, 1)) for n in range(5)
+        )
+        Contributor.objects.bulk_create(
+            Contributor(project=self.project, user=user) for user in users
+        )
+
+    def test_capped_preview(self):
+        response = self.client.get(f"/api/projects/{self.project.pk}/")
+        data = response.json()
+        self.assertEqual(
+            [user["username"] for user in data["contributors"]],
+            ["author", "member", "user00"],
+        )
+        self.assertEqual(data["contributor_count"], 7)
+        self.assertTrue(
+            data["contributors_url"].endswith(
+                f"/api/projects/{self.project.pk}/contributors/"
+            )
+        )
+        self.assertEqual(self.client.get(data["contributors_url"]).json()["count"], 7)
+
+    def test_projected_columns(self):
+        with CaptureQueriesContext(connection) as captured:
+            self.client.get(f"/api/projects/{self.project.pk}/")
+        previews = [
+            query["sql"]
+            for query in captured
+            if "_prefetch_related_val_project_id" in query["sql"]
+        ]
+        # Un seul prefetch, plafonné en SQL, sans les colonnes inutiles de User
+        self.assertEqual(len(previews), 1)
+        self.assertIn("<= 3", previews[0])
+        self.assertNotIn("password", previews[0])
+
+
+class DatabaseProfileTests(SoftdeskTestCase):
+    """
+    PRAGMA SQLite appliqués à la connexion, routage des lectures vers le réplica
+    et lecture de ses propres écritures (softdesk.routers).
+    """
+
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_pragmas(self):
+        self.assertEqual(self.pragma("synchronous"), 1)  # NORMAL
+        self.assertEqual(
+            self.pragma("cache_size"), settings.SQLITE_PRAGMAS["cache_size"]
+        )
+
+    def test_router(self):
+        router = PrimaryReplicaRouter()
+        self.assertEqual(router.db_for_read(Issue), "default")
+        token = use_replica.set(True)
+        try:
+            self.assertEqual(router.db_for_read(Issue), REPLICA_DB_ALIAS)
+            self.assertEqual(router.db_for_write(Issue), "default")
+            with primary():
+                self.assertEqual(router.db_for_read(Issue), "default")
+            self.assertEqual(router.db_for_read(Issue), REPLICA_DB_ALIAS)
+        finally:
+            use_replica.reset(token)
+
+    @override_settings(DATABASE_ROUTERS=["softdesk.routers.PrimaryReplicaRouter"])
+    def test_cache_fills_on_primary(self):
+        request = APIRequestFactory().get("/")
+        request.user = self.member
+        access = RefreshToken.for_user(self.member).access_token
+        token = use_replica.set(True)
+        try:
+            # Aucune base "replica" n'est configurée : une lecture routée vers le
+            # réplica échouerait.
+            self.assertTrue(is_contributor(request, self.project.pk))
+            user = CachedJWTAuthentication().get_user(access)
+        finally:
+            use_replica.reset(token)
+        self.assertEqual(user.pk, self.member.pk)
+
+    def routed(self, request, status=200):
+        """
+        Passe la requête dans ReplicaRoutingMiddleware et retourne l'autorisation
+        de lire sur le réplica vue par la vue.
+        """
+        seen = []
+
+        def view(request):
+            seen.append(use_replica.get())
+            request.user = self.author
+            return HttpResponse(status=status)
+
+        with mock.patch.dict(settings.DATABASES, {REPLICA_DB_ALIAS: {}}):
+            ReplicaRoutingMiddleware(view)(request)
+        return seen[0]
+
+    def test_replica_reads(self):
+        factory = RequestFactory(
+            headers={
+                "Authorization": f"Bearer {RefreshToken.for_user(self.author).access_token}"
+            }
+        )
+        self.assertTrue(self.routed(factory.get("/api/projects/")))
+        self.assertFalse(self.routed(factory.post("/api/projects/"), status=400))
+        # Une écriture refusée n'épingle pas l'utilisateur.
+        self.assertTrue(self.routed(factory.get("/api/projects/")))
+        self.assertFalse(self.routed(factory.post("/api/projects/"), status=201))
+        # Lecture de ses propres écritures : base principale.
+        self.assertFalse(self.routed(factory.get("/api/projects/")))
+        self.assertTrue(self.routed(RequestFactory().get("/api/projects/")))
+
+    def test_without_replica(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            ReplicaRoutingMiddleware(lambda request: HttpResponse())
+
+
+class ListCacheTests(SoftdeskTestCase):
+    """
+    Cache des réponses de liste, invalidé par les compteurs de version des projets.
+    """
+
+    def setUp(self):
+        super().setUp()
+        response_cache.stats.clear()
+        self.issue = self.create_issue(title="Première")
+
+    def titles(self, client=None):
+        response = (client or self.client).get(self.issues_url())
+        return [issue["title"] for issue in response.json()["results"]]
+
+    def test_hit(self):
+        with CaptureQueriesContext(connection) as miss:
+            self.titles()
+        with CaptureQueriesContext(connection) as hit:
+            self.titles()
+        self.assertEqual(response_cache.stats["project-issues", "hit"], 1)
+        self.assertEqual(response_cache.stats["project-issues", "miss"], 1)
+        # La page (COUNT et SELECT des issues) n'est plus relue en base.
+        page = ("SELECT COUNT(*)", 'SELECT "api_issue"."id"')
+        self.assertTrue(any(q["sql"].startswith(page) for q in miss))
+        self.assertFalse(any(q["sql"].startswith(page) for q in hit))
+        entries, size = response_cache.memory_usage()
+        self.assertEqual(entries, 1)
+        self.assertGreater(size, 0)
+        self.assertIn(
+            'softdesk_response_cache_hit_ratio{view="project-issues"} 0.5',
+            response_cache.metrics(),
+        )
+
+    def test_invalidation(self):
+        self.assertEqual(self.titles(), ["Première"])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_issue(title="Seconde")
+        self.assertEqual(self.titles(), ["Première", "Seconde"])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                f"{self.issues_url()}{self.issue.pk}/",
+                {"title": "Modifiée"},
+                format="json",
+            )
+        self.assertEqual(self.titles(), ["Modifiée", "Seconde"])
+
+        url = self.comments_url(self.issue)
+        self.assertEqual(self.client.get(url).json()["count"], 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            Comment.objects.create(issue=self.issue, author=self.author, content="C")
+        self.assertEqual(self.client.get(url).json()["count"], 1)
+
+        self.assertEqual(self.client.get("/api/projects/").json()["count"], 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            Project.objects.filter(pk=self.project.pk).first().delete()
+        self.assertEqual(self.client.get("/api/projects/").json()["count"], 0)
+
+    def test_per_user(self):
+        self.titles()
+        self.assertEqual(self.titles(self.client_for(self.outsider)), [])
+        self.assertEqual(response_cache.stats.get(("project-issues", "hit")), None)
+
+    @override_settings(RESPONSE_CACHE_TIMEOUT=0)
+    def test_disabled(self):
+        self.titles()
+        self.titles()
+        self.assertEqual(response_cache.stats, {})
+
+    def test_filled_from_primary(self):
+        routed = []
+
+        class ListView:
+            def list(self, request, *args, **kwargs):
+                routed.append(use_replica.get())
+                return Response([])
+
+        class CachedView(CachedListMixin, ListView):
+            basename = "cached"
+
+            def get_list_cache_versions(self):
+                return [1]
+
+        request = APIRequestFactory().get("/")
+        request.user = self.author
+        token = use_replica.set(True)
+        try:
+            CachedView().list(request)
+            CachedView().list(request)
+        finally:
+            use_replica.reset(token)
+        # Lue une seule fois, sur la base principale, puis servie par le cache
+        self.assertEqual(routed, [False])
+
+
+class FastJSONTests(SoftdeskTestCase):
+    """
+    FastJSONRenderer et FastJSONParser produisent exactement les mêmes résultats
+    que JSONRenderer et JSONParser de DRF.
+    """
+
+    data = {
+        "id": uuid.uuid4(),
+        "created_time": datetime(
+            2024, 5, 1, 12, 30, 15, 123456, tzinfo=dt_timezone.utc
+        ),
+        "naive": datetime(2024, 5, 1, 12, 30),
+        "date": date(2024, 5, 1),
+        "time": time(8, 15, 30, 500),
+        "decimal": Decimal("12.50"),
+        "float": 1e-7,
+        "big": 2**70,
+        "text": "accentué \u2028 \u2029 \U0001f600 </script>",
+        "lazy": gettext_lazy("Bonjour"),
+        "nested": [{1: "clé entière"}, None, True, [1.5, "x"]],
+    }
+
+    def render(self, renderer_class, data, media_type="application/json"):
+        return renderer_class().render(data, media_type, {})
+
+    def test_renderer_parity(self):
+        cases = [self.data, {"only": "strings", "n": [1, 2, None]}, [], {}, None]
+        for data in cases:
+            with self.subTest(data=data):
+                expected = self.render(JSONRenderer, data)
+                self.assertEqual(self.render(FastJSONRenderer, data), expected)
+                indented = "application/json; indent=4"
+                self.assertEqual(
+                    self.render(FastJSONRenderer, data, indented),
+                    self.render(JSONRenderer, data, indented),
+                )
+                with mock.patch("softdesk.renderers.orjson", None):
+                    self.assertEqual(self.render(FastJSONRenderer, data), expected)
+
+    def test_issue_page_parity(self):
+        for n in range(30):
+            self.create_issue(title=f"Issue {n}", description="é\u2028")
+        data = IssueSerializer(Issue.objects.all(), many=True).data
+        self.assertEqual(
+            self.render(FastJSONRenderer, data), self.render(JSONRenderer, data)
+        )
+
+    def parse(self, parser_class, body, encoding="utf-8"):
+        return parser_class().parse(
+            io.BytesIO(body), "application/json", {"encoding": encoding}
+        )
+
+    def test_parser_parity(self):
+        bodies = [
+            b'{"title": "Issue", "n": 1, "ok": true, "none": null}',
+            b'{"float": 1.5, "exp": 1e400, "big": 123456789012345678901234567890}',
+            '{"texte": "accentué"}'.encode(),
+            b"[]",
+        ]
+        for body in bodies:
+            with self.subTest(body=body):
+                self.assertEqual(
+                    self.parse(FastJSONParser, body), self.parse(JSONParser, body)
+                )
+        latin1 = '{"texte": "accentué"}'.encode("latin-1")
+        self.assertEqual(
+            self.parse(FastJSONParser, latin1, "latin-1"),
+            self.parse(JSONParser, latin1, "latin-1"),
+        )
+
+    def test_parser_errors(self):
+        for body in (b"{", b'{"a": NaN}', b"\xff"):
+            with self.subTest(body=body):
+                with self.assertRaises(ParseError) as expected:
+                    self.parse(JSONParser, body)
+                with self.assertRaises(ParseError) as raised:
+                    self.parse(FastJSONParser, body)
+                self.assertEqual(str(raised.exception), str(expected.exception))
+
+
+class ContributorBulkTests(SoftdeskTestCase):
+    """
+    Ajout et retrait groupés de contributeurs (/contributors/bulk/).
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.url = f"/api/projects/{self.project.pk}/contributors/bulk/"
+        self.users = User.objects.bulk_create(
+            User(username=f"user{n:02}", birth_date=date(1990, 1, 1)) for n in range(10)
+        )
+
+    def contributors(self):
+        return set(
+            Contributor.objects.filter(project=self.project).values_list(
+                "user__username", flat=True
+            )
+        )
+
+    def test_add(self):
+        response = self.client.post(
+            self.url, {"usernames": ["user00", "member", "user01"]}, format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["added"], ["user00", "user01"])
+        self.assertEqual(response.json()["already_contributors"], ["member"])
+        self.assertEqual(self.contributors(), {"author", "member", "user00", "user01"})
+        detail = f"/api/projects/{self.project.pk}/"
+        self.assertEqual(self.client_for(self.users[0]).get(detail).status_code, 200)
+
+    def test_constant_queries(self):
+        def add(usernames):
+            with CaptureQueriesContext(connection) as captured:
+                response = self.client.post(
+                    self.url, {"usernames": usernames}, format="json"
+                )
+            self.assertEqual(response.status_code, 201)
+            return len(captured)
+
+        self.assertEqual(add(["user00"]), add([f"user{n:02}" for n in range(1, 10)]))
+
+    def test_unknown_usernames(self):
+        response = self.client.post(
+            self.url, {"usernames": ["user00", "inconnu"]}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"unknown_usernames": ["inconnu"]})
+        self.assertEqual(self.contributors(), {"author", "member"})
+
+    def test_author_only(self):
+        response = self.client_for(self.member).post(
+            self.url, {"usernames": ["user00"]}, format="json"
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_remove(self):
+        issue = self.create_issue(assignee=self.member)
+        member = self.client_for(self.member)
+        detail = f"/api/projects/{self.project.pk}/"
+        self.assertEqual(member.get(detail).status_code, 200)
+        response = self.client.delete(
+            self.url, {"usernames": ["member"]}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.contributors(), {"author"})
+        issue.refresh_from_db()
+        self.assertIsNone(issue.assignee)
+        self.assertEqual(member.get(detail).status_code, 404)
+
+    def test_author_not_removed(self):
+        response = self.client.delete(
+            self.url, {"usernames": ["author", "member"]}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.contributors(), {"author", "member"})
+
+
+class ChangeLogTests(SoftdeskTestCase):
+    """
+    Journal des modifications et flux de synchronisation /changes/.
+    """
+
+    def changes(self, since=0):
+        response = self.client.get(
+            f"/api/projects/{self.project.pk}/changes/?since={since}"
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_changes(self):
+        cursor = self.changes()["cursor"]
+        kept = self.create_issue(title="Gardée")
+        removed = self.create_issue(title="Supprimée")
+        removed_pk = removed.pk
+        removed.delete()
+        data = self.changes(cursor)
+        self.assertEqual(
+            [issue["id"] for issue in data["issues"]["changed"]], [str(kept.pk)]
+        )
+        self.assertEqual(data["issues"]["deleted"], [str(removed_pk)])
+        self.assertEqual(self.changes(data["cursor"])["issues"]["changed"], [])
+
+    def test_record_rejects_unsaved(self):
+        # bulk_create(ignore_conflicts=True) ne renvoie pas les identifiants.
+        (contributor,) = Contributor.objects.bulk_create(
+            [Contributor(project=self.project, user=self.outsider)],
+            ignore_conflicts=True,
+        )
+        with self.assertRaises(ValueError):
+            changelog.record(Contributor, ChangeLogEntry.CREATED, [contributor])
+        self.assertFalse(ChangeLogEntry.objects.filter(object_id="None").exists())
+
+    def test_invalid_ids_ignored(self):
+        issue = self.create_issue()
+        contributor = Contributor.objects.get(project=self.project, user=self.member)
+        for model, object_id, action in (
+            ("issue", "None", ChangeLogEntry.UPDATED),
+            ("issue", "pas-un-uuid", ChangeLogEntry.DELETED),
+            ("contributor", "None", ChangeLogEntry.DELETED),
+            ("contributor", "abc", ChangeLogEntry.UPDATED),
+        ):
+            ChangeLogEntry.objects.create(
+                project=self.project, model=model, object_id=object_id, action=action
+            )
+        contributor.save()
+        data = self.changes()
+        self.assertEqual(
+            [item["id"] for item in data["issues"]["changed"]], [str(issue.pk)]
+        )
+        self.assertEqual(data["issues"]["deleted"], [])
+        self.assertEqual(data["contributors"]["deleted"], [])
+        self.assertIn(
+            contributor.pk, [item["id"] for item in data["contributors"]["changed"]]
+        )
+
+
+class EventTests(SoftdeskTestCase):
+    """
+    Événements temps réel des projets et flux Server-Sent Events
+    (/api/async/events/).
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.async_client = AsyncClient()
+        self.token = self.client.post("/api/events/token/").json()["token"]
+
+    def published(self, write):
+        """
+        Exécute l'écriture et retourne les types des événements publiés à la
+        validation de la transaction.
+        """
+        with mock.patch.object(broker, "publish") as publish:
+            with self.captureOnCommitCallbacks() as callbacks:
+                write()
+            publish.assert_not_called()
+            for callback in callbacks:
+                callback()
+        return [event.type for call in publish.call_args_list for event in call[0][0]]
+
+    def test_published_on_commit(self):
+        issue = self.create_issue()
+        issue = Issue.objects.get(pk=issue.pk)
+        self.assertEqual(self.published(self.create_issue), ["issue.created"])
+
+        def change_status():
+            issue.status = "Done"
+            issue.save()
+
+        self.assertEqual(self.published(change_status), ["issue.status_changed"])
+        self.assertEqual(
+            self.published(
+                lambda: Comment.objects.create(
+                    issue=issue, author=self.author, content="Commentaire"
+                )
+            ),
+            ["comment.created"],
+        )
+
+    async def read(self, content):
+        async with asyncio.timeout(5):
+            return (await anext(content)).decode()
+
+    async def test_stream(self):
+        response = await self.async_client.get(
+            f"/api/async/events/?access_token={self.token}"
+        )
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        content = response.streaming_content
+        self.assertEqual(await self.read(content), "retry: 5000\n\n")
+
+        other = uuid.uuid4()
+        broker.publish(
+            [
+                Event(project_topic(other), "issue.created", {"project": str(other)}),
+                Event(
+                    project_topic(self.project.pk),
+                    "issue.created",
+                    {"project": str(self.project.pk)},
+                ),
+            ]
+        )
+        # Seul l'événement du projet de l'utilisateur est remis.
+        self.assertEqual(
+            await self.read(content),
+            f'event: issue.created\ndata: {{"project":"{self.project.pk}"}}\n\n',
+        )
+        await content.aclose()
+
+    async def test_access(self):
+        url = f"/api/async/events/?access_token={self.token}&project="
+        response = await self.async_client.get(f"{url}{uuid.uuid4()}")
+        self.assertEqual(response.status_code, 404)
+        response = await self.async_client.get(f"{url}invalide")
+        self.assertEqual(response.status_code, 400)
+        response = await self.async_client.get("/api/async/events/")
+        self.assertEqual(response.status_code, 401)
+
+    async def test_stream_token(self):
+        # Seul un jeton de flux est accepté dans l'URL.
+        access = RefreshToken.for_user(self.author).access_token
+        response = await self.async_client.get(
+            f"/api/async/events/?access_token={access}"
+        )
+        self.assertEqual(response.status_code, 401)
+        expired = EventStreamToken.for_user(self.author)
+        expired.set_exp(lifetime=-timedelta(seconds=1))
+        response = await self.async_client.get(
+            f"/api/async/events/?access_token={expired}"
+        )
+        self.assertEqual(response.status_code, 401)
+        # Le jeton de flux n'ouvre pas les autres routes.
+        response = await self.async_client.get(
+            "/api/async/projects/", headers={"Authorization": f"Bearer {self.token}"}
+        )
+        self.assertEqual(response.status_code, 401)
+        response = await sync_to_async(APIClient().get)(
+            "/api/projects/", HTTP_AUTHORIZATION=f"Bearer {self.token}"
+        )
+        self.assertEqual(response.status_code, 401)
+
+    @override_settings(EVENTS_QUEUE_SIZE=2)
+    async def test_slow_client_reset(self):
+        subscription = broker.subscribe(["topic"])
+        broker.publish(Event("topic", "test", {}) for _ in range(3))
+        await asyncio.sleep(0)
+        self.assertIsNone(await subscription.get())
+        self.assertNotIn(subscription, broker.subscribers.get("topic", ()))
+        subscription.close()
+
+
+@override_settings(DELETION_BATCH_SIZE=2, DELETION_BATCH_PAUSE=0)
+class DeletionTests(SoftdeskTestCase):
+    """
+    Suppression des projets en arrière-plan, par lots (api.deletion).
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.issues = [self.create_issue(title=f"Issue {n}") for n in range(3)]
+        for issue in self.issues[:2]:
+            for n in range(3):
+                Comment.objects.create(issue=issue, author=self.author, content=str(n))
+        self.detail = f"/api/projects/{self.project.pk}/"
+
+    def delete_project(self):
+        response = self.client.delete(self.detail)
+        self.assertEqual(response.status_code, 202)
+        return response.json()
+
+    def test_hidden_immediately(self):
+        job = self.delete_project()
+        self.assertEqual(job["status"], DeletionJob.PENDING)
+        self.assertEqual(
+            (job["issues_total"], job["comments_total"], job["contributors_total"]),
+            (3, 6, 2),
+        )
+        self.assertEqual(self.client.get(self.detail).status_code, 404)
+        self.assertEqual(self.client.get("/api/projects/").json()["count"], 0)
+        self.assertEqual(self.client.get(self.issues_url()).status_code, 404)
+        # Rien n'est supprimé dans la requête.
+        self.assertEqual(Comment.objects.count(), 6)
+
+    def test_purge(self):
+        job = self.delete_project()
+        deletion.run_pending_jobs()
+        self.assertFalse(Project.objects.filter(pk=self.project.pk).exists())
+        self.assertEqual(Issue.objects.count(), 0)
+        self.assertEqual(Comment.objects.count(), 0)
+        self.assertEqual(Contributor.objects.count(), 0)
+        self.assertFalse(ChangeLogEntry.objects.exists())
+        job = self.client.get(f"/api/deletions/{job['id']}/").json()
+        self.assertEqual(job["status"], DeletionJob.DONE)
+        self.assertEqual(job["progress"], 100)
+        self.assertEqual((job["issues_deleted"], job["comments_deleted"]), (3, 6))
+
+    def test_author_only(self):
+        response = self.client_for(self.member).delete(self.detail)
+        self.assertEqual(response.status_code, 403)
+        job = self.delete_project()
+        member = self.client_for(self.member)
+        self.assertEqual(member.get("/api/deletions/").json()["count"], 0)
+        self.assertEqual(member.get(f"/api/deletions/{job['id']}/").status_code, 404)
+
+    def test_failure_and_retry(self):
+        job = self.delete_project()
+        with mock.patch.object(deletion, "purge", side_effect=RuntimeError("panne")):
+            with self.assertLogs("api.deletion", "ERROR"):
+                deletion.run_pending_jobs()
+        job = DeletionJob.objects.get(pk=job["id"])
+        self.assertEqual((job.status, job.error), (DeletionJob.FAILED, "panne"))
+        call_command("purge_deleted_projects", retry_failed=True, stdout=io.StringIO())
+        job.refresh_from_db()
+        self.assertEqual(job.status, DeletionJob.DONE)
+        self.assertFalse(Project.objects.filter(pk=self.project.pk).exists())
+
+    def test_issue_comments_batched(self):
+        issue = self.issues[0]
+        response = self.client.delete(f"{self.issues_url()}{issue.pk}/")
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(Comment.objects.filter(issue_id=issue.pk).exists())
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.issue_count, 2)
+
+
+@override_settings(
+    REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK,
+        "DEFAULT_THROTTLE_RATES": {
+            **settings.REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"],
+            "write": "2/min",
+        },
+    }
+)
+class WriteThrottleTests(SoftdeskTestCase):
+    """
+    Limite des écritures par utilisateur et par route (WriteThrottle).
+    """
+
+    def create(self, client=None):
+        return (client or self.client).post(
+            self.issues_url(),
+            {"title": "Nouvelle", "description": "D", "project": str(self.project.pk)},
+            format="json",
+        )
+
+    def test_writes_limited_per_route_and_user(self):
+        for _ in range(2):
+            self.assertEqual(self.create().status_code, 201)
+        response = self.create()
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+        # Les lectures, les autres routes et les autres utilisateurs ont leur
+        # propre budget.
+        self.assertEqual(self.client.get(self.issues_url()).status_code, 200)
+        issue = self.create_issue()
+        response = self.client.post(
+            self.comments_url(issue),
+            {"content": "Commentaire", "issue": str(issue.pk)},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.create(self.client_for(self.member)).status_code, 201)
+
+
+class ProjectStatisticsTests(SoftdeskTestCase):
+    """
+    Tables de synthèse des statistiques (api.stats) tenues à jour par les
+    écritures groupées.
+    """
+
+    def snapshot(self):
+        return (
+            set(
+                IssueStatistic.objects.filter(issue_count__gt=0).values_list(
+                    "project_id",
+                    "status",
+                    "priority",
+                    "tag",
+                    "assignee_id",
+                    "issue_count",
+                )
+            ),
+            set(
+                CommentActivity.objects.filter(comment_count__gt=0).values_list(
+                    "project_id", "day", "comment_count"
+                )
+            ),
+        )
+
+    def test_bulk_comments_counted(self):
+        issue = self.create_issue()
+        comments = Comment.objects.bulk_create(
+            [
+                Comment(issue=issue, author=self.author, content=f"Commentaire {n}")
+                for n in range(3)
+            ]
+        )
+        post_bulk_save.send(
+            sender=Comment, instances=comments, created=True, update_fields=None
+        )
+        activity = CommentActivity.objects.get(project=self.project)
+        self.assertEqual(activity.comment_count, 3)
+        # Identique au recalcul complet, et décrémentable sans passer sous zéro.
+        counted = self.snapshot()
+        stats.rebuild()
+        self.assertEqual(self.snapshot(), counted)
+        for comment in comments:
+            comment.delete()
+        activity = CommentActivity.objects.get(project=self.project)
+        self.assertEqual(activity.comment_count, 0)
+
+
+class StatisticsMigrationTests(TransactionTestCase):
+    """
+    La migration qui ajoute les tables de synthèse les initialise sur les données
+    existantes.
+    """
+
+    before = [("api", "0007_deletion")]
+    after = [("api", "0008_project_statistics")]
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_backfill(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.before)
+        apps = executor.loader.project_state(self.before).apps
+        User = apps.get_model("users", "User")
+        Project = apps.get_model("api", "Project")
+        Issue = apps.get_model("api", "Issue")
+        Comment = apps.get_model("api", "Comment")
+        user = User.objects.create(username="author", birth_date=date(1990, 1, 1))
+        project = Project.objects.create(
+            title="P", description="D", type="Backend", author=user
+        )
+        issues = [
+            Issue.objects.create(
+                title="I",
+                description="D",
+                status=status,
+                priority="LOW",
+                tag="BUG",
+                project=project,
+                author=user,
+            )
+            for status in ("To Do", "Done", "Done")
+        ]
+        Comment.objects.create(issue=issues[0], author=user, content="C")
+        Comment.objects.create(issue=issues[1], author=user, content="C")
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.after)
+        apps = executor.loader.project_state(self.after).apps
+        statistics = apps.get_model("api", "IssueStatistic").objects.filter(
+            project_id=project.pk
+        )
+        self.assertEqual(
+            dict(statistics.values_list("status", "issue_count")),
+            {"To Do": 1, "Done": 2},
+        )
+        activity = apps.get_model("api", "CommentActivity").objects.get(
+            project_id=project.pk
+        )
+        self.assertEqual(activity.comment_count, 2)
@@ -1,10 +1,19 @@
 from django.urls import path, include
 from rest_framework_nested import routers
-from .views import ProjectViewSet, IssueViewSet, CommentViewSet, ContributorViewSet
+from .views import (
+    ProjectViewSet,
+    IssueViewSet,
+    CommentViewSet,
+    ContributorViewSet,
+    DeletionJobViewSet,
+    EventTokenView,
+    SearchView,
+)
 
 # Router principal pour les projets
 router = routers.DefaultRouter()
 router.register(r"projects", ProjectViewSet, basename="project")
+router.register(r"deletions", DeletionJobViewSet, basename="deletion")
 
 # Router imbriqué pour les ressources liées à un projet (contributeurs et issues)
 projects_router = routers.NestedDefaultRouter(router, r"projects", lookup="project")
@@ -21,4 +30,6 @@ urlpatterns = [
     path("", include(router.urls)),
     path("", include(projects_router.urls)),
     path("", include(issues_router.urls)),
+    path("search/", SearchView.as_view(), name="search"),
+    path("events/token/", EventTokenView.as_view(), name="event-token"),
 ]
@@ -1,19 +1,57 @@
-from rest_framework.viewsets import ModelViewSet
+import uuid
+
+from django.conf import settings
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, PermissionDenied, ValidationError
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.exceptions import PermissionDenied
-from .models import Project, Issue, Comment, Contributor
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.views import APIView
+from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet
+from softdesk.mixins import (
+    AtomicWriteMixin,
+    CachedListMixin,
+    ConditionalGetMixin,
+    InstrumentedViewMixin,
+    SparseFieldsetMixin,
+)
+from softdesk.throttling import WriteThrottle
+from .models import Project, Issue, Comment, Contributor, DeletionJob, User
 from .serializers import (
     ProjectSerializer,
     ProjectListSerializer,
     IssueSerializer,
+    IssueBulkItemSerializer,
     CommentSerializer,
     ContributorSerializer,
+    ContributorBulkSerializer,
+    DeletionJobSerializer,
+    with_contributor_preview,
 )
 from .permissions import IsAuthorOrReadOnly, IsProjectAuthor
+from . import changelog, deletion, stats
+from .cache import get_project_versions
+from .events import EventStreamToken
+from .export import iter_ndjson, iter_project_records
+from . import search
+from .filters import IssueFilterBackend
 from .mixins import ContributorPermissionMixin, ProjectContextMixin, IssueContextMixin
+from .pagination import OptInCursorPagination
+from .signals import post_bulk_delete, post_bulk_save
 
 
-class ProjectViewSet(ModelViewSet):
+class ProjectViewSet(
+    InstrumentedViewMixin,
+    AtomicWriteMixin,
+    ConditionalGetMixin,
+    CachedListMixin,
+    SparseFieldsetMixin,
+    ModelViewSet,
+):
     """
     ViewSet pour gérer les projets.
 
@@ -23,6 +61,7 @@ class ProjectViewSet(ModelViewSet):
     """
 
     permission_classes = [IsAuthenticated, IsAuthorOrReadOnly]
+    throttle_classes = [WriteThrottle]
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -33,11 +72,25 @@ class ProjectViewSet(ModelViewSet):
         """
         Retourne la liste des projets auxquels l'utilisateur authentifié contribue.
         """
-        return (
-            Project.objects.filter(contributors=self.request.user)
+        queryset = (
+            Project.objects.filter(contributors=self.request.user, pending_delete=False)
             .order_by("created_time")
-            .prefetch_related("contributors")
+            .select_related("author")
+        )
+        if self.action in ("list", "export", "changes", "stats"):
+            return queryset
+        return with_contributor_preview(queryset)
+
+    def get_list_cache_versions(self):
+        """
+        La liste dépend de l'ensemble des projets de l'utilisateur et de leurs versions.
+        """
+        project_ids = sorted(
+            Contributor.objects.filter(
+                user=self.request.user, project__pending_delete=False
+            ).values_list("project_id", flat=True)
         )
+        return [*project_ids, *get_project_versions(project_ids)]
 
     def perform_create(self, serializer):
         """
@@ -47,9 +100,133 @@ class ProjectViewSet(ModelViewSet):
         """
         project = serializer.save(author=self.request.user)
         Contributor.objects.create(user=self.request.user, project=project)
+        # L'auteur est le seul contributeur : inutile de relire la liste en base.
+        project.contributor_preview = [self.request.user]
+        project.contributor_count = 1
+
+    def destroy(self, request, *args, **kwargs):
+        """
+        Marque le projet comme en cours de suppression : il disparaît aussitôt de
+        toutes les vues, et ses issues, commentaires et contributeurs sont purgés
+        en arrière-plan (api.deletion). La réponse 202 décrit la tâche, dont la
+        progression se consulte sur /api/deletions/<id>/.
+        """
+        project = self.get_object()
+        with transaction.atomic():
+            job = deletion.schedule(project, request.user)
+        serializer = DeletionJobSerializer(job, context=self.get_serializer_context())
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=True, methods=["get"])
+    def export(self, request, pk=None):
+        """
+        Exporte le projet, ses contributeurs, ses issues et ses commentaires en NDJSON.
+
+        La réponse est diffusée en streaming (un enregistrement par ligne) et lue
+        par lots en base : la mémoire utilisée ne dépend pas de la taille du projet.
+        """
+        project = self.get_object()
+        response = StreamingHttpResponse(
+            iter_ndjson(iter_project_records(project)),
+            content_type="application/x-ndjson",
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="project-{project.pk}.ndjson"'
+        )
+        return response
+
+    @action(detail=True, methods=["get"])
+    def changes(self, request, pk=None):
+        """
+        Flux de synchronisation incrémentale du projet.
+
+        Renvoie les issues, commentaires et contributeurs créés ou modifiés depuis
+        le curseur `since` (état courant de chaque objet) et les identifiants des
+        objets supprimés (tombstones), avec le curseur à passer à l'appel suivant.
+        Sans `since`, seul le curseur courant est renvoyé : le client le lit avant
+        de télécharger les listes complètes, puis suit le flux à partir de lui.
+        """
+        project = self.get_object()
+        since = request.query_params.get("since")
+        if since is None:
+            changed, deleted = {}, {}
+            cursor, has_more = changelog.current_cursor(project), False
+        else:
+            try:
+                since = int(since)
+                if since < 0:
+                    raise ValueError
+            except ValueError:
+                raise ValidationError({"since": "Curseur invalide."})
+            changed, deleted, cursor, has_more = changelog.read_changes(
+                project, since, settings.CHANGELOG_PAGE_SIZE
+            )
 
+        data = {"cursor": str(cursor), "has_more": has_more}
+        context = self.get_serializer_context()
+        for name, queryset, serializer_class in (
+            (
+                "issue",
+                Issue.objects.filter(project=project).select_related(
+                    "author", "assignee"
+                ),
+                IssueSerializer,
+            ),
+            (
+                "comment",
+                Comment.objects.filter(issue__project=project).select_related("author"),
+                CommentSerializer,
+            ),
+            (
+                "contributor",
+                Contributor.objects.filter(project=project).select_related("user"),
+                ContributorSerializer,
+            ),
+        ):
+            ids = changelog.parse_ids(queryset.model, changed.get(name, []))
+            objects = queryset.filter(pk__in=ids).order_by() if ids else []
+            data[f"{name}s"] = {
+                "changed": serializer_class(objects, many=True, context=context).data,
+                "deleted": changelog.parse_ids(queryset.model, deleted.get(name, [])),
+            }
+        return Response(data)
 
-class IssueViewSet(ProjectContextMixin, ContributorPermissionMixin, ModelViewSet):
+    @action(detail=True, methods=["get"])
+    def stats(self, request, pk=None):
+        """
+        Statistiques du projet : issues par statut, priorité, tag et assigné, et
+        commentaires par jour sur les `days` derniers jours.
+
+        Lues dans les tables de synthèse tenues à jour à chaque écriture (api.stats) :
+        le nombre de requêtes et le temps de réponse ne dépendent pas du nombre
+        d'issues du projet.
+        """
+        project = self.get_object()
+        days = request.query_params.get("days", settings.PROJECT_STATS_DAYS)
+        try:
+            days = int(days)
+            if not 1 <= days <= settings.PROJECT_STATS_MAX_DAYS:
+                raise ValueError
+        except ValueError:
+            raise ValidationError(
+                {
+                    "days": "Nombre de jours entre 1 et "
+                    f"{settings.PROJECT_STATS_MAX_DAYS} attendu."
+                }
+            )
+        return Response(stats.project_stats(project, days))
+
+
+class IssueViewSet(
+    InstrumentedViewMixin,
+    AtomicWriteMixin,
+    ConditionalGetMixin,
+    CachedListMixin,
+    SparseFieldsetMixin,
+    ProjectContextMixin,
+    ContributorPermissionMixin,
+    ModelViewSet,
+):
     """
     ViewSet pour gérer les tickets (issues) liés aux projets.
 
@@ -59,6 +236,9 @@ class IssueViewSet(ProjectContextMixin, ContributorPermissionMixin, ModelViewSet
 
     serializer_class = IssueSerializer
     permission_classes = [IsAuthenticated, IsAuthorOrReadOnly]
+    throttle_classes = [WriteThrottle]
+    pagination_class = OptInCursorPagination
+    filter_backends = [IssueFilterBackend]
 
     def get_queryset(self):
         """
@@ -68,14 +248,17 @@ class IssueViewSet(ProjectContextMixin, ContributorPermissionMixin, ModelViewSet
         project = (
             self.get_project()
         )  # Utilisation du mixin pour récupérer l'objet projet
+        if not self.is_project_contributor(project):
+            return Issue.objects.none()
         return (
-            Issue.objects.filter(
-                project=project, project__contributors=self.request.user
-            )
-            .order_by("created_time")
+            Issue.objects.filter(project=project)
+            .order_by("created_time", "id")
             .select_related("project", "author", "assignee")
         )
 
+    def get_list_cache_versions(self):
+        return get_project_versions([self.get_project().pk])
+
     def perform_create(self, serializer):
         """
         Crée un ticket pour un projet auquel l'utilisateur contribue.
@@ -84,8 +267,152 @@ class IssueViewSet(ProjectContextMixin, ContributorPermissionMixin, ModelViewSet
         self.check_project_permission(project)
         serializer.save(author=self.request.user, project=project)
 
+    def perform_destroy(self, instance):
+        """
+        Supprime les commentaires du ticket par lots, sans charger ni signaler
+        chaque commentaire, puis le ticket lui-même.
+        """
+        deletion.delete_comments(instance)
+        instance.delete()
+
+    @action(detail=False, methods=["post", "patch"], url_path="bulk")
+    def bulk(self, request, project_pk=None):
+        """
+        Crée (POST) ou met à jour partiellement (PATCH) plusieurs tickets en une
+        requête.
+
+        Le corps est une liste de tickets ; en PATCH chaque élément porte son 'id'.
+        Les assignés sont validés en une seule requête IN sur les contributeurs du
+        projet, puis les tickets sont écrits avec bulk_create / bulk_update dans une
+        seule transaction. Si un élément est invalide, rien n'est écrit et les erreurs
+        sont renvoyées par élément, avec leur index dans la liste.
+        """
+        project = self.get_project()
+        self.check_project_permission(project)
+
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise ValidationError("Une liste non vide de tickets est attendue.")
+        if len(items) > settings.BULK_MAX_ITEMS:
+            raise ValidationError(
+                f"Au plus {settings.BULK_MAX_ITEMS} tickets par requête."
+            )
+
+        partial = request.method == "PATCH"
+        errors = {}
+        validated = []
+        for index, item in enumerate(items):
+            serializer = IssueBulkItemSerializer(data=item, partial=partial)
+            if not serializer.is_valid():
+                errors[index] = serializer.errors
+            elif partial and "id" not in serializer.validated_data:
+                errors[index] = {"id": ["Ce champ est obligatoire."]}
+            validated.append(serializer.validated_data if index not in errors else {})
+
+        # Résolution de tous les assignés en une requête sur les contributeurs du projet
+        usernames = {data["assignee"] for data in validated if data.get("assignee")}
+        assignees = {
+            user.username: user
+            for user in User.objects.filter(
+                contributions__project=project, username__in=usernames
+            ).only("id", "username")
+        }
+        for index, data in enumerate(validated):
+            username = data.get("assignee")
+            if username and username not in assignees:
+                errors.setdefault(index, {})["assignee"] = [
+                    "L'utilisateur assigné doit être contributeur du projet."
+                ]
 
-class CommentViewSet(IssueContextMixin, ContributorPermissionMixin, ModelViewSet):
+        if partial:
+            issues = (
+                Issue.objects.filter(
+                    project=project,
+                    pk__in=[data["id"] for data in validated if "id" in data],
+                )
+                .select_related("author", "assignee")
+                .in_bulk()
+            )
+            for index, data in enumerate(validated):
+                if "id" not in data:
+                    continue
+                issue = issues.get(data["id"])
+                if issue is None:
+                    errors.setdefault(index, {})["id"] = ["Ticket introuvable."]
+                elif issue.author_id != request.user.id:
+                    errors.setdefault(index, {})["id"] = [
+                        "Seul l'auteur peut modifier ce ticket."
+                    ]
+
+        if errors:
+            return Response(
+                {
+                    "errors": [
+                        {"index": index, "errors": item_errors}
+                        for index, item_errors in sorted(errors.items())
+                    ]
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        for data in validated:
+            if "assignee" in data:
+                data["assignee"] = assignees.get(data["assignee"])
+
+        with transaction.atomic():
+            if partial:
+                instances, fields = [], {"updated_time"}
+                now = timezone.now()
+                for data in validated:
+                    issue = issues[data.pop("id")]
+                    for field, value in data.items():
+                        setattr(issue, field, value)
+                    issue.updated_time = now
+                    fields.update(data)
+                    instances.append(issue)
+                if len(fields) > 1:
+                    Issue.objects.bulk_update(
+                        instances, fields, batch_size=settings.BULK_BATCH_SIZE
+                    )
+            else:
+                instances = [
+                    Issue(
+                        project=project,
+                        author=request.user,
+                        **{k: v for k, v in data.items() if k != "id"},
+                    )
+                    for data in validated
+                ]
+                fields = None
+                Issue.objects.bulk_create(
+                    instances, batch_size=settings.BULK_BATCH_SIZE
+                )
+            post_bulk_save.send(
+                sender=Issue,
+                instances=instances,
+                created=not partial,
+                update_fields=fields,
+            )
+
+        serializer = IssueSerializer(
+            instances, many=True, context=self.get_serializer_context()
+        )
+        return Response(
+            serializer.data,
+            status=status.HTTP_200_OK if partial else status.HTTP_201_CREATED,
+        )
+
+
+class CommentViewSet(
+    InstrumentedViewMixin,
+    AtomicWriteMixin,
+    ConditionalGetMixin,
+    CachedListMixin,
+    SparseFieldsetMixin,
+    IssueContextMixin,
+    ContributorPermissionMixin,
+    ModelViewSet,
+):
     """
     ViewSet pour gérer les commentaires associés aux tickets (issues).
 
@@ -94,20 +421,25 @@ class CommentViewSet(IssueContextMixin, ContributorPermissionMixin, ModelViewSet
 
     serializer_class = CommentSerializer
     permission_classes = [IsAuthenticated, IsAuthorOrReadOnly]
+    throttle_classes = [WriteThrottle]
+    pagination_class = OptInCursorPagination
 
     def get_queryset(self):
         """
         Retourne la liste des commentaires pour l'issue renseignée dans l'URL.
         """
         issue = self.get_issue()  # Utilisation du mixin pour récupérer l'objet issue
+        if not self.is_project_contributor(issue.project):
+            return Comment.objects.none()
         return (
-            Comment.objects.filter(
-                issue=issue, issue__project__contributors=self.request.user
-            )
-            .order_by("created_time")
+            Comment.objects.filter(issue=issue)
+            .order_by("created_time", "id")
             .select_related("issue", "author")
         )
 
+    def get_list_cache_versions(self):
+        return get_project_versions([self.get_issue().project_id])
+
     def perform_create(self, serializer):
         """
         Crée un commentaire pour une issue.
@@ -117,21 +449,33 @@ class CommentViewSet(IssueContextMixin, ContributorPermissionMixin, ModelViewSet
         serializer.save(author=self.request.user, issue=issue)
 
 
-class ContributorViewSet(ProjectContextMixin, ModelViewSet):
+class ContributorViewSet(
+    InstrumentedViewMixin,
+    AtomicWriteMixin,
+    SparseFieldsetMixin,
+    ProjectContextMixin,
+    ContributorPermissionMixin,
+    ModelViewSet,
+):
     """
     ViewSet pour gérer les contributeurs d'un projet.
 
+    Seuls les contributeurs du projet peuvent consulter la liste des contributeurs.
     Seul l'auteur du projet peut ajouter, modifier ou retirer des contributeurs.
     """
 
     serializer_class = ContributorSerializer
     permission_classes = [IsAuthenticated, IsProjectAuthor]
+    throttle_classes = [WriteThrottle]
+    pagination_class = OptInCursorPagination
 
     def get_queryset(self):
         project = self.get_project()  # Récupération de l'instance projet grâce au mixin
+        if not self.is_project_contributor(project):
+            return Contributor.objects.none()
         return (
             Contributor.objects.filter(project=project)
-            .order_by("created_time")
+            .order_by("created_time", "id")
             .select_related("project", "user")
         )
 
@@ -144,3 +488,213 @@ class ContributorViewSet(ProjectContextMixin, ModelViewSet):
                 "Seul l'auteur du projet peut ajouter des contributeurs."
             )
         serializer.save(project=project)
+
+    def perform_destroy(self, instance):
+        self.unassign_issues(instance.project_id, [instance.user_id])
+        instance.delete()
+
+    def unassign_issues(self, project_id, user_ids):
+        """
+        Désassigne les tickets du projet attribués aux contributeurs retirés : un
+        ancien contributeur ne peut plus être assigné.
+        """
+        issues = list(
+            Issue.objects.filter(project_id=project_id, assignee_id__in=user_ids).defer(
+                "description"
+            )
+        )
+        if not issues:
+            return
+        now = timezone.now()
+        Issue.objects.filter(pk__in=[issue.pk for issue in issues]).update(
+            assignee=None, updated_time=now
+        )
+        for issue in issues:
+            issue.assignee, issue.updated_time = None, now
+        post_bulk_save.send(
+            sender=Issue,
+            instances=issues,
+            created=False,
+            update_fields=["assignee", "updated_time"],
+        )
+
+    @action(detail=False, methods=["post", "delete"], url_path="bulk")
+    def bulk(self, request, project_pk=None):
+        """
+        Ajoute (POST) ou retire (DELETE) plusieurs contributeurs en une requête.
+
+        Le corps contient la liste des noms d'utilisateur ('usernames'), résolus en
+        une seule requête IN ; si l'un d'eux est inconnu, rien n'est écrit et la
+        réponse liste les noms inconnus. L'ajout est un bulk_create qui ignore les
+        contributeurs déjà présents ; le retrait est une suppression ensembliste qui
+        désassigne aussi les tickets du projet attribués aux contributeurs retirés.
+        """
+        project = self.get_project()
+        if project.author_id != request.user.id:
+            raise PermissionDenied(
+                "Seul l'auteur du projet peut ajouter ou retirer des contributeurs."
+            )
+        serializer = ContributorBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        usernames = list(dict.fromkeys(serializer.validated_data["usernames"]))
+
+        users = {
+            user.username: user
+            for user in User.objects.filter(username__in=usernames).only(
+                "id", "username"
+            )
+        }
+        unknown = [username for username in usernames if username not in users]
+        if unknown:
+            return Response(
+                {"unknown_usernames": unknown}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if request.method == "DELETE":
+            return self.bulk_remove(project, list(users.values()))
+        return self.bulk_add(project, list(users.values()))
+
+    def bulk_add(self, project, users):
+        with transaction.atomic():
+            existing = set(
+                Contributor.objects.filter(project=project, user__in=users).values_list(
+                    "user_id", flat=True
+                )
+            )
+            added = [user for user in users if user.pk not in existing]
+            # ignore_conflicts couvre un ajout concurrent du même contributeur ;
+            # les identifiants ne sont alors pas renvoyés par la base et sont relus.
+            Contributor.objects.bulk_create(
+                [Contributor(project=project, user=user) for user in added],
+                batch_size=settings.BULK_BATCH_SIZE,
+                ignore_conflicts=True,
+            )
+            instances = list(
+                Contributor.objects.filter(project=project, user__in=added).only(
+                    "id", "user_id", "project_id"
+                )
+            )
+            post_bulk_save.send(
+                sender=Contributor,
+                instances=instances,
+                created=True,
+                update_fields=None,
+            )
+        return Response(
+            {
+                "added": [user.username for user in added],
+                "already_contributors": [
+                    user.username for user in users if user.pk in existing
+                ],
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+    def bulk_remove(self, project, users):
+        if any(user.pk == project.author_id for user in users):
+            raise ValidationError(
+                {"usernames": ["L'auteur du projet ne peut pas être retiré."]}
+            )
+        with transaction.atomic():
+            contributors = Contributor.objects.filter(project=project, user__in=users)
+            instances = list(contributors.only("id", "user_id", "project_id"))
+            self.unassign_issues(project.pk, [user.pk for user in users])
+            # Suppression en une requête, sans collecteur ni post_delete par ligne
+            contributors._raw_delete(contributors.db)
+            post_bulk_delete.send(sender=Contributor, instances=instances)
+        removed = {instance.user_id for instance in instances}
+        return Response(
+            {
+                "removed": [user.username for user in users if user.pk in removed],
+                "not_contributors": [
+                    user.username for user in users if user.pk not in removed
+                ],
+            }
+        )
+
+
+class SearchView(InstrumentedViewMixin, APIView):
+    """
+    Recherche plein texte dans les issues et les commentaires.
+
+    La recherche porte uniquement sur les projets auxquels l'utilisateur contribue
+    (paramètre optionnel `project` pour la limiter à un projet). Les résultats sont
+    classés par pertinence, paginés par `page` et accompagnés d'un extrait surligné.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        terms = request.query_params.get("q", "").strip()
+        if not terms:
+            raise ValidationError({"q": "Ce paramètre est obligatoire."})
+        if not search.search_available():
+            raise APIException("La recherche plein texte n'est pas disponible.")
+
+        project_id = request.query_params.get("project")
+        if project_id is not None:
+            try:
+                project_id = uuid.UUID(project_id)
+            except ValueError:
+                raise ValidationError({"project": "Identifiant de projet invalide."})
+        try:
+            page = int(request.query_params.get("page", 1))
+        except ValueError:
+            page = 0
+        if page < 1:
+            raise ValidationError({"page": "Numéro de page invalide."})
+
+        page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+        results = search.search(
+            request.user,
+            terms,
+            limit=page_size + 1,
+            offset=(page - 1) * page_size,
+            project_id=project_id,
+        )
+        url = request.build_absolute_uri()
+        return Response(
+            {
+                "next": (
+                    replace_query_param(url, "page", page + 1)
+                    if len(results) > page_size
+                    else None
+                ),
+                "previous": (
+                    replace_query_param(url, "page", page - 1) if page > 1 else None
+                ),
+                "results": results[:page_size],
+            }
+        )
+
+
+class EventTokenView(InstrumentedViewMixin, APIView):
+    """
+    Délivre un jeton d'ouverture du flux d'événements (/api/async/events/), à
+    passer dans son paramètre `access_token`.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        return Response(
+            {
+                "token": str(EventStreamToken.for_user(request.user)),
+                "expires_in": settings.EVENTS_TOKEN_LIFETIME,
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class DeletionJobViewSet(InstrumentedViewMixin, ReadOnlyModelViewSet):
+    """
+    Suivi des suppressions de projets demandées par l'utilisateur.
+    """
+
+    serializer_class = DeletionJobSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return DeletionJob.objects.filter(requested_by=self.request.user).order_by(
+            "-id"
+        )
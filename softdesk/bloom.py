@@ -0,0 +1,52 @@
+"""
+Filtre de Bloom : ensemble probabiliste compact, sans faux négatifs.
+
+`key in bloom` est faux si la clé n'a jamais été ajoutée ; vrai si elle l'a été,
+ou, avec une probabilité proche de `error_rate` tant que le filtre ne dépasse
+pas `capacity` clés, par erreur (faux positif). Les positions des bits sont
+dérivées d'un seul hash blake2b (double hachage de Kirsch-Mitzenmacher). Le
+filtre n'est pas thread-safe en écriture : l'appelant sérialise les ajouts.
+"""
+
+import hashlib
+import math
+
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate=0.001):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.size = math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    def add(self, key):
+        for position in self.positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        bits = self.bits
+        return all(
+            bits[position >> 3] & (1 << (position & 7))
+            for position in self.positions(key)
+        )
+
+    def __len__(self):
+        """
+        Nombre de clés ajoutées (les doublons comptent plusieurs fois).
+        """
+        return self.count
+
+    def is_full(self):
+        return self.count > self.capacity
+
+    def memory_usage(self):
+        return len(self.bits)
@@ -0,0 +1,96 @@
+import hashlib
+import threading
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+
+from .metrics import registry
+
+RESPONSE_CACHE_PREFIX = "softdesk:response:"
+
+
+class ResponseCache:
+    """
+    Cache des données de réponse des listes (voir softdesk.mixins.CachedListMixin).
+
+    Les clés sont construites à partir de compteurs de version : une modification
+    n'efface aucune entrée, elle change la clé des lectures suivantes. Les succès
+    et échecs sont comptés par vue et exposés par /api/metrics/, avec la mémoire
+    occupée lorsque le cache est local au processus (LocMemCache).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stats = {}
+
+    def make_key(self, *parts):
+        digest = hashlib.md5("|".join(map(str, parts)).encode()).hexdigest()
+        return RESPONSE_CACHE_PREFIX + digest
+
+    def get(self, view, key):
+        data = cache.get(key)
+        self.count(view, "hit" if data is not None else "miss")
+        return data
+
+    def set(self, key, data):
+        cache.set(key, data, settings.RESPONSE_CACHE_TIMEOUT)
+
+    def count(self, view, result):
+        with self.lock:
+            self.stats[view, result] = self.stats.get((view, result), 0) + 1
+
+    def memory_usage(self):
+        """
+        Nombre d'entrées et taille (en octets, sérialisées) des réponses en cache,
+        ou None si le cache n'est pas local au processus.
+        """
+        backend = caches[DEFAULT_CACHE_ALIAS]
+        if not isinstance(backend, LocMemCache):
+            return None
+        with backend._lock:
+            sizes = [
+                len(value)
+                for key, value in backend._cache.items()
+                if RESPONSE_CACHE_PREFIX in key
+            ]
+        return len(sizes), sum(sizes)
+
+    def metrics(self):
+        lines = [
+            "# HELP softdesk_response_cache_requests_total "
+            "Lectures du cache de réponses.",
+            "# TYPE softdesk_response_cache_requests_total counter",
+        ]
+        with self.lock:
+            stats = dict(self.stats)
+        for (view, result), count in sorted(stats.items()):
+            lines.append(
+                f'softdesk_response_cache_requests_total{{view="{view}",'
+                f'result="{result}"}} {count}'
+            )
+        lines += [
+            "# HELP softdesk_response_cache_hit_ratio Proportion de succès du cache.",
+            "# TYPE softdesk_response_cache_hit_ratio gauge",
+        ]
+        for view in sorted({view for view, _ in stats}):
+            hits = stats.get((view, "hit"), 0)
+            total = hits + stats.get((view, "miss"), 0)
+            lines.append(
+                f'softdesk_response_cache_hit_ratio{{view="{view}"}} {hits / total}'
+            )
+        usage = self.memory_usage()
+        if usage is not None:
+            lines += [
+                "# HELP softdesk_response_cache_entries Réponses en cache.",
+                "# TYPE softdesk_response_cache_entries gauge",
+                f"softdesk_response_cache_entries {usage[0]}",
+                "# HELP softdesk_response_cache_bytes Taille des réponses en cache.",
+                "# TYPE softdesk_response_cache_bytes gauge",
+                f"softdesk_response_cache_bytes {usage[1]}",
+            ]
+        return lines
+
+
+response_cache = ResponseCache()
+registry.register(response_cache.metrics)
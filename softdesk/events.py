@@ -0,0 +1,288 @@
+"""
+Diffusion d'événements en temps réel vers les connexions ouvertes (Server-Sent Events).
+
+Le broker associe à chaque sujet (par exemple `project:<id>`) les abonnements
+ouverts par les vues de flux. Un abonnement est une file asyncio bornée, lue par
+la coroutine de sa connexion : une connexion inactive ne coûte ni thread ni
+requête SQL. Les événements sont publiés depuis du code synchrone (receivers de
+signaux, après validation de la transaction) et remis à chaque boucle asyncio
+par un seul call_soon_threadsafe par lot ; chaque événement est encodé une fois,
+quel que soit le nombre d'abonnés.
+
+Le transport entre processus est délégué à un backend (réglage EVENTS_BACKEND) :
+LocalBackend remet les événements dans le processus qui les publie ;
+DatabaseBackend les partage entre plusieurs workers par une table de la base.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.module_loading import import_string
+
+from .metrics import registry
+from .renderers import FastJSONRenderer
+
+
+class Event:
+    """
+    Événement publié sur un sujet. La trame SSE n'est encodée qu'une fois.
+    """
+
+    __slots__ = ("topic", "type", "data", "_frame")
+
+    def __init__(self, topic, type, data):
+        self.topic = topic
+        self.type = type
+        self.data = data
+        self._frame = None
+
+    @property
+    def frame(self):
+        if self._frame is None:
+            payload = FastJSONRenderer().render(self.data).decode()
+            self._frame = f"event: {self.type}\ndata: {payload}\n\n"
+        return self._frame
+
+
+class Subscription:
+    """
+    Abonnement d'une connexion à un ensemble de sujets.
+
+    La file est bornée (EVENTS_QUEUE_SIZE) : un client trop lent pour suivre est
+    décroché, get() renvoie alors None et le client doit se resynchroniser.
+    """
+
+    def __init__(self, broker, topics):
+        self.broker = broker
+        self.topics = set(topics)
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=settings.EVENTS_QUEUE_SIZE)
+        self.overflowed = False
+
+    def put(self, event):
+        """
+        Ajoute un événement à la file (dans la boucle de la connexion).
+        """
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            self.broker.unsubscribe(self, *self.topics)
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+    async def get(self):
+        return await self.queue.get()
+
+    def unsubscribe(self, *topics):
+        self.broker.unsubscribe(self, *topics)
+
+    def close(self):
+        self.broker.unsubscribe(self, *self.topics)
+
+
+class EventBroker:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscribers = defaultdict(set)
+        self.backend = None
+        self.published = 0
+        self.delivered = 0
+
+    def get_backend(self):
+        if self.backend is None:
+            with self.lock:
+                if self.backend is None:
+                    self.backend = import_string(settings.EVENTS_BACKEND)(self.deliver)
+        return self.backend
+
+    def subscribe(self, topics):
+        """
+        Ouvre un abonnement aux sujets donnés (dans une coroutine).
+        """
+        self.get_backend().start()
+        subscription = Subscription(self, topics)
+        with self.lock:
+            for topic in subscription.topics:
+                self.subscribers[topic].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription, *topics):
+        with self.lock:
+            for topic in topics:
+                subscription.topics.discard(topic)
+                subscribers = self.subscribers.get(topic)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self.subscribers[topic]
+
+    def publish(self, events):
+        """
+        Publie des événements via le backend configuré.
+        """
+        events = list(events)
+        if events:
+            self.published += len(events)
+            self.get_backend().publish(events)
+
+    def deliver(self, events):
+        """
+        Remet des événements aux abonnés de ce processus (depuis n'importe quel thread).
+        """
+        batches = defaultdict(list)
+        with self.lock:
+            for event in events:
+                for subscription in self.subscribers.get(event.topic, ()):
+                    batches[subscription.loop].append((subscription, event))
+        for loop, batch in batches.items():
+            self.delivered += len(batch)
+            try:
+                loop.call_soon_threadsafe(dispatch, batch)
+            except RuntimeError:
+                # Boucle fermée : ses connexions n'existent plus.
+                pass
+
+    def subscriber_count(self):
+        with self.lock:
+            return len(
+                {s for subscribers in self.subscribers.values() for s in subscribers}
+            )
+
+    def metrics(self):
+        return [
+            "# HELP softdesk_event_subscribers Connexions abonnées aux événements.",
+            "# TYPE softdesk_event_subscribers gauge",
+            f"softdesk_event_subscribers {self.subscriber_count()}",
+            "# HELP softdesk_events_published_total Événements publiés.",
+            "# TYPE softdesk_events_published_total counter",
+            f"softdesk_events_published_total {self.published}",
+            "# HELP softdesk_events_delivered_total Événements remis aux connexions.",
+            "# TYPE softdesk_events_delivered_total counter",
+            f"softdesk_events_delivered_total {self.delivered}",
+        ]
+
+
+def dispatch(batch):
+    for subscription, event in batch:
+        subscription.put(event)
+
+
+class LocalBackend:
+    """
+    Backend en mémoire : les événements ne sont remis qu'aux connexions du
+    processus qui les publie (un seul worker, ou tests).
+    """
+
+    def __init__(self, deliver):
+        self.deliver = deliver
+
+    def start(self):
+        pass
+
+    def publish(self, events):
+        self.deliver(events)
+
+
+class DatabaseBackend:
+    """
+    Backend partagé entre workers par une table SQLite (créée à la demande).
+
+    Chaque processus écrit ses événements dans la table ; dans les processus qui
+    ont des connexions ouvertes, un thread relit les nouvelles lignes toutes les
+    EVENTS_POLL_INTERVAL secondes, en une requête pour tous les abonnés, et les
+    remet au broker. Les lignes plus anciennes que EVENTS_RETENTION secondes
+    sont purgées.
+    """
+
+    table = "softdesk_events"
+
+    def __init__(self, deliver):
+        self.deliver = deliver
+        self.lock = threading.Lock()
+        self.thread = None
+        self.table_created = False
+        self.last_id = None
+
+    def cursor(self):
+        cursor = connections[DEFAULT_DB_ALIAS].cursor()
+        if not self.table_created:
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, topic TEXT NOT NULL, "
+                "type TEXT NOT NULL, data TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self.table_created = True
+        return cursor
+
+    def execute(self, sql, params=()):
+        with self.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+    def start(self):
+        with self.lock:
+            if self.thread is not None:
+                return
+            self.thread = threading.Thread(
+                target=self.poll, name="softdesk-events", daemon=True
+            )
+            self.thread.start()
+
+    def publish(self, events):
+        now = time.time()
+        with self.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {self.table} (topic, type, data, created) "
+                "VALUES (%s, %s, %s, %s)",
+                [
+                    (
+                        event.topic,
+                        event.type,
+                        FastJSONRenderer().render(event.data).decode(),
+                        now,
+                    )
+                    for event in events
+                ],
+            )
+
+    def poll(self):
+        # Appelé hors de la boucle asyncio : l'accès à la base y est permis.
+        rows = self.execute(f"SELECT COALESCE(MAX(id), 0) FROM {self.table}")
+        self.last_id = rows[0][0]
+        purged = time.monotonic()
+        while True:
+            time.sleep(settings.EVENTS_POLL_INTERVAL)
+            try:
+                rows = self.execute(
+                    f"SELECT id, topic, type, data FROM {self.table} "
+                    "WHERE id > %s ORDER BY id",
+                    [self.last_id],
+                )
+                if rows:
+                    self.last_id = rows[-1][0]
+                    self.deliver(
+                        Event(topic, type, json.loads(data))
+                        for _, topic, type, data in rows
+                    )
+                if time.monotonic() - purged > settings.EVENTS_RETENTION:
+                    self.execute(
+                        f"DELETE FROM {self.table} WHERE created < %s",
+                        [time.time() - settings.EVENTS_RETENTION],
+                    )
+                    purged = time.monotonic()
+            except Exception:
+                # Base momentanément indisponible : nouvel essai au tour suivant.
+                connections[DEFAULT_DB_ALIAS].close()
+
+
+broker = EventBroker()
+registry.register(broker.metrics)
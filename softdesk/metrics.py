@@ -0,0 +1,198 @@
+"""
+Instrumentation des requêtes : temps par phase et histogrammes par route.
+
+Les durées de la requête en cours (SQL, authentification, permissions,
+sérialisation, rendu) sont accumulées dans un objet RequestTimings porté par une
+ContextVar, renseignée par softdesk.middleware.ServerTimingMiddleware. Hors d'une
+requête instrumentée, ou lorsque PERFORMANCE_METRICS est désactivé, timer() ne
+mesure rien. Les phases peuvent se recouvrir : les requêtes SQL exécutées pendant
+l'authentification ou la sérialisation comptent aussi dans la phase `db`.
+
+Les histogrammes sont agrégés en mémoire, par processus.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+PHASES = ("db", "auth", "perm", "serialize", "render")
+
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+current_timings = ContextVar("current_timings", default=None)
+
+
+class RequestTimings:
+    """
+    Durées (en secondes) et nombre de requêtes SQL de la requête HTTP en cours.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.durations = dict.fromkeys(PHASES, 0.0)
+        self.queries = 0
+        self.active = set()
+
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+    def server_timing(self):
+        """
+        Valeur de l'en-tête Server-Timing (durées en millisecondes).
+        """
+        metrics = [
+            f"{name};dur={duration * 1000:.2f}"
+            + (f';desc="{self.queries} queries"' if name == "db" else "")
+            for name, duration in self.durations.items()
+        ]
+        metrics.append(f"total;dur={self.elapsed() * 1000:.2f}")
+        return ", ".join(metrics)
+
+
+@contextmanager
+def timer(phase):
+    """
+    Ajoute la durée du bloc à la phase donnée de la requête en cours.
+
+    Les blocs imbriqués d'une même phase (serializers imbriqués, par exemple)
+    ne sont comptés qu'une fois.
+    """
+    timings = current_timings.get()
+    if timings is None or phase in timings.active:
+        yield
+        return
+    timings.active.add(phase)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.durations[phase] += time.perf_counter() - start
+        timings.active.discard(phase)
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Wrapper d'exécution SQL (connection.execute_wrapper) comptant les requêtes
+    et leur durée dans la requête HTTP en cours.
+    """
+    timings = current_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.durations["db"] += time.perf_counter() - start
+        timings.queries += 1
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+class MetricsRegistry:
+    """
+    Histogrammes par route (nom d'URL) et méthode HTTP, exposés au format texte
+    Prometheus. D'autres composants peuvent y ajouter leurs métriques (register).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.durations = {}
+        self.queries = {}
+        self.responses = {}
+        self.collectors = []
+
+    def register(self, collector):
+        """
+        Ajoute une fonction renvoyant des lignes au format Prometheus à l'exposition.
+        """
+        self.collectors.append(collector)
+
+    def observe(self, route, method, status, timings):
+        """
+        Enregistre les mesures d'une requête terminée.
+
+        :param route: Nom de la route (par exemple `project-issues-list`).
+        :param method: Méthode HTTP.
+        :param status: Code de statut de la réponse.
+        :param timings: RequestTimings de la requête.
+        """
+        phases = {**timings.durations, "total": timings.elapsed()}
+        with self.lock:
+            for phase, duration in phases.items():
+                key = (route, method, phase)
+                if key not in self.durations:
+                    self.durations[key] = Histogram(DURATION_BUCKETS)
+                self.durations[key].observe(duration)
+            if (route, method) not in self.queries:
+                self.queries[route, method] = Histogram(QUERY_BUCKETS)
+            self.queries[route, method].observe(timings.queries)
+            key = (route, method, str(status))
+            self.responses[key] = self.responses.get(key, 0) + 1
+
+    def clear(self):
+        with self.lock:
+            self.durations.clear()
+            self.queries.clear()
+            self.responses.clear()
+
+    def render(self):
+        """
+        Retourne les métriques au format d'exposition texte de Prometheus.
+        """
+        lines = [
+            "# HELP softdesk_request_duration_seconds Durée des requêtes par phase.",
+            "# TYPE softdesk_request_duration_seconds histogram",
+        ]
+        with self.lock:
+            for (route, method, phase), histogram in sorted(self.durations.items()):
+                labels = f'route="{route}",method="{method}",phase="{phase}"'
+                lines += self.render_histogram(
+                    "softdesk_request_duration_seconds", labels, histogram
+                )
+            lines += [
+                "# HELP softdesk_db_queries Nombre de requêtes SQL par requête HTTP.",
+                "# TYPE softdesk_db_queries histogram",
+            ]
+            for (route, method), histogram in sorted(self.queries.items()):
+                labels = f'route="{route}",method="{method}"'
+                lines += self.render_histogram("softdesk_db_queries", labels, histogram)
+            lines += [
+                "# HELP softdesk_responses_total Nombre de réponses par statut.",
+                "# TYPE softdesk_responses_total counter",
+            ]
+            for (route, method, status), count in sorted(self.responses.items()):
+                lines.append(
+                    f'softdesk_responses_total{{route="{route}",method="{method}",'
+                    f'status="{status}"}} {count}'
+                )
+        for collector in self.collectors:
+            lines += collector()
+        return "\n".join(lines) + "\n"
+
+    def render_histogram(self, name, labels, histogram):
+        lines, cumulative = [], 0
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        cumulative += histogram.counts[-1]
+        lines += [
+            f'{name}_bucket{{{labels},le="+Inf"}} {cumulative}',
+            f"{name}_sum{{{labels}}} {histogram.sum}",
+            f"{name}_count{{{labels}}} {cumulative}",
+        ]
+        return lines
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,164 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from .metrics import RequestTimings, current_timings, record_query, registry
+from .routers import (
+    REPLICA_DB_ALIAS,
+    is_pinned_to_primary,
+    pin_to_primary,
+    use_replica,
+)
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """
+    Installe le compteur de requêtes SQL sur chaque nouvelle connexion, y compris
+    celles des threads utilisés par l'ORM asynchrone.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class ServerTimingMiddleware:
+    """
+    Mesure chaque requête (SQL, authentification, permissions, sérialisation,
+    rendu), ajoute l'en-tête Server-Timing à la réponse et alimente les
+    histogrammes par route de softdesk.metrics.registry (exposés par /api/metrics/).
+
+    Activé par le réglage PERFORMANCE_METRICS ; sinon le middleware se retire de
+    la chaîne au démarrage et aucune mesure n'est effectuée.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PERFORMANCE_METRICS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        connection_created.connect(install_query_recorder)
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(sender=None, connection=connection)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_timings.reset(token)
+        return self.finish(request, response, timings)
+
+    async def __acall__(self, request):
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_timings.reset(token)
+        return self.finish(request, response, timings)
+
+    def process_template_response(self, request, response):
+        """
+        Mesure le rendu différé des réponses DRF (JSONRenderer...).
+        """
+        timings = current_timings.get()
+        if timings is None:
+            return response
+        start = time.perf_counter()
+
+        def rendered(response):
+            timings.durations["render"] += time.perf_counter() - start
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    def finish(self, request, response, timings):
+        match = request.resolver_match
+        route = match.view_name if match else "unresolved"
+        response["Server-Timing"] = timings.server_timing()
+        registry.observe(route, request.method, response.status_code, timings)
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Autorise les lectures sur le réplica pendant les requêtes de lecture
+    (voir softdesk.routers), sauf pour un utilisateur venant d'écrire.
+
+    L'utilisateur est identifié par la revendication du jeton JWT, sans accès à la
+    base. Après une écriture réussie, ses lectures restent sur la base principale
+    pendant DATABASE_READ_YOUR_WRITES secondes.
+
+    Inactif si aucune base « replica » n'est configurée.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if REPLICA_DB_ALIAS not in settings.DATABASES:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.authentication = JWTAuthentication()
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = use_replica.set(self.can_use_replica(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            use_replica.reset(token)
+        self.remember_write(request, response)
+        return response
+
+    async def __acall__(self, request):
+        token = use_replica.set(self.can_use_replica(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            use_replica.reset(token)
+        self.remember_write(request, response)
+        return response
+
+    def can_use_replica(self, request):
+        if request.method not in SAFE_METHODS:
+            return False
+        user_id = self.token_user_id(request)
+        return user_id is None or not is_pinned_to_primary(user_id)
+
+    def token_user_id(self, request):
+        header = self.authentication.get_header(request)
+        raw_token = self.authentication.get_raw_token(header) if header else None
+        if raw_token is None:
+            return None
+        try:
+            token = self.authentication.get_validated_token(raw_token)
+        except InvalidToken:
+            return None
+        return token.get(jwt_settings.USER_ID_CLAIM)
+
+    def remember_write(self, request, response):
+        if request.method in SAFE_METHODS or response.status_code >= 400:
+            return
+        # DRF reporte l'utilisateur authentifié sur la requête Django.
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            pin_to_primary(user.pk)
@@ -0,0 +1,226 @@
+import hashlib
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from rest_framework import serializers, status
+from rest_framework.response import Response
+
+from .cache import response_cache
+from .metrics import timer
+from .routers import primary
+from .serializers import get_sparse_fieldset
+
+
+class SparseFieldsetMixin:
+    """
+    Mixin de ViewSet traduisant `?fields=` / `?omit=` en chargement partiel des
+    colonnes.
+
+    Le queryset est restreint avec .only() aux colonnes nécessaires aux champs
+    demandés : les grands champs texte non demandés ne sont jamais lus, et les
+    relations non demandées (select_related / prefetch_related) ne sont pas jointes.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        serializer = self.get_serializer()
+        selected = get_sparse_fieldset(self.request, serializer.fields)
+        if selected is None:
+            return queryset
+        return self.restrict_queryset(queryset, serializer, selected)
+
+    def restrict_queryset(self, queryset, serializer, selected):
+        """
+        Applique .only(), select_related et prefetch_related pour les seuls champs
+        demandés.
+        """
+        model = queryset.model
+        columns, relations = set(), set()
+        for name in selected:
+            field = serializer.fields[name]
+            if field.write_only or field.source == "*":
+                continue
+            parts = field.source.split(".")
+            if isinstance(field, serializers.SlugRelatedField):
+                parts.append(field.slug_field)
+            try:
+                model_field = model._meta.get_field(parts[0])
+            except FieldDoesNotExist:
+                continue
+            if model_field.many_to_many or model_field.one_to_many:
+                continue
+            if model_field.is_relation and len(parts) > 1:
+                relations.add(parts[0])
+            columns.add("__".join(parts))
+
+        prefetches = [
+            lookup
+            for lookup in queryset._prefetch_related_lookups
+            if str(getattr(lookup, "prefetch_to", lookup)).split("__")[0] in selected
+        ]
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if relations:
+            queryset = queryset.select_related(*relations)
+        if prefetches:
+            queryset = queryset.prefetch_related(*prefetches)
+        return queryset.only(*columns) if columns else queryset.only("pk")
+
+
+class CachedListMixin:
+    """
+    Mixin de ViewSet mettant en cache les données de réponse de list().
+
+    La clé combine la vue, l'utilisateur, l'URL complète (filtres, pagination,
+    champs), le format de réponse et les versions renvoyées par
+    get_list_cache_versions() : l'invalidation consiste à incrémenter une version,
+    sans jamais parcourir ni supprimer de clés. Une liste à mettre en cache est
+    lue sur la base principale, jamais sur un réplica en retard sur les versions.
+    """
+
+    def list(self, request, *args, **kwargs):
+        if not settings.RESPONSE_CACHE_TIMEOUT:
+            return super().list(request, *args, **kwargs)
+        key = response_cache.make_key(
+            self.basename,
+            request.user.pk,
+            request.get_full_path(),
+            getattr(request, "accepted_media_type", ""),
+            *self.get_list_cache_versions(),
+        )
+        data = response_cache.get(self.basename, key)
+        if data is not None:
+            return Response(data)
+        with primary():
+            response = super().list(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response_cache.set(key, response.data)
+        return response
+
+    def get_list_cache_versions(self):
+        """
+        Retourne les compteurs de version dont dépend la liste.
+        """
+        raise NotImplementedError
+
+
+class ConditionalGetMixin:
+    """
+    Mixin de ViewSet gérant les requêtes conditionnelles (ETag / Last-Modified).
+
+    Les validateurs de la liste sont calculés par une seule requête d'agrégat
+    (MAX(updated_time), COUNT(*)) sur le queryset filtré. Si le client possède déjà
+    la version courante (If-None-Match / If-Modified-Since), une réponse 304 est
+    renvoyée sans charger ni sérialiser les objets.
+    """
+
+    last_modified_field = "updated_time"
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        validators = queryset.order_by().aggregate(
+            last_modified=Max(self.last_modified_field), count=Count("pk")
+        )
+        return self.conditional_response(
+            request,
+            validators["last_modified"],
+            validators["count"],
+            lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        return self.conditional_response(
+            request,
+            getattr(instance, self.last_modified_field),
+            1,
+            lambda: Response(self.get_serializer(instance).data),
+        )
+
+    def conditional_response(self, request, last_modified, count, get_response):
+        """
+        Renvoie une réponse 304 si les validateurs du client sont à jour,
+        sinon la réponse complète produite par get_response, avec ses validateurs.
+        """
+        etag = self.compute_etag(request, last_modified, count)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+
+        if_none_match = request.headers.get("If-None-Match")
+        if_modified_since = parse_http_date_safe(
+            request.headers.get("If-Modified-Since", "")
+        )
+        if if_none_match:
+            not_modified = etag in parse_etags(if_none_match) or if_none_match == "*"
+        else:
+            not_modified = (
+                timestamp is not None
+                and if_modified_since is not None
+                and timestamp <= if_modified_since
+            )
+
+        response = (
+            Response(status=status.HTTP_304_NOT_MODIFIED)
+            if not_modified
+            else get_response()
+        )
+        response["ETag"] = etag
+        if timestamp is not None:
+            response["Last-Modified"] = http_date(timestamp)
+        return response
+
+    def compute_etag(self, request, last_modified, count):
+        """
+        Calcule un ETag faible à partir de l'URL complète, du format de réponse
+        et des validateurs du queryset.
+        """
+        key = "|".join(
+            [
+                request.get_full_path(),
+                str(getattr(request, "accepted_media_type", "")),
+                last_modified.isoformat() if last_modified else "",
+                str(count),
+            ]
+        )
+        return "W/" + quote_etag(hashlib.md5(key.encode()).hexdigest())
+
+
+class AtomicWriteMixin:
+    """
+    Mixin de ViewSet exécutant create(), update() et destroy() dans une transaction :
+    les écritures des receivers de signaux (compteurs, index de recherche, journal
+    des modifications) sont validées ou annulées avec la modification elle-même.
+    Sans point de sauvegarde : une erreur annule toute la transaction englobante.
+    """
+
+    def create(self, request, *args, **kwargs):
+        with transaction.atomic(savepoint=False):
+            return super().create(request, *args, **kwargs)
+
+    def update(self, request, *args, **kwargs):
+        with transaction.atomic(savepoint=False):
+            return super().update(request, *args, **kwargs)
+
+    def destroy(self, request, *args, **kwargs):
+        with transaction.atomic(savepoint=False):
+            return super().destroy(request, *args, **kwargs)
+
+
+class InstrumentedViewMixin:
+    """
+    Mixin de vue DRF mesurant l'authentification et les contrôles de permissions
+    de la requête en cours (en-tête Server-Timing, voir softdesk.metrics).
+    """
+
+    def perform_authentication(self, request):
+        with timer("auth"):
+            super().perform_authentication(request)
+
+    def check_permissions(self, request):
+        with timer("perm"):
+            super().check_permissions(request)
+
+    def check_object_permissions(self, request, obj):
+        with timer("perm"):
+            super().check_object_permissions(request, obj)
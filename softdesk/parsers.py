@@ -0,0 +1,36 @@
+import codecs
+import io
+
+from django.conf import settings
+from rest_framework import parsers
+
+from .renderers import FastJSONRenderer, contains_float, orjson
+
+
+class FastJSONParser(parsers.JSONParser):
+    """
+    Parser JSON s'appuyant sur orjson lorsqu'il est installé et que le corps est
+    encodé en UTF-8.
+
+    Un corps refusé par orjson, ou contenant des flottants (orjson lit les entiers
+    de plus de 64 bits comme des flottants), est relu par JSONParser, qui renvoie
+    le même résultat ou la même erreur qu'auparavant.
+    """
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or codecs.lookup(encoding).name != "utf-8":
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        try:
+            data = orjson.loads(body)
+        except orjson.JSONDecodeError:
+            data = None
+        else:
+            if not contains_float(data):
+                return data
+        return super().parse(io.BytesIO(body), media_type, parser_context)
@@ -0,0 +1,78 @@
+from rest_framework import renderers
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    orjson = None
+
+
+def contains_float(data):
+    """
+    Indique si les données contiennent un nombre flottant.
+
+    orjson et la bibliothèque standard n'écrivent pas tous les flottants de la
+    même façon (exposants, très petites valeurs) : ces données sont rendues par
+    JSONRenderer.
+    """
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        value_type = type(value)
+        if value_type is float:
+            return True
+        if value_type is str:
+            continue
+        if isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+LINE_SEPARATOR = "\u2028".encode()
+PARAGRAPH_SEPARATOR = "\u2029".encode()
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """
+    Renderer JSON s'appuyant sur orjson lorsqu'il est installé.
+
+    La sortie est identique octet pour octet à celle de JSONRenderer : les dates
+    et les types non natifs passent par l'encodeur de DRF, et toute donnée
+    qu'orjson ne sait pas reproduire à l'identique (flottants, clés non
+    textuelles, entiers de plus de 64 bits, indentation demandée, réglages
+    UNICODE_JSON / COMPACT_JSON modifiés) est rendue par JSONRenderer.
+    """
+
+    options = (
+        orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if orjson
+        else 0
+    )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        renderer_context = renderer_context or {}
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context)
+            or contains_float(data)
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            content = orjson.dumps(
+                data, default=encoders.JSONEncoder().default, option=self.options
+            )
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Comme JSONRenderer : U+2028 et U+2029 sont échappés pour JavaScript.
+        if LINE_SEPARATOR in content:
+            content = content.replace(LINE_SEPARATOR, b"\\u2028")
+        if PARAGRAPH_SEPARATOR in content:
+            content = content.replace(PARAGRAPH_SEPARATOR, b"\\u2029")
+        return content
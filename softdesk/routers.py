@@ -0,0 +1,75 @@
+"""
+Routage des lectures vers le réplica en lecture seule.
+
+Les lectures ne sont envoyées au réplica que pendant les requêtes HTTP de lecture
+(GET, HEAD, OPTIONS) désignées par softdesk.middleware.ReplicaRoutingMiddleware ;
+partout ailleurs (écritures, commandes de gestion, tâches), elles restent sur la
+base principale. Après une écriture, les lectures d'un même utilisateur restent
+sur la base principale pendant DATABASE_READ_YOUR_WRITES secondes, le temps que
+le réplica rattrape son retard.
+
+Les lectures dont le résultat est mis dans un cache partagé (utilisateurs des
+jetons JWT, appartenance aux projets, réponses de liste) sont toujours faites
+sur la base principale : lue sur un réplica en retard, une donnée déjà invalidée
+serait remise en cache et y resterait périmée.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+REPLICA_DB_ALIAS = "replica"
+
+use_replica = ContextVar("use_replica", default=False)
+
+
+@contextmanager
+def primary():
+    """
+    Envoie les lectures du bloc sur la base principale, quelle que soit la
+    requête en cours.
+    """
+    token = use_replica.set(False)
+    try:
+        yield
+    finally:
+        use_replica.reset(token)
+
+
+def pin_key(user_id):
+    return f"db-pin:{user_id}"
+
+
+def pin_to_primary(user_id):
+    """
+    Envoie les lectures de l'utilisateur sur la base principale pour la durée
+    DATABASE_READ_YOUR_WRITES (lecture de ses propres écritures).
+    """
+    cache.set(pin_key(user_id), True, settings.DATABASE_READ_YOUR_WRITES)
+
+
+def is_pinned_to_primary(user_id):
+    return cache.get(pin_key(user_id), False)
+
+
+class PrimaryReplicaRouter:
+    """
+    Routeur de bases : écritures sur la base principale, lectures sur le réplica
+    lorsque la requête en cours l'autorise (voir use_replica).
+    """
+
+    def db_for_read(self, model, **hints):
+        return REPLICA_DB_ALIAS if use_replica.get() else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Le réplica est une copie de la base principale.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return True
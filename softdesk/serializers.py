@@ -0,0 +1,48 @@
+from rest_framework.permissions import SAFE_METHODS
+
+from .metrics import timer
+
+
+def get_sparse_fieldset(request, field_names):
+    """
+    Retourne l'ensemble des champs demandés via `?fields=` / `?omit=`.
+
+    Les deux paramètres acceptent une liste de noms séparés par des virgules.
+    Les noms inconnus sont ignorés. La sélection ne s'applique qu'aux lectures :
+    les écritures ont besoin de tous les champs pour être validées.
+
+    :param request: Requête DRF (ou None).
+    :param field_names: Noms des champs disponibles sur le serializer.
+    :return: Ensemble des champs à conserver, ou None si aucune sélection n'est
+        demandée.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    params = request.query_params
+    fields = {name.strip() for name in params.get("fields", "").split(",")} - {""}
+    omit = {name.strip() for name in params.get("omit", "").split(",")} - {""}
+    if not fields and not omit:
+        return None
+    selected = set(field_names) & fields if fields else set(field_names)
+    return selected - omit
+
+
+class DynamicFieldsMixin:
+    """
+    Mixin de serializer limitant les champs renvoyés à ceux demandés par le client
+    via les paramètres `?fields=` et `?omit=`.
+
+    Le temps de sérialisation est compté dans la phase `serialize` de
+    softdesk.metrics.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        selected = get_sparse_fieldset(self.context.get("request"), self.fields)
+        if selected is not None:
+            for name in set(self.fields) - selected:
+                self.fields.pop(name)
+
+    def to_representation(self, instance):
+        with timer("serialize"):
+            return super().to_representation(instance)
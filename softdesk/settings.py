@@ -47,6 +47,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "softdesk.middleware.ServerTimingMiddleware",
+    "softdesk.middleware.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -80,13 +82,87 @@ WSGI_APPLICATION = "softdesk.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# PRAGMA exécutés à l'ouverture de chaque connexion SQLite : journal WAL (les
+# lecteurs ne bloquent plus les écritures), synchronisation allégée (sûre en WAL),
+# cache de pages de 64 Mo et lecture par mmap.
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "wal"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "normal"),
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", -64000)),
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", 268435456)),
+}
+
+
+def sqlite_database(name, **extra):
+    return {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": name,
+        # Connexions persistantes, vérifiées avant réutilisation
+        "CONN_MAX_AGE": int(os.getenv("DATABASE_CONN_MAX_AGE", 0)),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "init_command": ";".join(
+                f"PRAGMA {pragma}={value}" for pragma, value in SQLITE_PRAGMAS.items()
+            ),
+            # Les transactions prennent le verrou d'écriture dès leur début, ce qui
+            # évite les échecs « database is locked » entre écrivains concurrents.
+            "transaction_mode": "IMMEDIATE",
+            "timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT", 20)),
+        },
+        **extra,
+    }
+
+
 DATABASES = {
+    "default": sqlite_database(os.getenv("DATABASE_PATH", BASE_DIR / "db.sqlite3")),
+}
+
+# Réplica en lecture seule (copie de la base principale tenue à jour hors de
+# Django, ou par `python manage.py sync_replica` en local). Les lectures des
+# requêtes GET y sont envoyées par softdesk.routers.PrimaryReplicaRouter.
+if os.getenv("DATABASE_REPLICA_PATH"):
+    DATABASES["replica"] = sqlite_database(
+        os.getenv("DATABASE_REPLICA_PATH"), TEST={"MIRROR": "default"}
+    )
+    DATABASE_ROUTERS = ["softdesk.routers.PrimaryReplicaRouter"]
+
+# Durée (en secondes) pendant laquelle les lectures d'un utilisateur restent sur
+# la base principale après une écriture
+DATABASE_READ_YOUR_WRITES = 5
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", "softdesk"),
     }
 }
 
+# Durée (en secondes) de mise en cache de l'appartenance d'un utilisateur à un projet
+MEMBERSHIP_CACHE_TIMEOUT = 300
+
+# Durée (en secondes) de mise en cache des listes de projets, issues et
+# commentaires (0 pour désactiver). Les entrées sont invalidées par version.
+RESPONSE_CACHE_TIMEOUT = 300
+
+# Cache des utilisateurs authentifiés par JWT (LRU local + cache partagé)
+USER_CACHE = {
+    "MAX_SIZE": 2048,  # Nombre maximal d'utilisateurs dans le LRU de chaque worker
+    "LOCAL_TTL": 60,  # Durée de vie (s) d'une entrée du LRU local
+    "SHARED_TTL": 300,  # Durée de vie (s) d'une entrée du cache partagé
+}
+
+# Révocation des refresh tokens après rotation (voir users.revocation)
+TOKEN_REVOCATION = {
+    "BLOOM_CAPACITY": 100_000,  # Jetons révoqués non expirés attendus par worker
+    "BLOOM_ERROR_RATE": 0.001,  # Faux positifs (vérifiés dans le cache puis en base)
+    "CACHE_TIMEOUT": 300,  # Durée de vie (s) des réponses négatives en cache
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -130,14 +206,78 @@ STATIC_URL = "static/"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
-    "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
-    ),
+    "DEFAULT_AUTHENTICATION_CLASSES": ("users.authentication.CachedJWTAuthentication",),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
+    # Encodage / décodage JSON par orjson, avec repli sur la bibliothèque standard
+    # (remplacer par rest_framework.renderers.JSONRenderer / parsers.JSONParser
+    # pour revenir aux classes de DRF)
+    "DEFAULT_RENDERER_CLASSES": (
+        "softdesk.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "softdesk.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
+    # Limites de débit (voir softdesk.throttling) ; None désactive une limite.
+    "DEFAULT_THROTTLE_RATES": {
+        # Par adresse IP
+        "login": os.getenv("THROTTLE_LOGIN", "10/min"),
+        "register": os.getenv("THROTTLE_REGISTER", "5/hour"),
+        "token_refresh": os.getenv("THROTTLE_TOKEN_REFRESH", "30/min"),
+        # Par compte visé et par adresse IP
+        "login_username": os.getenv("THROTTLE_LOGIN_USERNAME", "5/min"),
+        # Par utilisateur et par route d'écriture de l'API
+        "write": os.getenv("THROTTLE_WRITE", "300/min"),
+    },
+    # Nombre de proxys devant l'application : l'adresse du client est lue dans
+    # X-Forwarded-For. À 0, seule REMOTE_ADDR est utilisée, l'en-tête pouvant
+    # être falsifié pour contourner les limites.
+    "NUM_PROXIES": int(os.getenv("NUM_PROXIES", "0")),
 }
 
+# Nombre maximal d'éléments acceptés par les endpoints d'écriture groupée
+BULK_MAX_ITEMS = 500
+# Taille des lots envoyés à la base par bulk_create / bulk_update
+BULK_BATCH_SIZE = 100
+# Taille des lots lus (iterator) et écrits lors de l'export / import NDJSON d'un projet
+EXPORT_CHUNK_SIZE = 2000
+# Nombre maximal de contributeurs affichés dans le détail d'un projet
+PROJECT_CONTRIBUTORS_PREVIEW = 20
+# Nombre maximal d'entrées du journal lues par appel au flux de synchronisation
+CHANGELOG_PAGE_SIZE = 500
+# Suppression des projets en arrière-plan (voir api.deletion) : lignes supprimées
+# par transaction, et pause (s) entre deux lots pour laisser passer les écritures
+DELETION_BATCH_SIZE = 500
+DELETION_BATCH_PAUSE = 0.05
+# Période d'activité des commentaires renvoyée par /projects/<id>/stats/ : valeur
+# par défaut et maximum du paramètre `days` (jours)
+PROJECT_STATS_DAYS = 30
+PROJECT_STATS_MAX_DAYS = 365
+
+# Événements temps réel (/api/async/events/, voir softdesk.events).
+# Backend de diffusion : softdesk.events.LocalBackend (un seul processus) ou
+# softdesk.events.DatabaseBackend (plusieurs workers partageant la base).
+EVENTS_BACKEND = os.getenv("EVENTS_BACKEND", "softdesk.events.LocalBackend")
+# Événements en attente par connexion avant de décrocher un client trop lent
+EVENTS_QUEUE_SIZE = 100
+# Intervalle (s) des commentaires `ping` envoyés sur une connexion inactive
+EVENTS_HEARTBEAT = 15
+# Délai (s) de reconnexion indiqué aux clients (champ `retry`)
+EVENTS_RECONNECT_DELAY = 5
+# Durée de validité (s) des jetons d'ouverture du flux (api.events.EventStreamToken)
+EVENTS_TOKEN_LIFETIME = 60
+# DatabaseBackend : intervalle (s) de lecture de la table et durée de rétention
+EVENTS_POLL_INTERVAL = float(os.getenv("EVENTS_POLL_INTERVAL", 0.5))
+EVENTS_RETENTION = 60
+
+# Instrumentation des requêtes (en-tête Server-Timing et /api/metrics/).
+# Désactivée par défaut : le middleware se retire alors de la chaîne.
+PERFORMANCE_METRICS = bool(os.getenv("PERFORMANCE_METRICS"))
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(
         minutes=30
@@ -148,6 +288,9 @@ SIMPLE_JWT = {
     "ALGORITHM": "HS256",
     "SIGNING_KEY": SECRET_KEY,
     "AUTH_HEADER_TYPES": ("Bearer",),
+    # Révocation des refresh tokens après rotation (voir users.revocation)
+    "TOKEN_REFRESH_SERIALIZER": "users.serializers.RevocableTokenRefreshSerializer",
+    "TOKEN_VERIFY_SERIALIZER": "users.serializers.RevocableTokenVerifySerializer",
 }
 
 AUTH_USER_MODEL = "users.User"
@@ -0,0 +1,193 @@
+"""
+Limitation de débit partagée entre workers par le cache Django.
+
+Chaque limite (scope) a un débit « N/période » défini dans
+REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"] ; un débit absent ou None désactive la
+limite. Le débit est estimé sur une fenêtre glissante : le compteur de la
+fenêtre fixe en cours, incrémenté atomiquement (cache.incr), plus celui de la
+fenêtre précédente pondéré par la part de celle-ci encore couverte. Deux
+opérations de cache par requête, aucune requête SQL, et une mémoire bornée à
+deux compteurs par client, quel que soit le débit.
+
+Les limites sont vérifiées par DRF avant la vue (APIView.check_throttles) : une
+requête rejetée ne lit pas la base et ne calcule aucun hash de mot de passe. La
+réponse 429 porte l'en-tête Retry-After, calculé à partir des compteurs.
+Les tentatives rejetées sont comptées : un client qui insiste sans respecter
+Retry-After reste bloqué.
+"""
+
+import hashlib
+import math
+import threading
+import time
+
+from django.core.cache import cache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from .metrics import registry
+
+THROTTLE_PREFIX = "softdesk:throttle:"
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate):
+    """
+    Retourne le couple (nombre de requêtes, durée en secondes) d'un débit
+    « N/période », la période étant s, m, h ou d (ou un mot commençant ainsi).
+    """
+    count, period = rate.split("/")
+    return int(count), PERIODS[period[0]]
+
+
+class ThrottleStats:
+    """
+    Nombre de requêtes rejetées par limite, exposé par /api/metrics/.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.rejected = {}
+
+    def count(self, scope):
+        with self.lock:
+            self.rejected[scope] = self.rejected.get(scope, 0) + 1
+
+    def metrics(self):
+        lines = [
+            "# HELP softdesk_throttled_requests_total Requêtes rejetées (429).",
+            "# TYPE softdesk_throttled_requests_total counter",
+        ]
+        with self.lock:
+            rejected = sorted(self.rejected.items())
+        for scope, count in rejected:
+            lines.append(
+                f'softdesk_throttled_requests_total{{scope="{scope}"}} {count}'
+            )
+        return lines
+
+
+throttle_stats = ThrottleStats()
+registry.register(throttle_stats.metrics)
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """
+    Limite à fenêtre glissante. Les sous-classes définissent `scope` et
+    get_ident_key(), qui identifie le client (None : requête non limitée).
+    """
+
+    scope = None
+
+    def get_ident_key(self, request, view):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        if rate is None:
+            return True
+        ident = self.get_ident_key(request, view)
+        if ident is None:
+            return True
+
+        limit, duration = parse_rate(rate)
+        now = time.time()
+        window = int(now // duration)
+        prefix = f"{THROTTLE_PREFIX}{self.scope}:{ident}:"
+        count = self.incr(prefix + str(window), duration)
+        previous = cache.get(prefix + str(window - 1), 0)
+        elapsed = now / duration - window
+        if previous * (1 - elapsed) + count <= limit:
+            return True
+
+        self.wait_time = self.compute_wait(limit, duration, count, previous, elapsed)
+        throttle_stats.count(self.scope)
+        return False
+
+    def incr(self, key, duration):
+        """
+        Incrémente atomiquement le compteur de la fenêtre, conservé deux fenêtres.
+        """
+        try:
+            return cache.incr(key)
+        except ValueError:
+            if cache.add(key, 1, duration * 2):
+                return 1
+            # Créé entre-temps par une requête concurrente.
+            return cache.incr(key)
+
+    def compute_wait(self, limit, duration, count, previous, elapsed):
+        """
+        Délai (s) avant que l'estimation redescende sous la limite, en supposant
+        qu'aucune autre requête n'arrive d'ici là.
+        """
+        if count + 1 < limit and previous:
+            # La fenêtre précédente suffit à dépasser : attendre que son poids baisse.
+            needed = 1 - (limit - count - 1) / previous
+            return max(0, needed - elapsed) * duration
+        # Le compteur courant devient la fenêtre précédente à la fin de la fenêtre.
+        needed = max(0, 1 - (limit - 1) / count)
+        return (1 - elapsed + needed) * duration
+
+    def wait(self):
+        return math.ceil(self.wait_time)
+
+
+class IPThrottle(SlidingWindowThrottle):
+    """
+    Limite par adresse IP du client (voir NUM_PROXIES derrière un proxy).
+    """
+
+    def get_ident_key(self, request, view):
+        return self.get_ident(request)
+
+
+class LoginThrottle(IPThrottle):
+    scope = "login"
+
+
+class LoginUsernameThrottle(SlidingWindowThrottle):
+    """
+    Limite les tentatives de connexion sur un même compte depuis une même adresse
+    IP, en deçà de la limite par adresse (LoginThrottle).
+
+    La clé combine le compte et l'adresse : une limite par compte seul, toutes
+    adresses confondues, permettrait à n'importe qui de bloquer la connexion d'un
+    utilisateur légitime en épuisant son budget.
+    """
+
+    scope = "login_username"
+
+    def get_ident_key(self, request, view):
+        data = request.data
+        username = data.get("username") if isinstance(data, dict) else None
+        if not isinstance(username, str) or not username:
+            return None
+        # Clé de longueur fixe, sans espaces ni caractères de contrôle.
+        ident = f"{username.casefold()}\n{self.get_ident(request)}"
+        return hashlib.md5(ident.encode()).hexdigest()
+
+
+class RegisterThrottle(IPThrottle):
+    scope = "register"
+
+
+class TokenRefreshThrottle(IPThrottle):
+    scope = "token_refresh"
+
+
+class WriteThrottle(SlidingWindowThrottle):
+    """
+    Limite les écritures (méthodes autres que GET, HEAD et OPTIONS) par
+    utilisateur et par route : chaque ressource (projets, issues, ...) a son
+    propre budget.
+    """
+
+    scope = "write"
+
+    def get_ident_key(self, request, view):
+        if request.method in ("GET", "HEAD", "OPTIONS"):
+            return None
+        user = request.user
+        ident = user.pk if user.is_authenticated else self.get_ident(request)
+        return f"{getattr(view, 'basename', type(view).__name__)}:{ident}"
@@ -18,8 +18,12 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 
+from .views import MetricsView
+
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("api/metrics/", MetricsView.as_view(), name="metrics"),
+    path("api/async/", include("api.async_urls")),
     path("api/", include("users.urls")),
     path("api/", include("api.urls")),
 ]
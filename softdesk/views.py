@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import IsAdminUser
+from rest_framework.views import APIView
+
+from .metrics import registry
+
+
+class MetricsView(APIView):
+    """
+    Expose les histogrammes par route au format texte Prometheus.
+
+    Réservé aux administrateurs ; renvoie 404 si PERFORMANCE_METRICS est désactivé.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        if not settings.PERFORMANCE_METRICS:
+            raise NotFound("Les métriques de performance sont désactivées.")
+        return HttpResponse(
+            registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+        )
@@ -0,0 +1,45 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+from softdesk.routers import primary
+
+from .cache import user_cache
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    Authentification JWT résolvant l'utilisateur via users.cache.user_cache.
+
+    Seuls les utilisateurs valides (existants et actifs) sont mis en cache ; les
+    contrôles de simplejwt (compte actif, révocation par changement de mot de
+    passe) sont rejoués sur l'utilisateur en cache à chaque requête.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+
+        user = user_cache.get(user_id)
+        if user is None:
+            # Version lue avant la base : une invalidation pendant le chargement
+            # empêche la mise en cache de l'utilisateur lu. Mis en cache, il est
+            # lu sur la base principale (voir softdesk.routers).
+            version = user_cache.version(user_id)
+            with primary():
+                user = super().get_user(validated_token)
+            user_cache.set(user_id, user, version)
+            return user
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+        return user
@@ -0,0 +1,127 @@
+import copy
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+class UserCache:
+    """
+    Cache des utilisateurs résolus à partir des jetons JWT.
+
+    Deux niveaux :
+      - un LRU borné, propre au processus, avec une durée de vie (TTL) ;
+      - le cache partagé entre les workers (framework de cache Django).
+
+    Chaque utilisateur mis en cache est associé à une version stockée dans le cache
+    partagé. L'invalidation supprime cette version : les copies locales des autres
+    workers ne correspondent alors plus et sont ignorées dès la requête suivante.
+    Une seule lecture du cache partagé (get_many) est faite par requête, sans
+    aucune requête SQL.
+    """
+
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    @property
+    def options(self):
+        return settings.USER_CACHE
+
+    def version_key(self, user_id):
+        return f"softdesk:user-version:{user_id}"
+
+    def user_key(self, user_id):
+        return f"softdesk:user:{user_id}"
+
+    def get(self, user_id):
+        """
+        Retourne une copie de l'utilisateur en cache, ou None.
+        """
+        version_key, user_key = self.version_key(user_id), self.user_key(user_id)
+        shared = cache.get_many([version_key, user_key])
+        version = shared.get(version_key)
+        if version is None:
+            return None
+
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is not None:
+                expires_at, local_version, user = entry
+                if local_version == version and expires_at > time.monotonic():
+                    self.entries.move_to_end(user_id)
+                    return copy.copy(user)
+                del self.entries[user_id]
+
+        cached = shared.get(user_key)
+        if cached is None or cached[0] != version:
+            return None
+        self.store_local(user_id, version, cached[1])
+        return copy.copy(cached[1])
+
+    def version(self, user_id):
+        """
+        Retourne la version courante de l'utilisateur, créée si besoin.
+
+        À lire avant de charger l'utilisateur depuis la base, puis à passer à set().
+        """
+        version_key = self.version_key(user_id)
+        cache.add(version_key, uuid.uuid4().hex, self.options["SHARED_TTL"])
+        return cache.get(version_key)
+
+    def set(self, user_id, user, version):
+        """
+        Met en cache un utilisateur chargé depuis la base, si sa version n'a pas
+        changé depuis sa lecture (version()).
+
+        Une invalidation survenue pendant le chargement a supprimé cette version :
+        l'utilisateur lu, peut-être périmé (compte désactivé entre-temps), n'est
+        alors pas mis en cache. L'entrée reste associée à la version lue avant le
+        chargement, et est donc ignorée par get() si l'invalidation a lieu entre
+        la comparaison et l'écriture.
+        """
+        if version is None or cache.get(self.version_key(user_id)) != version:
+            return
+        cache.set(self.user_key(user_id), (version, user), self.options["SHARED_TTL"])
+        self.store_local(user_id, version, user)
+
+    def store_local(self, user_id, version, user):
+        with self.lock:
+            self.entries[user_id] = (
+                time.monotonic() + self.options["LOCAL_TTL"],
+                version,
+                user,
+            )
+            self.entries.move_to_end(user_id)
+            while len(self.entries) > self.options["MAX_SIZE"]:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, *user_ids):
+        """
+        Invalide les utilisateurs donnés dans tous les workers, après validation
+        de la transaction en cours. Avant, un autre worker qui ne voit pas encore
+        la modification recréerait la version (version()) et remettrait en cache
+        l'utilisateur périmé.
+        """
+
+        def delete():
+            keys = []
+            with self.lock:
+                for user_id in user_ids:
+                    self.entries.pop(user_id, None)
+                    keys += [self.version_key(user_id), self.user_key(user_id)]
+            if keys:
+                cache.delete_many(keys)
+
+        transaction.on_commit(delete)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+user_cache = UserCache()
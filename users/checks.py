@@ -0,0 +1,39 @@
+"""
+Vérifications système de l'application users.
+"""
+
+from django.conf import settings
+from django.core import checks
+from rest_framework_simplejwt import settings as jwt_settings
+
+# Backends dont les entrées ne sont pas partagées entre les workers
+LOCAL_CACHE_BACKENDS = {
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+}
+
+
+@checks.register(checks.Tags.caches, deploy=True)
+def check_revocation_cache(app_configs, **kwargs):
+    """
+    La révocation des refresh tokens (users.revocation) synchronise les workers
+    par un compteur stocké dans le cache : avec un cache local, un jeton révoqué
+    par un worker reste accepté par les autres.
+    """
+    # api_settings est remplacé à chaque modification de SIMPLE_JWT.
+    api_settings = jwt_settings.api_settings
+    if not (
+        api_settings.ROTATE_REFRESH_TOKENS and api_settings.BLACKLIST_AFTER_ROTATION
+    ):
+        return []
+    backend = settings.CACHES["default"]["BACKEND"]
+    if backend not in LOCAL_CACHE_BACKENDS:
+        return []
+    return [
+        checks.Warning(
+            f"La révocation des refresh tokens requiert un cache partagé entre les "
+            f"workers ; le cache par défaut utilise {backend}.",
+            hint="Définir CACHE_BACKEND et CACHE_LOCATION (Redis, Memcached…).",
+            id="users.W001",
+        )
+    ]
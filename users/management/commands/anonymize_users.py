@@ -0,0 +1,69 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from users.models import User
+
+
+class Command(BaseCommand):
+    """
+    Anonymise les comptes inactifs depuis plus de --inactive-days jours (dernière
+    connexion, ou inscription s'ils ne se sont jamais connectés), pour les tâches
+    planifiées de durée de conservation.
+
+    Les comptes sont traités par lots de --batch-size, chacun anonymisé en un
+    bulk_update dans sa propre transaction : le verrou d'écriture n'est jamais
+    gardé longtemps et un arrêt en cours de route laisse les lots déjà traités
+    anonymisés. Seuls les identifiants sont chargés ; les comptes d'administration
+    et ceux déjà anonymisés sont ignorés.
+    """
+
+    help = "Anonymise par lots les comptes inactifs (durée de conservation RGPD)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--inactive-days",
+            type=int,
+            required=True,
+            help="Ancienneté minimale (jours) de la dernière connexion",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Affiche le nombre de comptes concernés sans les modifier",
+        )
+
+    def handle(self, *args, **options):
+        if options["inactive_days"] < 1 or options["batch_size"] < 1:
+            raise CommandError("--inactive-days et --batch-size doivent être positifs.")
+        cutoff = timezone.now() - timedelta(days=options["inactive_days"])
+        users = User.objects.filter(
+            Q(last_login__lt=cutoff)
+            | Q(last_login__isnull=True, date_joined__lt=cutoff),
+            is_staff=False,
+            is_superuser=False,
+        ).exclude(username__startswith="deleted_user_")
+
+        if options["dry_run"]:
+            self.stdout.write(f"{users.count()} compte(s) à anonymiser.")
+            return
+
+        anonymized, last_pk = 0, 0
+        while True:
+            batch = list(
+                users.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .only("id")[: options["batch_size"]]
+            )
+            if not batch:
+                break
+            with transaction.atomic():
+                User.objects.anonymize(batch)
+            last_pk = batch[-1].pk
+            anonymized += len(batch)
+            self.stdout.write(f"{anonymized} compte(s) anonymisé(s)...")
+        self.stdout.write(self.style.SUCCESS(f"{anonymized} compte(s) anonymisé(s)."))
@@ -0,0 +1,118 @@
+import time
+import uuid
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.serializers import TokenVerifySerializer
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from users.models import RevokedToken, User
+from users.revocation import revocation_store
+from users.serializers import RevocableTokenVerifySerializer
+
+
+class Command(BaseCommand):
+    """
+    Mesure le coût de la vérification de révocation des jetons (users.revocation).
+
+    Enregistre --revoked jetons révoqués, puis mesure is_revoked() sur des jetons
+    non révoqués (cas courant, filtre de Bloom seul) et révoqués (lus dans le
+    cache partagé), et le surcoût de la sérialisation de /api/token/verify/ par
+    rapport à celle de simplejwt sans révocation. Échoue si le surcoût p99 dépasse
+    --max-overhead microsecondes. Toutes les écritures sont annulées à la fin.
+    """
+
+    help = "Benchmark de la vérification de révocation des refresh tokens."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--revoked", type=int, default=100_000)
+        parser.add_argument("--checks", type=int, default=5000)
+        parser.add_argument(
+            "--max-overhead",
+            type=float,
+            default=1000,
+            help="Surcoût p99 toléré (µs) sur /api/token/verify/",
+        )
+
+    def handle(self, *args, **options):
+        user = User.objects.order_by("pk").first()
+        if user is None:
+            raise CommandError("Aucun utilisateur : lancez d'abord seed_softdesk.")
+        with transaction.atomic():
+            self.run(user, options)
+            transaction.set_rollback(True)
+        revocation_store.clear()
+
+    def run(self, user, options):
+        expires_at = timezone.now() + timedelta(days=1)
+        revoked = [uuid.uuid4().hex for _ in range(options["revoked"])]
+        RevokedToken.objects.bulk_create(
+            [RevokedToken(jti=jti, expires_at=expires_at) for jti in revoked],
+            batch_size=5000,
+        )
+        revocation_store.clear()
+        start = time.perf_counter()
+        revocation_store.sync()
+        self.stdout.write(
+            f"Filtre chargé en {(time.perf_counter() - start) * 1000:.1f} ms : "
+            f"{len(revocation_store.bloom)} jeton(s), "
+            f"{revocation_store.bloom.memory_usage() / 1024:.0f} Ko"
+        )
+
+        checks = options["checks"]
+        unrevoked = [uuid.uuid4().hex for _ in range(checks)]
+        false_positives = sum(jti in revocation_store.bloom for jti in unrevoked)
+        self.report(
+            "is_revoked (non révoqué)",
+            self.time(revocation_store.is_revoked, unrevoked),
+        )
+        # Jetons révoqués récemment présentés : leur statut est dans le cache partagé.
+        sample = (revoked[:100] * (checks // 100 + 1))[:checks]
+        for jti in revoked[:100]:
+            revocation_store.is_revoked(jti)
+        self.report(
+            "is_revoked (révoqué)", self.time(revocation_store.is_revoked, sample)
+        )
+        self.stdout.write(f"Faux positifs du filtre : {false_positives}/{checks}")
+
+        tokens = [{"token": str(RefreshToken.for_user(user))} for _ in range(checks)]
+        stock = self.time(
+            lambda data: TokenVerifySerializer(data=data).is_valid(), tokens
+        )
+        revocable = self.time(
+            lambda data: RevocableTokenVerifySerializer(data=data).is_valid(), tokens
+        )
+        self.report("token/verify sans révocation", stock)
+        self.report("token/verify avec révocation", revocable)
+        overhead = (
+            self.percentile(revocable, 0.99) - self.percentile(stock, 0.99)
+        ) * 1e6
+        self.stdout.write(f"Surcoût p99 : {overhead:.1f} µs")
+        if overhead > options["max_overhead"]:
+            budget = options["max_overhead"]
+            raise CommandError(
+                f"Surcoût de la révocation {overhead:.1f} µs > {budget} µs."
+            )
+        self.stdout.write(
+            self.style.SUCCESS("Surcoût de la révocation dans le budget.")
+        )
+
+    def time(self, function, values):
+        timings = []
+        for value in values:
+            start = time.perf_counter()
+            function(value)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        return timings
+
+    def percentile(self, timings, percentile):
+        return timings[min(len(timings) - 1, int(percentile * len(timings)))]
+
+    def report(self, label, timings):
+        self.stdout.write(
+            f"{label:<32} p50 {self.percentile(timings, 0.5) * 1e6:8.1f} µs  "
+            f"p99 {self.percentile(timings, 0.99) * 1e6:8.1f} µs"
+        )
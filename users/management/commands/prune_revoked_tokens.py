@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from users.revocation import revocation_store
+
+
+class Command(BaseCommand):
+    """
+    Purge les refresh tokens révoqués expirés (à planifier, par exemple une fois
+    par jour) : la validation JWT refuse déjà un jeton expiré, sa révocation n'a
+    plus à être conservée. Les filtres de Bloom des workers ne sont pas
+    reconstruits : les jti purgés n'y restent que comme faux positifs.
+    """
+
+    help = "Supprime les refresh tokens révoqués expirés."
+
+    def handle(self, *args, **options):
+        deleted = revocation_store.prune()
+        self.stdout.write(
+            self.style.SUCCESS(f"{deleted} jeton(s) révoqué(s) expiré(s) supprimé(s).")
+        )
@@ -1,5 +1,6 @@
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager as BaseUserManager
 from django.db import models
+from django.dispatch import Signal
 from django.core.exceptions import ValidationError
 from datetime import date
 from django.utils import timezone
@@ -22,6 +23,26 @@ def validate_age(birth_date):
         raise ValidationError("Vous devez avoir au moins 15 ans pour vous inscrire.")
 
 
+# Envoyé après l'anonymisation d'utilisateurs (argument `users`), qui ne passe
+# pas par save() : les receivers invalident ce qui expose leurs données.
+users_anonymized = Signal()
+
+
+class UserManager(BaseUserManager):
+    def anonymize(self, users):
+        """
+        Anonymise les utilisateurs donnés en une requête (bulk_update), sans les
+        recharger ni appeler save(), puis envoie users_anonymized.
+
+        :param users: Instances de User (leur identifiant suffit).
+        """
+        now = timezone.now()
+        for user in users:
+            user.anonymize(now)
+        self.bulk_update(users, self.model.ANONYMIZED_FIELDS)
+        users_anonymized.send(sender=self.model, users=users)
+
+
 class User(AbstractUser):
     """
     Modèle utilisateur étendu basé sur AbstractUser.
@@ -33,6 +54,7 @@ class User(AbstractUser):
       - can_data_be_shared : Autorise le partage des données de l'utilisateur.
 
     Méthodes spéciales :
+      - anonymize : Remplace les données personnelles, sans sauvegarder.
       - delete_personnal_data : Anonymise et supprime les données personnelles.
       - clean : Effectue des validations supplémentaires, notamment que la date de naissance soit renseignée.
       - save : Applique des règles spécifiques (notamment pour les superutilisateurs) avant de sauvegarder.
@@ -46,25 +68,49 @@ class User(AbstractUser):
     is_active = models.BooleanField(default=True)
     last_password_update = models.DateTimeField(auto_now_add=True)
 
+    objects = UserManager()
+
+    # Champs modifiés par anonymize().
+    ANONYMIZED_FIELDS = [
+        "username",
+        "first_name",
+        "last_name",
+        "email",
+        "birth_date",
+        "consent",
+        "can_be_contacted",
+        "can_data_be_shared",
+        "is_active",
+    ]
+
     def __str__(self):
         """
         Retourne une représentation en chaîne de l'utilisateur (son username).
         """
         return self.username
 
-    def delete_personnal_data(self):
+    def anonymize(self, now):
         """
-        Anonymise et supprime les données personnelles de l'utilisateur pour se conformer au droit à l'oubli.
+        Remplace les données personnelles de l'utilisateur (ANONYMIZED_FIELDS) et
+        désactive le compte, sans sauvegarder.
+
+        :param now: Date de l'anonymisation, incluse dans le nom d'utilisateur.
         """
-        timestamp = timezone.now().strftime("%Y%m%d%H%M%S")
-        self.username = f"deleted_user_{timestamp}_{self.id}"
-        self.email = None
+        self.username = f"deleted_user_{now.strftime('%Y%m%d%H%M%S')}_{self.id}"
+        self.first_name = ""
+        self.last_name = ""
+        self.email = ""
         self.birth_date = date(1900, 1, 1)
         self.consent = False
         self.can_be_contacted = False
         self.can_data_be_shared = False
         self.is_active = False
-        self.save()
+
+    def delete_personnal_data(self):
+        """
+        Anonymise et supprime les données personnelles de l'utilisateur pour se conformer au droit à l'oubli.
+        """
+        User.objects.anonymize([self])
 
     def clean(self):
         """
@@ -91,3 +137,16 @@ class User(AbstractUser):
                 self.birth_date = date(1900, 1, 1)
         self.clean()
         super().save(*args, **kwargs)
+
+
+class RevokedToken(models.Model):
+    """
+    Refresh token révoqué, identifié par son jti et conservé jusqu'à son
+    expiration (voir users.revocation).
+    """
+
+    jti = models.CharField(max_length=255, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return self.jti
@@ -0,0 +1,154 @@
+"""
+Révocation des refresh tokens après rotation (BLACKLIST_AFTER_ROTATION).
+
+Les jti révoqués sont enregistrés dans la table RevokedToken (index unique sur
+le jti) jusqu'à leur expiration. Chaque worker garde devant elle un filtre de
+Bloom en mémoire : un jeton jamais révoqué, cas de presque toutes les
+vérifications, est accepté sans requête SQL, après une seule lecture du cache
+partagé. Seuls les jetons révoqués et les faux positifs du filtre sont vérifiés
+dans le cache, puis en base.
+
+Les workers se tiennent à jour par un compteur de génération stocké dans le
+cache partagé et incrémenté (cache.incr) après chaque révocation : lorsqu'il
+change, le worker ajoute à son filtre les lignes révoquées depuis sa dernière
+lecture (identifiant supérieur au dernier lu). Un filtre plein est reconstruit
+à partir des seuls jetons non expirés ; les lignes expirées sont purgées par la
+commande prune_revoked_tokens.
+"""
+
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from softdesk.bloom import BloomFilter
+
+from .models import RevokedToken
+
+GENERATION_KEY = "softdesk:revoked-tokens:generation"
+
+
+def revoked_key(jti):
+    return f"softdesk:revoked-token:{jti}"
+
+
+class RevocationStore:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.bloom = None
+        self.generation = None
+        self.last_id = 0
+        # Lignes révoquées par ce worker, déjà dans le filtre.
+        self.own_ids = set()
+
+    @property
+    def options(self):
+        return settings.TOKEN_REVOCATION
+
+    def load(self):
+        """
+        Reconstruit le filtre à partir des jetons révoqués non expirés.
+        """
+        revoked = RevokedToken.objects.filter(expires_at__gt=timezone.now())
+        capacity = max(self.options["BLOOM_CAPACITY"], 2 * revoked.count())
+        bloom = BloomFilter(capacity, self.options["BLOOM_ERROR_RATE"])
+        last_id = self.last_id
+        for pk, jti in revoked.values_list("id", "jti").iterator(chunk_size=10000):
+            bloom.add(jti)
+            last_id = max(last_id, pk)
+        self.bloom, self.last_id = bloom, last_id
+        self.own_ids.clear()
+
+    def sync(self):
+        """
+        Met le filtre à jour si d'autres workers ont révoqué des jetons.
+        """
+        generation = cache.get(GENERATION_KEY)
+        if generation is not None and generation == self.generation:
+            return
+        with self.lock:
+            if generation is None:
+                # Compteur absent (cache vidé) : toute nouvelle révocation le recrée.
+                cache.add(GENERATION_KEY, 0, None)
+                generation = 0
+            # La génération est lue avant la base : une révocation validée après
+            # la lecture incrémente le compteur et déclenche une nouvelle
+            # synchronisation.
+            if self.bloom is None or self.bloom.is_full():
+                self.load()
+            else:
+                rows = RevokedToken.objects.filter(id__gt=self.last_id).values_list(
+                    "id", "jti"
+                )
+                for pk, jti in rows:
+                    if pk in self.own_ids:
+                        self.own_ids.discard(pk)
+                    else:
+                        self.bloom.add(jti)
+                    self.last_id = max(self.last_id, pk)
+            self.generation = generation
+
+    def is_revoked(self, jti):
+        self.sync()
+        if jti not in self.bloom:
+            return False
+        key = revoked_key(jti)
+        revoked = cache.get(key)
+        if revoked is None:
+            revoked = RevokedToken.objects.filter(jti=jti).exists()
+            cache.set(key, revoked, self.options["CACHE_TIMEOUT"])
+        return revoked
+
+    def revoke(self, jti, expires_at):
+        """
+        Révoque un jeton jusqu'à son expiration.
+
+        :return: False si le jeton était déjà révoqué (réutilisation concurrente).
+        """
+        try:
+            with transaction.atomic():
+                entry = RevokedToken.objects.create(jti=jti, expires_at=expires_at)
+        except IntegrityError:
+            return False
+        self.sync()
+        with self.lock:
+            self.bloom.add(jti)
+            self.own_ids.add(entry.pk)
+
+        def publish():
+            timeout = max(1, int((expires_at - timezone.now()).total_seconds()))
+            cache.set(revoked_key(jti), True, timeout)
+            try:
+                generation = cache.incr(GENERATION_KEY)
+            except ValueError:
+                cache.add(GENERATION_KEY, 1, None)
+                return
+            with self.lock:
+                # Aucune autre révocation annoncée entre-temps : le filtre est à
+                # jour. last_id n'avance pas : une révocation validée mais pas
+                # encore annoncée sera lue à la prochaine synchronisation.
+                if self.generation == generation - 1:
+                    self.generation = generation
+
+        transaction.on_commit(publish)
+        return True
+
+    def prune(self):
+        """
+        Supprime les jetons révoqués expirés, que la validation JWT refuse déjà.
+
+        :return: Le nombre de lignes supprimées.
+        """
+        deleted, _ = RevokedToken.objects.filter(
+            expires_at__lte=timezone.now()
+        ).delete()
+        return deleted
+
+    def clear(self):
+        with self.lock:
+            self.bloom, self.generation, self.last_id = None, None, 0
+            self.own_ids.clear()
+
+
+revocation_store = RevocationStore()
@@ -1,8 +1,19 @@
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import (
+    TokenRefreshSerializer,
+    TokenVerifySerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import UntypedToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+from softdesk.serializers import DynamicFieldsMixin
 from .models import User
+from .revocation import revocation_store
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Serializer pour le modèle User.
 
@@ -53,3 +64,36 @@ class UserSerializer(serializers.ModelSerializer):
                     "Le consentement global est requis pour les autres options RGPD."
                 )
         return data
+
+
+class RevocableTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Rafraîchissement refusant les refresh tokens révoqués, et révoquant le jeton
+    présenté après rotation (ROTATE_REFRESH_TOKENS et BLACKLIST_AFTER_ROTATION),
+    via users.revocation plutôt que l'application token_blacklist de simplejwt.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        jti = refresh[api_settings.JTI_CLAIM]
+        if revocation_store.is_revoked(jti):
+            raise TokenError(_("Token is blacklisted"))
+        data = super().validate(attrs)
+        if api_settings.ROTATE_REFRESH_TOKENS and api_settings.BLACKLIST_AFTER_ROTATION:
+            # Deux rafraîchissements simultanés du même jeton : un seul l'emporte.
+            if not revocation_store.revoke(jti, datetime_from_epoch(refresh["exp"])):
+                raise TokenError(_("Token is blacklisted"))
+        return data
+
+
+class RevocableTokenVerifySerializer(TokenVerifySerializer):
+    """
+    Vérification refusant les jetons révoqués (voir users.revocation).
+    """
+
+    def validate(self, attrs):
+        token = UntypedToken(attrs["token"])
+        jti = token.get(api_settings.JTI_CLAIM)
+        if jti is not None and revocation_store.is_revoked(jti):
+            raise serializers.ValidationError(_("Token is blacklisted"))
+        return {}
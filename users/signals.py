@@ -0,0 +1,20 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import user_cache
+from .models import User, users_anonymized
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    """
+    Invalide l'utilisateur mis en cache pour l'authentification JWT à chaque
+    modification (compte désactivé, mot de passe ou username changés, anonymisation).
+    """
+    user_cache.invalidate(instance.pk)
+
+
+@receiver(users_anonymized)
+def users_anonymized_changed(sender, users, **kwargs):
+    user_cache.invalidate(*(user.pk for user in users))
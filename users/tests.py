@@ -1,3 +1,475 @@
-from django.test import TestCase
+import io
+import json
+import uuid
+from datetime import date, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import RefreshToken
+from softdesk.bloom import BloomFilter
+from softdesk.throttling import LoginThrottle, throttle_stats
+
+from api.models import Comment, Issue, Project
+
+from .cache import user_cache
+from .checks import check_revocation_cache
+from .models import RevokedToken, User
+from .revocation import GENERATION_KEY, RevocationStore, revocation_store
+
+
+def create_user(username, **extra):
+    return User.objects.create_user(
+        username=username, password="password", birth_date=date(1990, 1, 1), **extra
+    )
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class UsersTestCase(TestCase):
+    """
+    Base des tests des utilisateurs. Le cache partagé et le LRU local des
+    utilisateurs sont vidés avant chaque test.
+    """
+
+    def setUp(self):
+        cache.clear()
+        user_cache.clear()
+        self.user = create_user("user")
+
+    def client_for(self, user):
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}"
+        )
+        return client
+
+
+class UserCacheTests(UsersTestCase):
+    """
+    Cache des utilisateurs authentifiés par JWT (users.cache).
+    """
+
+    def test_set_and_get(self):
+        version = user_cache.version(self.user.pk)
+        user_cache.set(self.user.pk, self.user, version)
+        with self.assertNumQueries(0):
+            self.assertEqual(user_cache.get(self.user.pk).username, "user")
+
+    def test_invalidated_during_load(self):
+        version = user_cache.version(self.user.pk)
+        stale = User.objects.get(pk=self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.get(pk=self.user.pk).save()  # invalide l'utilisateur
+        user_cache.set(self.user.pk, stale, version)
+        self.assertIsNone(user_cache.get(self.user.pk))
+
+    def test_invalidated_before_write(self):
+        version = user_cache.version(self.user.pk)
+        with mock.patch("users.cache.cache.get", return_value=version):
+            with self.captureOnCommitCallbacks(execute=True):
+                user_cache.invalidate(self.user.pk)
+            user_cache.set(self.user.pk, self.user, version)
+        self.assertIsNone(user_cache.get(self.user.pk))
+
+    def test_deactivated_user_rejected(self):
+        client = self.client_for(self.user)
+        self.assertEqual(client.get("/api/users/me/").status_code, 200)
+        with self.assertNumQueries(0):
+            self.assertEqual(client.get("/api/users/me/").status_code, 200)
+        self.user.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        self.assertEqual(client.get("/api/users/me/").status_code, 401)
+
+    def test_deactivated_in_transaction(self):
+        client = self.client_for(self.user)
+        active = User.objects.get(pk=self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self.user.is_active = False
+                self.user.save()
+                # Un autre worker, qui ne voit pas encore la désactivation, charge
+                # l'utilisateur actif et le remet en cache.
+                with mock.patch.object(
+                    JWTAuthentication, "get_user", return_value=active
+                ):
+                    self.assertEqual(client.get("/api/users/me/").status_code, 200)
+        self.assertEqual(client.get("/api/users/me/").status_code, 401)
+
+    def test_deactivated_during_authentication(self):
+        load = JWTAuthentication.get_user
+
+        def deactivate_during_load(authentication, validated_token):
+            user = load(authentication, validated_token)
+            User.objects.filter(pk=user.pk).update(is_active=False)
+            user_cache.invalidate(user.pk)
+            return user
+
+        client = self.client_for(self.user)
+        with mock.patch.object(JWTAuthentication, "get_user", deactivate_during_load):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertEqual(client.get("/api/users/me/").status_code, 200)
+        self.assertEqual(client.get("/api/users/me/").status_code, 401)
+
+
+class UserExportTests(UsersTestCase):
+    """
+    Export des données de l'utilisateur (/api/users/me/export/) et anonymisation
+    de son compte.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.other = create_user("other")
+        project = Project.objects.create(
+            title="Projet", description="D", type="Backend", author=self.user
+        )
+        foreign = Project.objects.create(
+            title="Autre", description="D", type="Backend", author=self.other
+        )
+        Project.objects.create(
+            title="Supprimé",
+            description="D",
+            type="Backend",
+            author=self.user,
+            pending_delete=True,
+        )
+        self.authored = Issue.objects.create(
+            title="Écrite", description="D", project=project, author=self.user
+        )
+        self.assigned = Issue.objects.create(
+            title="Assignée",
+            description="D",
+            project=foreign,
+            author=self.other,
+            assignee=self.user,
+        )
+        Issue.objects.create(
+            title="Étrangère", description="D", project=foreign, author=self.other
+        )
+        Comment.objects.create(issue=self.assigned, author=self.user, content="Mien")
+        Comment.objects.create(issue=self.assigned, author=self.other, content="Autre")
+
+    def test_export(self):
+        response = self.client_for(self.user).get("/api/users/me/export/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertIn(f"user-{self.user.pk}.ndjson", response["Content-Disposition"])
+        records = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).decode().splitlines()
+        ]
+        self.assertEqual(records[0]["type"], "user")
+        self.assertEqual(records[0]["username"], "user")
+        titles = {record["type"]: [] for record in records if record["type"] != "user"}
+        for record in records[1:]:
+            titles[record["type"]].append(record.get("title", record.get("content")))
+        self.assertEqual(titles["project"], ["Projet"])
+        self.assertCountEqual(titles["issue"], ["Écrite", "Assignée"])
+        self.assertEqual(titles["comment"], ["Mien"])
+
+    def test_delete_account(self):
+        client = self.client_for(self.user)
+        self.assertEqual(client.delete("/api/users/me/").status_code, 204)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.username.startswith("deleted_user_"))
+        self.assertEqual(self.user.email, "")
+        self.assertFalse(self.user.is_active)
+        self.assertEqual(client.get("/api/users/me/").status_code, 401)
+
+
+class AnonymizeUsersTests(UsersTestCase):
+    """
+    Commande anonymize_users (durée de conservation).
+    """
+
+    def setUp(self):
+        super().setUp()
+        old = timezone.now() - timedelta(days=400)
+        self.inactive = [create_user(f"inactive{n}") for n in range(5)]
+        User.objects.filter(pk__in=[user.pk for user in self.inactive]).update(
+            last_login=old
+        )
+        never = create_user("never")
+        User.objects.filter(pk=never.pk).update(date_joined=old)
+        self.inactive.append(never)
+        staff = create_user("staff", is_staff=True)
+        User.objects.filter(pk=staff.pk).update(last_login=old)
+        User.objects.filter(pk=self.user.pk).update(last_login=timezone.now())
+
+    def anonymized(self):
+        return set(
+            User.objects.filter(username__startswith="deleted_user_").values_list(
+                "pk", flat=True
+            )
+        )
+
+    def test_batches(self):
+        stdout = io.StringIO()
+        with CaptureQueriesContext(connection) as captured:
+            call_command(
+                "anonymize_users", inactive_days=365, batch_size=4, stdout=stdout
+            )
+        # Un bulk_update par lot de 4 comptes
+        updates = [query for query in captured if query["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 2)
+        self.assertEqual(self.anonymized(), {user.pk for user in self.inactive})
+        self.assertIn("6 compte(s) anonymisé(s).", stdout.getvalue())
+        # Les comptes déjà anonymisés sont ignorés.
+        stdout = io.StringIO()
+        call_command("anonymize_users", inactive_days=365, stdout=stdout)
+        self.assertIn("0 compte(s) anonymisé(s).", stdout.getvalue())
+
+    def test_dry_run(self):
+        stdout = io.StringIO()
+        call_command("anonymize_users", inactive_days=365, dry_run=True, stdout=stdout)
+        self.assertIn("6 compte(s) à anonymiser.", stdout.getvalue())
+        self.assertEqual(self.anonymized(), set())
+
+    def test_invalid_options(self):
+        with self.assertRaises(CommandError):
+            call_command("anonymize_users", inactive_days=0)
+
+
+def throttle_rates(**rates):
+    """
+    Remplace des débits de REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"].
+    """
+    return override_settings(
+        REST_FRAMEWORK={
+            **settings.REST_FRAMEWORK,
+            "DEFAULT_THROTTLE_RATES": {
+                **settings.REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"],
+                **rates,
+            },
+        }
+    )
+
+
+class ThrottleTests(UsersTestCase):
+    """
+    Limites de débit des routes d'authentification (softdesk.throttling).
+    """
+
+    def login(self, username="user", password="mauvais", ip="10.0.0.1"):
+        return APIClient().post(
+            "/api/login/",
+            {"username": username, "password": password},
+            format="json",
+            REMOTE_ADDR=ip,
+        )
+
+    @throttle_rates(login="3/min", login_username=None)
+    def test_login_per_ip(self):
+        rejected = throttle_stats.rejected.get("login", 0)
+        for _ in range(3):
+            self.assertEqual(self.login().status_code, 401)
+        # Rejet avant toute lecture en base et tout calcul de hash
+        with (
+            self.assertNumQueries(0),
+            mock.patch.object(User, "check_password") as check_password,
+        ):
+            response = self.login(password="password")
+        check_password.assert_not_called()
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response["Retry-After"]), 0)
+        self.assertEqual(self.login(ip="10.0.0.2").status_code, 401)
+        self.assertEqual(throttle_stats.rejected["login"], rejected + 1)
+
+    @throttle_rates(login=None, login_username="2/min")
+    def test_login_per_username(self):
+        for _ in range(2):
+            self.assertEqual(self.login(ip="10.0.1.1").status_code, 401)
+        self.assertEqual(self.login(ip="10.0.1.1").status_code, 429)
+        self.assertEqual(self.login("USER", ip="10.0.1.1").status_code, 429)
+        self.assertEqual(self.login("other", ip="10.0.1.1").status_code, 401)
+        # Les tentatives d'une autre adresse ne bloquent pas le compte.
+        self.assertEqual(
+            self.login(password="password", ip="10.0.1.9").status_code, 200
+        )
+
+    @throttle_rates(register="1/hour")
+    def test_register(self):
+        def register(username):
+            return APIClient().post(
+                "/api/register/",
+                {
+                    "username": username,
+                    "password": "mot-de-passe-solide",
+                    "birth_date": "1990-01-01",
+                    "consent": True,
+                },
+                format="json",
+            )
+
+        self.assertEqual(register("new1").status_code, 201)
+        response = register("new2")
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+        self.assertFalse(User.objects.filter(username="new2").exists())
+
+    @throttle_rates(login="1/min")
+    def test_sliding_window(self):
+        throttle = LoginThrottle()
+        request = APIRequestFactory().post("/api/login/", REMOTE_ADDR="10.0.2.1")
+        # 1er janvier 2025 à 00:00:50 : dernières secondes d'une fenêtre
+        start = 1735689650
+        with mock.patch("softdesk.throttling.time.time", return_value=start):
+            self.assertTrue(throttle.allow_request(request, None))
+            self.assertFalse(throttle.allow_request(request, None))
+        # Fenêtre suivante : la précédente pèse encore
+        with mock.patch("softdesk.throttling.time.time", return_value=start + 15):
+            self.assertFalse(throttle.allow_request(request, None))
+        with mock.patch("softdesk.throttling.time.time", return_value=start + 130):
+            self.assertTrue(throttle.allow_request(request, None))
+
+
+class BloomFilterTests(SimpleTestCase):
+    """
+    Filtre de Bloom (softdesk.bloom).
+    """
+
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(1000, 0.01)
+        keys = [uuid.uuid4().hex for _ in range(1000)]
+        for key in keys:
+            bloom.add(key)
+        self.assertTrue(all(key in bloom for key in keys))
+        self.assertEqual(len(bloom), 1000)
+        self.assertFalse(bloom.is_full())
+        bloom.add("de trop")
+        self.assertTrue(bloom.is_full())
+
+    def test_false_positive_rate(self):
+        bloom = BloomFilter(1000, 0.01)
+        for _ in range(1000):
+            bloom.add(uuid.uuid4().hex)
+        false_positives = sum(uuid.uuid4().hex in bloom for _ in range(10000))
+        # Taux attendu 1 % : large marge pour un test déterministe en pratique.
+        self.assertLess(false_positives, 300)
+
+
+class RevocationTests(UsersTestCase):
+    """
+    Révocation des refresh tokens après rotation (users.revocation).
+    """
+
+    def setUp(self):
+        super().setUp()
+        revocation_store.clear()
+        self.addCleanup(revocation_store.clear)
+        self.expires_at = timezone.now() + timedelta(days=1)
+
+    def refresh(self, token):
+        return APIClient().post(
+            "/api/token/refresh/", {"refresh": str(token)}, format="json"
+        )
+
+    def test_rotation_revokes_presented_token(self):
+        token = RefreshToken.for_user(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.refresh(token)
+        self.assertEqual(response.status_code, 200)
+        rotated = response.data["refresh"]
+        self.assertTrue(RevokedToken.objects.filter(jti=token["jti"]).exists())
+        # Réutilisation du jeton d'origine refusée, le nouveau est accepté.
+        self.assertEqual(self.refresh(token).status_code, 401)
+        response = APIClient().post(
+            "/api/token/verify/", {"token": str(token)}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.refresh(rotated).status_code, 200)
+
+    def test_unrevoked_token_checked_without_query(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            revocation_store.revoke("revoque", self.expires_at)
+        revocation_store.sync()
+        with self.assertNumQueries(0):
+            self.assertFalse(revocation_store.is_revoked("jamais-revoque"))
+        with self.assertNumQueries(0):
+            self.assertTrue(revocation_store.is_revoked("revoque"))
+
+    def test_concurrent_revocation(self):
+        self.assertTrue(revocation_store.revoke("jti", self.expires_at))
+        self.assertFalse(revocation_store.revoke("jti", self.expires_at))
+
+    def test_other_workers_synchronized(self):
+        worker = RevocationStore()
+        self.assertFalse(worker.is_revoked("jti"))
+        with self.captureOnCommitCallbacks(execute=True):
+            revocation_store.revoke("jti", self.expires_at)
+        self.assertTrue(worker.is_revoked("jti"))
+        # Cache partagé vidé : le compteur de génération est recréé.
+        cache.clear()
+        other = RevocationStore()
+        self.assertTrue(other.is_revoked("jti"))
+
+    @override_settings(
+        TOKEN_REVOCATION={**settings.TOKEN_REVOCATION, "BLOOM_CAPACITY": 2}
+    )
+    def test_full_filter_reloaded(self):
+        worker = RevocationStore()
+        worker.sync()
+        RevokedToken.objects.bulk_create(
+            [RevokedToken(jti=f"jti{n}", expires_at=self.expires_at) for n in range(5)]
+            + [
+                RevokedToken(
+                    jti="expire", expires_at=timezone.now() - timedelta(seconds=1)
+                )
+            ]
+        )
+        cache.incr(GENERATION_KEY)
+        self.assertTrue(worker.is_revoked("jti4"))
+        self.assertTrue(worker.bloom.is_full())
+        cache.incr(GENERATION_KEY)
+        worker.sync()
+        # Reconstruit à partir des seuls jetons non expirés.
+        self.assertEqual(len(worker.bloom), 5)
+        self.assertFalse(worker.bloom.is_full())
+
+    def test_prune(self):
+        RevokedToken.objects.create(jti="actif", expires_at=self.expires_at)
+        RevokedToken.objects.create(
+            jti="expire", expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        stdout = io.StringIO()
+        call_command("prune_revoked_tokens", stdout=stdout)
+        self.assertIn("1 jeton(s) révoqué(s) expiré(s) supprimé(s).", stdout.getvalue())
+        self.assertEqual(
+            list(RevokedToken.objects.values_list("jti", flat=True)), ["actif"]
+        )
+
+    def test_shared_cache_check(self):
+        local = {
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+        }
+        shared = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache"}}
+        with override_settings(CACHES=local):
+            self.assertEqual(
+                [error.id for error in check_revocation_cache(None)], ["users.W001"]
+            )
+        with override_settings(CACHES=shared):
+            self.assertEqual(check_revocation_cache(None), [])
+        jwt = {**settings.SIMPLE_JWT, "BLACKLIST_AFTER_ROTATION": False}
+        with override_settings(CACHES=local, SIMPLE_JWT=jwt):
+            self.assertEqual(check_revocation_cache(None), [])
+
+    def test_bench_command(self):
+        stdout = io.StringIO()
+        call_command(
+            "bench_revocation",
+            revoked=50,
+            checks=50,
+            max_overhead=1_000_000,
+            stdout=stdout,
+        )
+        self.assertIn("Surcoût de la révocation dans le budget.", stdout.getvalue())
+        self.assertFalse(RevokedToken.objects.exists())
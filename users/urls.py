@@ -1,5 +1,10 @@
 from django.urls import path
 from rest_framework.routers import DefaultRouter
+from softdesk.throttling import (
+    LoginThrottle,
+    LoginUsernameThrottle,
+    TokenRefreshThrottle,
+)
 from .views import UserViewSet
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
@@ -12,7 +17,17 @@ router.register("users", UserViewSet, basename="user")
 
 urlpatterns = router.urls + [
     path("register/", UserViewSet.as_view({"post": "create"}), name="user-register"),
-    path("login/", TokenObtainPairView.as_view(), name="user-login"),
-    path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
+    path(
+        "login/",
+        TokenObtainPairView.as_view(
+            throttle_classes=[LoginThrottle, LoginUsernameThrottle]
+        ),
+        name="user-login",
+    ),
+    path(
+        "token/refresh/",
+        TokenRefreshView.as_view(throttle_classes=[TokenRefreshThrottle]),
+        name="token_refresh",
+    ),
     path("token/verify/", TokenVerifyView.as_view(), name="token_verify"),
 ]
@@ -1,4 +1,8 @@
+from django.http import StreamingHttpResponse
 from rest_framework.viewsets import ModelViewSet
+from api.export import iter_ndjson, iter_user_records
+from softdesk.mixins import InstrumentedViewMixin, SparseFieldsetMixin
+from softdesk.throttling import RegisterThrottle
 from .models import User
 from .serializers import UserSerializer
 from rest_framework.permissions import IsAuthenticated, AllowAny
@@ -6,7 +10,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 
 
-class UserViewSet(ModelViewSet):
+class UserViewSet(InstrumentedViewMixin, SparseFieldsetMixin, ModelViewSet):
     """
     Vue pour gérer les opérations CRUD sur les utilisateurs.
 
@@ -30,6 +34,15 @@ class UserViewSet(ModelViewSet):
             return [AllowAny()]
         return [IsAuthenticated()]
 
+    def get_throttles(self):
+        """
+        Limite la création de comptes par adresse IP (routes users/ et register/) :
+        chaque inscription calcule un hash de mot de passe.
+        """
+        if self.action == "create":
+            return [RegisterThrottle()]
+        return super().get_throttles()
+
     def get_queryset(self):
         """
         Restreint le queryset à l'utilisateur authentifié afin que chacun
@@ -62,3 +75,22 @@ class UserViewSet(ModelViewSet):
         elif request.method == 'DELETE':
             user.delete_personnal_data()  # Méthode déjà existante dans le modèle User
             return Response(status=204)
+
+    @action(detail=False, methods=["get"], url_path="me/export")
+    def export(self, request):
+        """
+        Exporte les données de l'utilisateur (portabilité RGPD) en NDJSON : son
+        compte, ses projets, les tickets dont il est l'auteur ou l'assigné et ses
+        commentaires, un enregistrement par ligne.
+
+        La réponse est diffusée en streaming et lue par lots en base : la mémoire
+        utilisée ne dépend pas du volume de données de l'utilisateur.
+        """
+        response = StreamingHttpResponse(
+            iter_ndjson(iter_user_records(request.user)),
+            content_type="application/x-ndjson",
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="user-{request.user.pk}.ndjson"'
+        )
+        return response